@@ -0,0 +1,227 @@
+"""
+Cliente do servidor da API (api_server.py)
+
+ApiClient faz as requisições HTTP/JSON, por TCP ou socket Unix, com a
+conexão mantida aberta entre elas. RemoteCompanyService tem a mesma
+interface do CompanyService: mantém uma cópia local do modelo (para as
+tabelas e buscas da interface) e envia cada operação ao servidor antes
+de repeti-la na cópia, de modo que a interface gráfica e o modo terminal
+funcionam como clientes sem mudanças.
+
+Endereços: "http://127.0.0.1:8765" ou "unix:/caminho/do/socket".
+"""
+import http.client
+import json
+import select
+import socket
+import threading
+from urllib.parse import quote, urlsplit
+from models import Employee, Department
+from company_service import CompanyService, ServiceError, NotFoundError
+
+# Empregados por requisição na carga inicial
+LOAD_PAGE_SIZE = 10000
+
+# Requisições que podem ser repetidas se a resposta se perder
+IDEMPOTENT_METHODS = ('GET', 'HEAD')
+
+
+def _closed_by_peer(connection):
+    """Indica se o servidor já fechou a conexão ociosa (há EOF à espera de leitura)"""
+    if connection.sock is None:
+        return True
+    readable, _, _ = select.select([connection.sock], [], [], 0)
+    return bool(readable)
+
+
+def is_remote_address(text):
+    """Indica se o argumento é o endereço de um servidor, e não um armazenamento local"""
+    return text.startswith(('http://', 'unix:'))
+
+
+class CommunicationError(ServiceError):
+    """O servidor não respondeu (ou a conexão caiu)"""
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection sobre um socket Unix"""
+
+    def __init__(self, path, timeout=30):
+        super().__init__('localhost', timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+class ApiClient:
+    """Requisições JSON ao servidor; erros viram ServiceError com a mensagem do servidor"""
+
+    def __init__(self, address, timeout=30):
+        self.address = address
+        self.timeout = timeout
+        self.connection = None
+        # Uma conexão só: requisições de threads diferentes se revezam
+        self.lock = threading.Lock()
+
+    def connect(self):
+        if self.address.startswith('unix:'):
+            return UnixHTTPConnection(self.address[len('unix:'):], self.timeout)
+        url = urlsplit(self.address)
+        return http.client.HTTPConnection(url.hostname, url.port or 80, timeout=self.timeout)
+
+    def request(self, method, path, data=None):
+        """
+        Envia a requisição e retorna (status, dados)
+
+        Levanta NotFoundError (404), ServiceError (demais erros) ou
+        CommunicationError se o servidor não responder. Uma escrita cuja
+        resposta se perdeu não é reenviada (pode já ter sido aplicada).
+        """
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8') if data is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        with self.lock:
+            while True:
+                if self.connection is not None and _closed_by_peer(self.connection):
+                    self.connection.close()
+                    self.connection = None
+                reused = self.connection is not None
+                if not reused:
+                    self.connection = self.connect()
+                sent = False
+                try:
+                    self.connection.request(method, path, body, headers)
+                    sent = True
+                    response = self.connection.getresponse()
+                    status, payload = response.status, json.loads(response.read() or b'null')
+                    break
+                except (OSError, http.client.HTTPException) as e:
+                    self.connection.close()
+                    self.connection = None
+                    # Uma conexão antiga pode ter sido fechada pelo servidor sem
+                    # processar a requisição: tenta de novo com uma nova. Depois
+                    # de enviada, só leituras são repetidas: uma escrita pode ter
+                    # sido aplicada antes de a resposta se perder
+                    if not reused or (sent and method not in IDEMPOTENT_METHODS):
+                        raise CommunicationError(f"Falha na comunicação com o servidor: {e}")
+        if status == 404:
+            raise NotFoundError(payload.get('error', "Não encontrado!"))
+        if status >= 400:
+            raise ServiceError(payload.get('error', f"Erro {status} do servidor"))
+        return status, payload
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+
+class RemoteCompanyService(CompanyService):
+    """
+    CompanyService cujo armazenamento é o servidor da API
+
+    Cada operação vai primeiro ao servidor, que valida e grava; só então
+    é repetida na cópia local, com os dados devolvidos por ele. Se a
+    cópia estiver desatualizada (outro cliente alterou os mesmos dados)
+    e a repetição falhar, o modelo é recarregado do servidor.
+    """
+
+    def __init__(self, address):
+        self.client = ApiClient(address)
+        super().__init__()
+
+    # --- Dados ---
+
+    def read_data(self):
+        """Baixa todos os empregados, página por página, e monta os setores"""
+        employees = []
+        offset = 0
+        while True:
+            _, page = self.client.request('GET', f'/employees?offset={offset}&limit={LOAD_PAGE_SIZE}')
+            employees.extend(Employee.from_dict(data) for data in page['items'])
+            offset += len(page['items'])
+            if not page['items'] or offset >= page['total']:
+                break
+
+        _, department_list = self.client.request('GET', '/departments')
+        departments = {data['name']: Department(data['name']) for data in department_list}
+        for emp in employees:
+            dept = departments.get(emp.department)
+            if dept:
+                dept.add_employee(emp)
+        return employees, list(departments.values())
+
+    def write_storage(self, changes):
+        # O servidor já gravou cada operação ao aceitá-la
+        return True
+
+    def sync_external(self):
+        # O servidor não avisa as alterações de outros clientes; a cópia
+        # local é atualizada quando uma operação encontra dados desatualizados
+        return False
+
+    def close(self):
+        self.client.close()
+
+    def _request(self, method, path, data=None):
+        """Requisição ao servidor; um 404 indica cópia local desatualizada"""
+        try:
+            return self.client.request(method, path, data)[1]
+        except NotFoundError:
+            self.reload()
+            raise
+
+    def _replicate(self, operation, *args, **kwargs):
+        """Repete na cópia local uma operação já aceita pelo servidor"""
+        try:
+            return operation(*args, **kwargs)
+        except ServiceError:
+            self.reload()
+            return None
+
+    # --- Empregados ---
+
+    def register_employee(self, name, cpf, phone, address, department="Nenhum", employee_id=None):
+        data = self._request('POST', '/employees', {
+            'name': name, 'cpf': cpf, 'phone': phone, 'address': address, 'department': department})
+        return self._replicate(super().register_employee, data['name'], data['cpf'], data['phone'],
+                               data['address'], data['department'], employee_id=data['id'])
+
+    def edit_employee(self, employee_id, name, cpf, phone, address, department=None):
+        fields = {'name': name, 'cpf': cpf, 'phone': phone, 'address': address}
+        if department is not None:
+            fields['department'] = department
+        data = self._request('PUT', f'/employees/{employee_id}', fields)
+        return self._replicate(super().edit_employee, employee_id, data['name'], data['cpf'],
+                               data['phone'], data['address'], data['department'])
+
+    def delete_employee(self, employee_id):
+        self._request('DELETE', f'/employees/{employee_id}')
+        return self._replicate(super().delete_employee, employee_id)
+
+    def reallocate_employee(self, employee_id, department):
+        data = self._request('POST', f'/employees/{employee_id}/reallocate',
+                             {'department': department})
+        return self._replicate(super().reallocate_employee, employee_id, data['department'])
+
+    def import_employees(self, path):
+        raise ServiceError("A importação em lote não está disponível pelo servidor; "
+                           "use bulk_import.py no computador do servidor.")
+
+    # --- Setores ---
+
+    def create_department(self, name):
+        data = self._request('POST', '/departments', {'name': name})
+        return self._replicate(super().create_department, data['name'])
+
+    def rename_department(self, old_name, new_name):
+        data = self._request('PUT', f'/departments/{quote(old_name, safe="")}',
+                             {'name': new_name})
+        return self._replicate(super().rename_department, old_name, data['name'])
+
+    def remove_department(self, name):
+        self._request('DELETE', f'/departments/{quote(name, safe="")}')
+        return self._replicate(super().remove_department, name)
@@ -0,0 +1,394 @@
+"""
+Servidor HTTP/JSON para acesso de vários clientes ao mesmo armazenamento
+
+Só usa a biblioteca padrão (asyncio). O modelo fica em memória, em um
+CompanyService: as leituras são respondidas direto dele, e as escritas
+passam por uma fila com um único escritor, que aplica as operações em
+ordem e grava cada lote acumulado com uma só chamada ao armazenamento
+(a resposta sai depois da gravação). Enquanto um lote é gravado, as
+leituras continuam sendo atendidas.
+
+Rotas:
+    GET    /employees?offset=0&limit=100[&department=Nome]
+    GET    /employees/{id}
+    GET    /employees/cpf/{cpf}
+    POST   /employees                    {name, cpf, phone, address[, department]}
+    PUT    /employees/{id}               campos a alterar (os ausentes ficam iguais)
+    DELETE /employees/{id}
+    POST   /employees/{id}/reallocate    {department}
+    GET    /departments
+    POST   /departments                  {name}
+    PUT    /departments/{nome}           {name}
+    DELETE /departments/{nome}
+
+Erros voltam como {"error": mensagem}: 400 para regras de negócio e
+corpos inválidos (campos que não são texto, por exemplo), 404 para
+empregado, setor ou rota inexistente, 500 se a gravação falhar (a
+alteração fica pendente e vai na próxima gravação) ou em erro inesperado.
+
+Uso: python api_server.py [armazenamento] [--host 127.0.0.1] [--port 8765] [--unix CAMINHO]
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from itertools import islice
+from urllib.parse import urlsplit, parse_qs, unquote
+from company_service import CompanyService, ServiceError, NotFoundError
+from data_manager import DataManager
+from storage import open_storage
+import perf_metrics
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Tamanho padrão e máximo de uma página da listagem
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 10000
+
+# Campos de texto de um empregado no corpo das requisições
+EMPLOYEE_FIELDS = ('name', 'cpf', 'phone', 'address', 'department')
+
+MAX_HEADER_BYTES = 65536
+MAX_BODY_BYTES = 1 << 20
+
+
+class HttpError(Exception):
+    """Erro que vira uma resposta com o status informado"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiServer:
+    """Servidor da API sobre um CompanyService já carregado"""
+
+    def __init__(self, service):
+        self.service = service
+        self.write_queue = None
+        # Gravações rodam fora do laço de eventos, uma de cada vez
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.routes = [
+            ('GET', ('employees',), self.list_employees),
+            ('GET', ('employees', 'cpf', None), self.get_employee_by_cpf),
+            ('GET', ('employees', None), self.get_employee),
+            ('POST', ('employees',), self.create_employee),
+            ('PUT', ('employees', None), self.update_employee),
+            ('DELETE', ('employees', None), self.delete_employee),
+            ('POST', ('employees', None, 'reallocate'), self.reallocate_employee),
+            ('GET', ('departments',), self.list_departments),
+            ('POST', ('departments',), self.create_department),
+            ('PUT', ('departments', None), self.rename_department),
+            ('DELETE', ('departments', None), self.delete_department),
+        ]
+
+    # --- Servidor ---
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        """Atende até ser cancelado; ao sair, grava o que estiver pendente"""
+        self.write_queue = asyncio.Queue()
+        writer_task = asyncio.create_task(self.writer())
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_path,
+                                                     limit=MAX_HEADER_BYTES)
+            os.chmod(unix_path, 0o600)
+            print(f"Atendendo em unix:{unix_path}")
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port,
+                                                limit=MAX_HEADER_BYTES)
+            print(f"Atendendo em http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            writer_task.cancel()
+            if unix_path and os.path.exists(unix_path):
+                os.unlink(unix_path)
+            self.executor.shutdown(wait=True)
+            if not self.service.save():
+                print("Erro ao salvar alterações pendentes")
+
+    async def handle_connection(self, reader, writer):
+        """Atende as requisições de uma conexão (mantida aberta entre requisições)"""
+        try:
+            while True:
+                request = await self.read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                with perf_metrics.timer(f'api.{method}'):
+                    status, payload = await self.dispatch(method, target, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(self.encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HttpError as e:
+            writer.write(self.encode_response(e.status, {'error': str(e)}, False))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        """Lê uma requisição: (método, alvo, cabeçalhos, corpo), ou None no fim da conexão"""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Requisição incompleta")
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Cabeçalhos muito grandes")
+
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Linha de requisição inválida")
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Content-Length inválido")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpo muito grande")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target, headers, body
+
+    @staticmethod
+    def encode_response(status, payload, keep_alive=True):
+        status = HTTPStatus(status)
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode('latin-1') + body
+
+    async def dispatch(self, method, target, body):
+        """Encaminha a requisição para a rota; retorna (status, dados)"""
+        url = urlsplit(target)
+        segments = tuple(unquote(part) for part in url.path.strip('/').split('/') if part)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            for route_method, pattern, handler in self.routes:
+                if route_method != method or len(pattern) != len(segments):
+                    continue
+                if all(part is None or part == segment for part, segment in zip(pattern, segments)):
+                    params = [segment for part, segment in zip(pattern, segments) if part is None]
+                    data = json.loads(body) if body else {}
+                    if not isinstance(data, dict):
+                        raise HttpError(HTTPStatus.BAD_REQUEST, "O corpo deve ser um objeto JSON")
+                    return await handler(*params, query=query, data=data)
+            raise HttpError(HTTPStatus.NOT_FOUND, "Rota não encontrada")
+        except HttpError as e:
+            return e.status, {'error': str(e)}
+        except NotFoundError as e:
+            return HTTPStatus.NOT_FOUND, {'error': str(e)}
+        except ServiceError as e:
+            return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {'error': f"Requisição inválida: {e}"}
+        except Exception as e:
+            # Um erro inesperado não derruba a conexão: o cliente recebe 500
+            print(f"Erro inesperado em {method} {url.path}: {e!r}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': "Erro interno do servidor"}
+
+    # --- Escritor único ---
+
+    async def submit(self, operation):
+        """Enfileira uma operação de escrita e espera ela ser aplicada e gravada"""
+        future = asyncio.get_running_loop().create_future()
+        await self.write_queue.put((operation, future))
+        return await future
+
+    async def writer(self):
+        """
+        Aplica as escritas em ordem e grava cada lote de uma vez
+
+        As operações que chegam durante uma gravação formam o lote
+        seguinte, de modo que muitos clientes escrevendo ao mesmo tempo
+        custam poucas gravações.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.write_queue.get()]
+            while not self.write_queue.empty():
+                batch.append(self.write_queue.get_nowait())
+
+            results = []
+            for operation, future in batch:
+                try:
+                    results.append((future, operation(), None))
+                except Exception as e:
+                    results.append((future, None, e))
+
+            saved = True
+            if self.service.pending_changes:
+                try:
+                    saved = await loop.run_in_executor(self.executor, self.service.save)
+                except Exception as e:
+                    # O lote recebe 500, mas a fila continua sendo atendida
+                    print(f"Erro ao salvar dados: {e!r}")
+                    saved = False
+
+            for future, result, error in results:
+                if future.done():
+                    continue
+                if error is None and not saved:
+                    error = HttpError(HTTPStatus.INTERNAL_SERVER_ERROR,
+                                      "Falha ao salvar dados! A alteração será gravada na próxima tentativa.")
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+
+    # --- Empregados ---
+
+    def employee_or_404(self, employee_id):
+        employee = self.service.get_employee(parse_id(employee_id))
+        if employee is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, "Empregado não encontrado!")
+        return employee
+
+    async def list_employees(self, query, data):
+        offset = parse_count(query, 'offset', 0)
+        limit = min(MAX_PAGE_SIZE, parse_count(query, 'limit', PAGE_SIZE))
+        department = query.get('department')
+        if department is None:
+            source, total = self.service.employees, len(self.service.employees)
+            page = source[offset:offset + limit]
+        elif department == "Nenhum":
+            matches = [emp for emp in self.service.employees if emp.department == "Nenhum"]
+            total, page = len(matches), matches[offset:offset + limit]
+        else:
+            dept = self.service.get_department(department)
+            if dept is None:
+                raise HttpError(HTTPStatus.NOT_FOUND, f"Setor '{department}' não encontrado!")
+            total, page = len(dept.team), list(islice(dept.team, offset, offset + limit))
+        return HTTPStatus.OK, {'total': total, 'offset': offset, 'limit': limit,
+                               'items': [emp.to_dict() for emp in page]}
+
+    async def get_employee(self, employee_id, query, data):
+        return HTTPStatus.OK, self.employee_or_404(employee_id).to_dict()
+
+    async def get_employee_by_cpf(self, cpf, query, data):
+        employee = self.service.find_by_cpf(cpf)
+        if employee is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, "Empregado não encontrado!")
+        return HTTPStatus.OK, employee.to_dict()
+
+    async def create_employee(self, query, data):
+        require_text(data, *EMPLOYEE_FIELDS)
+        employee = await self.submit(lambda: self.service.register_employee(
+            data.get('name'), data.get('cpf'), data.get('phone'), data.get('address'),
+            data.get('department') or "Nenhum"))
+        return HTTPStatus.CREATED, employee.to_dict()
+
+    async def update_employee(self, employee_id, query, data):
+        employee_id = parse_id(employee_id)
+        require_text(data, *EMPLOYEE_FIELDS)
+
+        def operation():
+            # Os valores atuais são lidos na hora de aplicar, já na ordem da fila
+            current = self.service.get_employee(employee_id)
+            if current is None:
+                raise NotFoundError("Empregado não encontrado!")
+            return self.service.edit_employee(
+                employee_id, data.get('name', current.name), data.get('cpf', current.cpf),
+                data.get('phone', current.phone), data.get('address', current.address),
+                data.get('department'))
+
+        return HTTPStatus.OK, (await self.submit(operation)).to_dict()
+
+    async def delete_employee(self, employee_id, query, data):
+        employee_id = parse_id(employee_id)
+        employee = await self.submit(lambda: self.service.delete_employee(employee_id))
+        return HTTPStatus.OK, employee.to_dict()
+
+    async def reallocate_employee(self, employee_id, query, data):
+        employee_id = parse_id(employee_id)
+        require_text(data, 'department')
+        if not data.get('department'):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Informe o setor de destino!")
+        employee = await self.submit(
+            lambda: self.service.reallocate_employee(employee_id, data['department']))
+        return HTTPStatus.OK, employee.to_dict()
+
+    # --- Setores ---
+
+    async def list_departments(self, query, data):
+        return HTTPStatus.OK, [{'name': dept.name, 'size': len(dept.team)}
+                               for dept in self.service.departments]
+
+    async def create_department(self, query, data):
+        require_text(data, 'name')
+        department = await self.submit(lambda: self.service.create_department(data.get('name')))
+        return HTTPStatus.CREATED, {'name': department.name, 'size': 0}
+
+    async def rename_department(self, name, query, data):
+        require_text(data, 'name')
+        department = await self.submit(lambda: self.service.rename_department(name, data.get('name')))
+        return HTTPStatus.OK, {'name': department.name, 'size': len(department.team)}
+
+    async def delete_department(self, name, query, data):
+        await self.submit(lambda: self.service.remove_department(name))
+        return HTTPStatus.OK, {'name': name}
+
+
+def require_text(data, *keys):
+    """Recusa (400) campos presentes no corpo que não sejam texto"""
+    for key in keys:
+        value = data.get(key)
+        if value is not None and not isinstance(value, str):
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"O campo '{key}' deve ser texto!")
+
+
+def parse_id(text):
+    # isdecimal, e não isdigit: int() recusa dígitos como "²"
+    if not text.isdecimal():
+        raise HttpError(HTTPStatus.BAD_REQUEST, "ID inválido")
+    return int(text)
+
+
+def parse_count(query, key, default):
+    """Inteiro não negativo de um parâmetro da URL (400 se inválido)"""
+    text = query.get(key)
+    if text is None:
+        return default
+    if not text.isdecimal():
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"Parâmetro '{key}' inválido")
+    return int(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON do sistema de gestão")
+    parser.add_argument('storage', nargs='?', help="armazenamento (padrão: JSON com diário no diretório atual)")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', metavar='CAMINHO', help="atende em um socket Unix em vez de TCP")
+    args = parser.parse_args()
+
+    storage = open_storage(args.storage) if args.storage else DataManager(journal_file="journal.jsonl")
+    service = CompanyService(storage=storage)
+    service.load()
+    print(f"{len(service.employees)} empregados carregados")
+    try:
+        asyncio.run(ApiServer(service).serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Benchmarks de escala com empresas sintéticas
+
+Gera empresas realistas (CPFs com dígitos verificadores válidos,
+telefones, endereços, setores com equipes de tamanhos desiguais) e mede
+as operações que crescem com o número de empregados. Os resultados são
+impressos e acrescentados, um registro JSON por execução, ao arquivo de
+saída, para comparar execuções ao longo do tempo.
+
+Uso: python benchmark.py [--sizes 1000,10000,100000] [--repeat 3]
+                         [--output benchmark_results.jsonl]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from models import Employee, Department, DepartmentRegistry
+from data_manager import DataManager
+
+FIRST_NAMES = ("Ana", "Beatriz", "Bruno", "Camila", "Carlos", "Daniel", "Eduarda", "Felipe",
+               "Fernanda", "Gabriel", "Gustavo", "Helena", "Igor", "Isabela", "João", "Juliana",
+               "Larissa", "Lucas", "Luiz", "Marcos", "Maria", "Mariana", "Mateus", "Natália",
+               "Otávio", "Paula", "Pedro", "Rafael", "Renata", "Rodrigo", "Sofia", "Thiago",
+               "Vanessa", "Vinícius", "Yasmin")
+LAST_NAMES = ("Almeida", "Alves", "Araújo", "Barbosa", "Cardoso", "Carvalho", "Castro", "Costa",
+              "Dias", "Fernandes", "Ferreira", "Gomes", "Lima", "Martins", "Melo", "Oliveira",
+              "Pereira", "Ribeiro", "Rocha", "Rodrigues", "Santos", "Silva", "Sousa", "Teixeira")
+STREET_TYPES = ("Rua", "Avenida", "Travessa", "Alameda", "Praça")
+STREET_NAMES = ("das Flores", "Brasil", "XV de Novembro", "Sete de Setembro", "Paulista",
+                "Santos Dumont", "Getúlio Vargas", "da Liberdade", "do Comércio", "Marechal Deodoro",
+                "Tiradentes", "das Palmeiras", "Rio Branco", "São João", "José Bonifácio")
+CITIES = ("São Paulo/SP", "Rio de Janeiro/RJ", "Belo Horizonte/MG", "Curitiba/PR", "Recife/PE",
+          "Porto Alegre/RS", "Salvador/BA", "Fortaleza/CE", "Goiânia/GO", "Campinas/SP")
+AREA_CODES = (11, 21, 31, 41, 51, 61, 71, 81, 85, 62, 19)
+DEPARTMENT_AREAS = ("Financeiro", "Vendas", "Marketing", "TI", "Recursos Humanos", "Jurídico",
+                    "Logística", "Compras", "Atendimento", "Produção", "Qualidade", "Engenharia")
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def generate_cpf(rng):
+    """CPF de 11 dígitos com dígitos verificadores válidos"""
+    digits = [rng.randrange(10) for _ in range(9)]
+    for length in (9, 10):
+        total = sum(d * weight for d, weight in zip(digits, range(length + 1, 1, -1)))
+        digits.append((total * 10 % 11) % 10)
+    return ''.join(map(str, digits))
+
+
+def generate_company(n_employees, n_departments=None, seed=0):
+    """
+    Gera uma empresa sintética determinística
+
+    Os tamanhos das equipes seguem uma distribuição de Zipf (poucos
+    setores grandes, muitos pequenos) e cerca de 10% dos empregados
+    ficam sem setor. Retorna (empregados, setores).
+    """
+    rng = random.Random(seed)
+    if n_departments is None:
+        n_departments = max(5, min(500, n_employees // 200))
+
+    departments = []
+    for i in range(n_departments):
+        area = DEPARTMENT_AREAS[i % len(DEPARTMENT_AREAS)]
+        departments.append(Department(f"{area} {i // len(DEPARTMENT_AREAS) + 1}"))
+    weights = [1 / (rank + 1) for rank in range(n_departments)]
+
+    employees = []
+    cpfs = set()
+    assignments = rng.choices(departments, weights=weights, k=n_employees)
+    for i, dept in enumerate(assignments):
+        cpf = generate_cpf(rng)
+        while cpf in cpfs:
+            cpf = generate_cpf(rng)
+        cpfs.add(cpf)
+        if rng.random() < 0.1:
+            dept = None
+        emp = Employee(
+            name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}",
+            cpf=cpf,
+            phone=f"{rng.choice(AREA_CODES)}9{rng.randrange(10 ** 8):08d}",
+            address=f"{rng.choice(STREET_TYPES)} {rng.choice(STREET_NAMES)}, "
+                    f"{rng.randrange(1, 3000)} - {rng.choice(CITIES)}",
+            department=dept.name if dept else "Nenhum",
+            employee_id=i + 1)
+        employees.append(emp)
+        if dept:
+            dept.add_employee(emp)
+    return employees, departments
+
+
+class FakeTreeview:
+    """Substituto do ttk.Treeview para medir o custo do refresh sem Tk"""
+
+    def __init__(self):
+        self.items = {}
+
+    def get_children(self, item=''):
+        return tuple(self.items)
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.items[iid] = values
+        return iid
+
+    def item(self, iid, values=None, **kwargs):
+        if values is not None:
+            self.items[iid] = values
+
+    def delete(self, *iids):
+        for iid in iids:
+            del self.items[iid]
+
+
+def make_tree():
+    """Treeview real (se houver display) ou o substituto"""
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+        root.withdraw()
+        return ttk.Treeview(root, columns=('ID', 'Nome', 'CPF', 'Telefone', 'Endereço', 'Setor'),
+                            show='headings'), 'tk'
+    except Exception:
+        return FakeTreeview(), 'fake'
+
+
+def timed(func, repeat):
+    """Melhor tempo (segundos) de repeat execuções"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_size(n_employees, repeat, workdir):
+    """Executa todos os benchmarks para uma empresa de n_employees"""
+    results = {}
+    rng = random.Random(n_employees)
+
+    start = time.perf_counter()
+    employees, departments = generate_company(n_employees)
+    results['generate'] = time.perf_counter() - start
+
+    employee_dicts = [emp.to_dict() for emp in employees]
+    department_dicts = [dept.to_dict() for dept in departments]
+    employees_dict = {emp.id: emp for emp in employees}
+
+    results['employee_from_dict'] = timed(
+        lambda: [Employee.from_dict(data) for data in employee_dicts], repeat)
+    results['department_from_dict'] = timed(
+        lambda: [Department.from_dict(data, employees_dict) for data in department_dicts], repeat)
+
+    manager = DataManager(os.path.join(workdir, f"employees-{n_employees}.json"),
+                          os.path.join(workdir, f"departments-{n_employees}.json"))
+    results['save_all_data'] = timed(lambda: manager.save_all_data(employees, departments), repeat)
+    results['load_all_data'] = timed(manager.load_all_data, repeat)
+    results['file_size_bytes'] = os.path.getsize(manager.employees_file)
+
+    # Verificação de CPF duplicado como no cadastro: metade existentes, metade novos
+    lookups = [rng.choice(employees).cpf if i % 2 else generate_cpf(rng) for i in range(10000)]
+    results['cpf_index_build'] = timed(lambda: {emp.cpf: emp for emp in employees}, repeat)
+    by_cpf = {emp.cpf: emp for emp in employees}
+    results['cpf_check_x10000'] = timed(lambda: [by_cpf.get(cpf) for cpf in lookups], repeat)
+
+    registry = DepartmentRegistry(departments)
+    names = [rng.choice(departments).name for _ in range(10000)]
+    results['department_lookup_x10000'] = timed(lambda: [registry.get(name) for name in names], repeat)
+
+    results.update(benchmark_refresh(employees))
+    # Por último: as operações alteram a empresa gerada
+    results.update(benchmark_service(employees, departments, rng))
+    return results
+
+
+def benchmark_refresh(employees):
+    """Tempo do refresh da tabela de empregados: carga inicial e após editar 1%"""
+    from gui_application import EmployeeManagementApp
+
+    tree, tree_kind = make_tree()
+    app = EmployeeManagementApp.__new__(EmployeeManagementApp)
+    app.employees = employees
+    app.employees_view = None
+    app.employee_filter = None
+    app.employees_tree = tree
+    app.employee_rows = {}
+
+    start = time.perf_counter()
+    app.refresh_employees_display()
+    initial = time.perf_counter() - start
+
+    original_phones = [(emp, emp.phone) for emp in employees[::100]]
+    for emp, phone in original_phones:
+        emp.phone = phone[::-1]
+    start = time.perf_counter()
+    app.refresh_employees_display()
+    incremental = time.perf_counter() - start
+    for emp, phone in original_phones:
+        emp.phone = phone
+
+    return {'tree': tree_kind, 'refresh_initial': initial, 'refresh_1pct_changed': incremental}
+
+
+def benchmark_service(employees, departments, rng, operations=1000):
+    """
+    Operações do CompanyService, sem interface: tempo médio de cada uma
+
+    A renomeação é do maior setor, que atualiza toda a equipe.
+    """
+    from company_service import CompanyService
+
+    start = time.perf_counter()
+    service = CompanyService(employees, departments)
+    results = {'service_build': time.perf_counter() - start}
+    names = service.departments.names()
+    existing = [emp.id for emp in rng.sample(employees, min(operations, len(employees)))]
+
+    def run(name, calls):
+        start = time.perf_counter()
+        for call in calls:
+            call()
+        results[f'service_{name}'] = (time.perf_counter() - start) / max(1, len(calls))
+
+    new_cpfs = set()
+    while len(new_cpfs) < operations:
+        cpf = generate_cpf(rng)
+        if service.find_by_cpf(cpf) is None:
+            new_cpfs.add(cpf)
+    run('register', [lambda cpf=cpf: service.register_employee(
+        "Novo Empregado", cpf, "11999999999", "Rua Nova, 1", rng.choice(names)) for cpf in new_cpfs])
+    run('edit', [lambda emp=service.get_employee(emp_id): service.edit_employee(
+        emp.id, emp.name + " Editado", emp.cpf, emp.phone, emp.address) for emp_id in existing])
+    run('reallocate', [lambda emp_id=emp_id: service.reallocate_employee(emp_id, rng.choice(names))
+                       for emp_id in existing])
+    largest = max(service.departments, key=lambda dept: len(dept.team)).name
+    run('rename_department', [lambda: service.rename_department(largest, largest + " (novo)")])
+    run('delete', [lambda emp_id=emp_id: service.delete_employee(emp_id) for emp_id in existing])
+    results['service_pending_changes'] = len(service.take_changes())
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de escala com empresas sintéticas")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="quantidades de empregados separadas por vírgula (ex.: 1000,1000000)")
+    parser.add_argument('--repeat', type=int, default=3, help="repetições de cada medida (vale a melhor)")
+    parser.add_argument('--output', default='benchmark_results.jsonl',
+                        help="arquivo JSON Lines onde o registro da execução é acrescentado")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    run = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            print(f"{size} empregados...")
+            results = run_size(size, args.repeat, workdir)
+            run['results'][str(size)] = results
+            for name, value in results.items():
+                if isinstance(value, float):
+                    print(f"    {name:<26} {value * 1000:10.2f} ms")
+                else:
+                    print(f"    {name:<26} {value:>10}")
+
+    with open(args.output, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(run, ensure_ascii=False) + '\n')
+    print(f"Resultados acrescentados a {args.output}")
+
+
+if __name__ == "__main__":
+    main()
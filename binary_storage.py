@@ -0,0 +1,170 @@
+import os
+import struct
+import zlib
+from array import array
+from typing import List, Optional
+from models import Employee, Department, ChangeSet
+from storage import StorageBackend, register_backend
+from data_manager import employee_change, apply_change
+
+SEPARATOR = '\x1f'
+HEADER = struct.Struct('<II')
+SECTION_SIZE = struct.Struct('<Q')
+
+
+@register_backend
+class BinaryStorage(StorageBackend):
+    """
+    Backend binário compacto em colunas
+
+    Os IDs ficam em um array de inteiros e cada campo de texto em uma única
+    string separada por SEPARATOR, tudo comprimido com zlib. A leitura
+    evita o custo de decodificar um objeto JSON por empregado, mas toda
+    gravação reescreve o arquivo inteiro.
+    """
+
+    name = 'binary'
+    extensions = ('.sgeb',)
+    magic = b'SGEB\x01'
+
+    def __init__(self, data_file="empresa.sgeb"):
+        """
+        Inicializa o backend binário
+        """
+        self.data_file = data_file
+
+    @classmethod
+    def open(cls, path: str) -> 'BinaryStorage':
+        """Abre (ou cria) o arquivo binário no caminho informado"""
+        return cls(path)
+
+    def load_all_data(self) -> tuple:
+        """
+        Carrega todos os dados (empregados e setores)
+        """
+        try:
+            return self._read()
+        except Exception as e:
+            print(f"Erro ao carregar arquivo binário: {e}")
+            return [], []
+
+    def _read(self) -> tuple:
+        """Lê (empregados, setores), levantando exceção se o arquivo não puder ser lido"""
+        if not os.path.exists(self.data_file):
+            return [], []
+
+        with open(self.data_file, 'rb') as f:
+            if f.read(len(self.magic)) != self.magic:
+                raise ValueError("cabeçalho inválido")
+            payload = zlib.decompress(f.read())
+
+        sections = self._split_sections(payload)
+        n_employees, n_departments = HEADER.unpack_from(next(sections))
+
+        ids = array('q')
+        ids.frombytes(next(sections))
+        columns = [self._decode_column(next(sections), n_employees) for _ in range(5)]
+        employees = [Employee(name, cpf, phone, address, department, employee_id=emp_id)
+                     for emp_id, name, cpf, phone, address, department in zip(ids, *columns)]
+        employees_dict = {emp.id: emp for emp in employees}
+
+        dept_names = self._decode_column(next(sections), n_departments)
+        team_sizes = array('I')
+        team_sizes.frombytes(next(sections))
+        team_ids = array('q')
+        team_ids.frombytes(next(sections))
+
+        departments = []
+        offset = 0
+        for name, size in zip(dept_names, team_sizes):
+            departments.append(Department.from_dict(
+                {'name': name, 'team_ids': team_ids[offset:offset + size]}, employees_dict))
+            offset += size
+
+        return employees, departments
+
+    def save_all_data(self, employees: List[Employee], departments: List[Department],
+                      dirty: Optional[ChangeSet] = None) -> bool:
+        """
+        Salva todos os dados em um arquivo temporário e o renomeia sobre o original
+
+        Como tudo fica em um só arquivo, dirty só evita a gravação quando
+        nada mudou.
+        """
+        if dirty is not None and not dirty.employees and not dirty.departments_changed(departments) \
+                and os.path.exists(self.data_file):
+            return True
+        try:
+            team_sizes = array('I', (len(dept.team) for dept in departments))
+            team_ids = array('q', (emp.id for dept in departments for emp in dept.team))
+            sections = [
+                HEADER.pack(len(employees), len(departments)),
+                array('q', (emp.id for emp in employees)).tobytes(),
+                self._encode_column(emp.name for emp in employees),
+                self._encode_column(emp.cpf for emp in employees),
+                self._encode_column(emp.phone for emp in employees),
+                self._encode_column(emp.address for emp in employees),
+                self._encode_column(emp.department for emp in employees),
+                self._encode_column(dept.name for dept in departments),
+                team_sizes.tobytes(),
+                team_ids.tobytes(),
+            ]
+            payload = b''.join(SECTION_SIZE.pack(len(section)) + section for section in sections)
+
+            temp_file = self.data_file + '.tmp'
+            with open(temp_file, 'wb') as f:
+                f.write(self.magic)
+                f.write(zlib.compress(payload, 1))
+            os.replace(temp_file, self.data_file)
+            for dept in departments:
+                dept.dirty = False
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar arquivo binário: {e}")
+            return False
+
+    def upsert_employee(self, employee: Employee) -> bool:
+        """Insere ou atualiza um empregado, acertando as equipes (regrava o arquivo)"""
+        return self._rewrite_with(employee_change(employee))
+
+    def delete_employee(self, employee_id: int) -> bool:
+        """Exclui um empregado (regrava o arquivo)"""
+        return self._rewrite_with({'op': 'remove_employee', 'id': employee_id})
+
+    def _rewrite_with(self, change: dict) -> bool:
+        """
+        Aplica um registro ao arquivo e o regrava
+
+        Se o arquivo não puder ser lido, nada é regravado: gravar só o
+        que se conseguiu ler apagaria os demais registros.
+        """
+        try:
+            employees, departments = self._read()
+        except Exception as e:
+            print(f"Erro ao carregar arquivo binário, nada foi gravado: {e}")
+            return False
+        employees_dict = {emp.id: emp for emp in employees}
+        apply_change(change, employees_dict, {dept.name: dept for dept in departments})
+        return self.save_all_data(list(employees_dict.values()), departments)
+
+    @staticmethod
+    def _encode_column(values) -> bytes:
+        values = list(values)
+        if any(SEPARATOR in value for value in values):
+            raise ValueError("texto contém caractere separador reservado")
+        return SEPARATOR.join(values).encode('utf-8')
+
+    @staticmethod
+    def _decode_column(data: bytes, count: int) -> List[str]:
+        if count == 0:
+            return []
+        return data.decode('utf-8').split(SEPARATOR)
+
+    @staticmethod
+    def _split_sections(payload: bytes):
+        offset = 0
+        while offset < len(payload):
+            (size,) = SECTION_SIZE.unpack_from(payload, offset)
+            offset += SECTION_SIZE.size
+            yield payload[offset:offset + size]
+            offset += size
@@ -0,0 +1,80 @@
+"""
+Exportação de empregados para CSV ou NDJSON
+
+Os empregados são lidos e escritos um a um (por exemplo a partir de
+DataManager.iter_employees), sem montar a saída inteira em memória.
+
+Uso: python bulk_export.py saida.csv|saida.ndjson [armazenamento] [setor]
+"""
+import csv
+import json
+import os
+import sys
+import time
+from typing import Iterable, Optional
+from models import Employee
+from storage import open_storage
+
+# Colunas exportadas, na ordem (mesmos campos de Employee.to_dict)
+EXPORT_FIELDS = ('id', 'name', 'cpf', 'phone', 'address', 'department')
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+
+def export_format(path: str) -> str:
+    """Escolhe o formato pela extensão (.ndjson/.jsonl ou CSV)"""
+    extension = os.path.splitext(path)[1].lower()
+    return 'ndjson' if extension in ('.ndjson', '.jsonl') else 'csv'
+
+
+def export_employees(employees: Iterable[Employee], path: str, fmt: Optional[str] = None,
+                     department: Optional[str] = None) -> int:
+    """
+    Escreve os empregados no arquivo, em fluxo
+
+    department restringe a exportação a um setor ("Nenhum" exporta os
+    empregados sem setor). A saída é gravada em um arquivo temporário e
+    renomeada no fim, para que uma exportação interrompida não deixe um
+    arquivo pela metade. Retorna o número de empregados exportados.
+    """
+    fmt = fmt or export_format(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+
+    count = 0
+    temp_file = path + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_FIELDS)
+            write = lambda data: writer.writerow([data[field] for field in EXPORT_FIELDS])
+        else:
+            write = lambda data: f.write(json.dumps(data, ensure_ascii=False) + '\n')
+
+        for emp in employees:
+            if department is not None and emp.department != department:
+                continue
+            write(emp.to_dict())
+            count += 1
+    os.replace(temp_file, path)
+    return count
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        sys.exit(2)
+
+    path = sys.argv[1]
+    source = sys.argv[2] if len(sys.argv) > 2 else os.curdir
+    department = sys.argv[3] if len(sys.argv) > 3 else None
+
+    started = time.perf_counter()
+    count = export_employees(open_storage(source).iter_employees(), path, department=department)
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed else 0.0
+    print(f"{count} empregados exportados para {path} ({rate:.0f} linhas/s)")
+
+
+if __name__ == "__main__":
+    main()
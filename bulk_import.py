@@ -0,0 +1,185 @@
+"""
+Importação em lote de empregados a partir de CSV ou JSON
+
+Os arquivos são lidos em fluxo e validados em lotes com as mesmas regras
+do cadastro pela interface. CPFs repetidos e setores são resolvidos por
+índices, e tudo é gravado com uma única operação de salvamento.
+
+Uso: python bulk_import.py arquivo.csv|arquivo.json [armazenamento]
+"""
+import csv
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Tuple
+from models import Employee, validate_employee_data
+from data_manager import iter_json_array, employee_change
+from storage import open_storage
+from company_service import CompanyService
+
+# Nomes de coluna aceitos para cada campo (cabeçalhos comuns de exportações de RH)
+FIELD_ALIASES = {
+    'name': ('name', 'nome'),
+    'cpf': ('cpf',),
+    'phone': ('phone', 'telefone'),
+    'address': ('address', 'endereco', 'endereço'),
+    'department': ('department', 'setor'),
+}
+
+
+class ImportReport:
+    """Resultado de uma importação: aceitos, rejeitados e velocidade"""
+
+    def __init__(self):
+        self.imported: List[Employee] = []
+        self.rejected: List[Tuple[int, str]] = []
+        self.changes: List[dict] = []
+        self.elapsed = 0.0
+
+    @property
+    def total_rows(self) -> int:
+        """Número de linhas lidas do arquivo"""
+        return len(self.imported) + len(self.rejected)
+
+    @property
+    def rows_per_second(self) -> float:
+        """Linhas processadas por segundo"""
+        return self.total_rows / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        """Resumo de uma linha para exibição"""
+        return (f"{len(self.imported)} empregados importados, {len(self.rejected)} linhas "
+                f"rejeitadas ({self.rows_per_second:.0f} linhas/s)")
+
+
+def iter_import_rows(path: str) -> Iterator[Tuple[int, dict]]:
+    """
+    Lê o arquivo de importação em fluxo
+
+    Retorna pares (número da linha ou posição no array, campos). O formato
+    é escolhido pela extensão: .json (array de objetos) ou CSV.
+    """
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            for index, data in enumerate(iter_json_array(f), start=1):
+                yield index, _normalize_row(data) if isinstance(data, dict) else {}
+    else:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            for data in reader:
+                yield reader.line_num, _normalize_row(data)
+
+
+def _normalize_row(data: dict) -> dict:
+    lowered = {str(key).strip().lower(): value for key, value in data.items() if key is not None}
+    row = {}
+    for field, aliases in FIELD_ALIASES.items():
+        for alias in aliases:
+            if alias in lowered:
+                row[field] = str(lowered[alias] or '').strip()
+                break
+    return row
+
+
+def import_employees(path: str, employees: List[Employee], departments,
+                     employees_by_cpf: Dict[str, Employee] = None,
+                     batch_size: int = 1000) -> ImportReport:
+    """
+    Importa os empregados do arquivo para o modelo em memória
+
+    Os empregados aceitos são acrescentados a employees e às equipes dos
+    setores, e employees_by_cpf (se informado) é atualizado. Nada é
+    gravado: report.changes traz os registros de alteração para uma
+    única chamada a save_changes.
+
+    Linhas inválidas, com CPF já cadastrado (ou repetido no arquivo) ou
+    com setor inexistente são rejeitadas com o motivo. Um erro de formato
+    interrompe a leitura, mas mantém as linhas anteriores.
+    """
+    report = ImportReport()
+    started = time.perf_counter()
+
+    if employees_by_cpf is None:
+        employees_by_cpf = {emp.cpf: emp for emp in employees}
+    departments_by_name = {dept.name: dept for dept in departments}
+
+    batch = []
+    line = 0
+    try:
+        for line, data in iter_import_rows(path):
+            batch.append((line, data))
+            if len(batch) >= batch_size:
+                _import_batch(batch, employees, employees_by_cpf, departments_by_name, report)
+                batch = []
+    except (ValueError, csv.Error) as e:
+        # Arquivo corrompido: o que já foi lido é importado normalmente
+        report.rejected.append((line + 1, f"Arquivo inválido a partir daqui: {e}"))
+    _import_batch(batch, employees, employees_by_cpf, departments_by_name, report)
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def _import_batch(batch, employees, employees_by_cpf, departments_by_name, report):
+    """Valida e aplica um lote de linhas"""
+    accepted = []
+    for line, data in batch:
+        error = validate_employee_data(data)
+        department = data.get('department') or "Nenhum"
+        if error is None and data['cpf'] in employees_by_cpf:
+            error = "CPF já cadastrado!"
+        if error is None and department != "Nenhum" and department not in departments_by_name:
+            error = f"Setor '{department}' não encontrado!"
+        if error:
+            report.rejected.append((line, error))
+            continue
+
+        employee = Employee(data['name'], data['cpf'], data['phone'], data['address'],
+                            sys.intern(department))
+        employees_by_cpf[employee.cpf] = employee
+        accepted.append(employee)
+
+    # Adiciona às equipes de uma vez por setor
+    teams: Dict[str, List[Employee]] = {}
+    for employee in accepted:
+        if employee.department != "Nenhum":
+            teams.setdefault(employee.department, []).append(employee)
+    for name, members in teams.items():
+        departments_by_name[name].add_many(members)
+
+    employees.extend(accepted)
+    report.imported.extend(accepted)
+    report.changes.extend(employee_change(emp) for emp in accepted)
+
+
+def import_file(path: str, storage) -> ImportReport:
+    """
+    Importa o arquivo diretamente para um armazenamento, sem interface
+
+    Carrega os dados no CompanyService, importa e grava tudo com um
+    único save_changes.
+    """
+    service = CompanyService(storage=storage)
+    service.load()
+    report = service.import_employees(path)
+    if not service.save():
+        raise IOError("Falha ao salvar dados importados")
+    return report
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        sys.exit(2)
+
+    path = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) > 2 else os.curdir
+    report = import_file(path, open_storage(target))
+
+    print(report.summary())
+    for line, reason in report.rejected:
+        print(f"    linha {line}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Modo terminal do sistema
+
+Os mesmos menus do sistema original em terminal, agora sobre o
+CompanyService: as regras são as mesmas da interface gráfica e os dados
+são gravados no mesmo armazenamento ao fim de cada operação.
+
+Uso: python cli_application.py [armazenamento | endereço do servidor da API]
+"""
+import sys
+from company_service import CompanyService, ServiceError
+from data_manager import DataManager
+from storage import open_storage
+from api_client import RemoteCompanyService, is_remote_address
+
+
+class TerminalApplication:
+    """Menus em terminal para o CompanyService"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def run(self):
+        print("\n===== Sistema de Gestão de Empresa (Modo Terminal) =====")
+        print("Login como administrador padrão.\n")
+
+        actions = {
+            '1': self.register_employee,
+            '2': self.edit_employee,
+            '3': self.delete_employee,
+            '4': self.manage_departments,
+            '5': self.reallocate_employee,
+            '6': self.show_departments,
+            '7': self.show_employees,
+        }
+        while True:
+            # Incorpora o que outras instâncias gravaram no mesmo armazenamento
+            if self.service.sync_external():
+                print("Dados atualizados com as alterações de outra instância.")
+            print("\n--- Menu Principal ---")
+            print("1. Cadastrar empregado")
+            print("2. Editar empregado")
+            print("3. Excluir empregado")
+            print("4. Gerenciar setores")
+            print("5. Realocar empregado")
+            print("6. Visualizar setores e equipes")
+            print("7. Visualizar empregados")
+            print("8. Sair")
+            option = input("Escolha uma opção: ")
+
+            if option == '8':
+                print("Saindo do sistema...")
+                break
+            action = actions.get(option)
+            if action is None:
+                print("Opção inválida.\n")
+                continue
+            try:
+                action()
+            except ServiceError as e:
+                print(f"⚠️ {e}\n")
+            self.save()
+
+    def save(self):
+        """Grava o que a última operação alterou"""
+        if not self.service.save():
+            print("⚠️ Falha ao salvar dados!\n")
+
+    # --- Seleção ---
+
+    def choose_department(self, prompt):
+        """Lista os setores e retorna o nome escolhido, ou None"""
+        names = self.service.departments.names()
+        print("\nSetores disponíveis:")
+        for idx, name in enumerate(names):
+            print(f"{idx + 1}. {name}")
+        choice = input(prompt)
+        if not choice:
+            return None
+        if not choice.isdecimal() or not 1 <= int(choice) <= len(names):
+            print("Setor inválido.\n")
+            return None
+        return names[int(choice) - 1]
+
+    def choose_employee(self, prompt):
+        """Lista os empregados e retorna o escolhido pelo ID, ou None"""
+        print("\n--- Lista de Empregados ---")
+        for emp in self.service.employees:
+            print(f"ID: {emp.id} - Nome: {emp.name} - Setor: {emp.department}")
+        choice = input(prompt)
+        if not choice:
+            print("Operação cancelada.\n")
+            return None
+        if not choice.isdecimal():
+            print("ID inválido.\n")
+            return None
+        employee = self.service.get_employee(int(choice))
+        if employee is None:
+            print("Empregado não encontrado.\n")
+        return employee
+
+    # --- Empregados ---
+
+    def register_employee(self):
+        print("\n--- Cadastrar Empregado ---")
+        name = input("Nome (ou Enter para cancelar): ")
+        if not name:
+            print("Cadastro cancelado.\n")
+            return
+        cpf = input("CPF (apenas números): ")
+        phone = input("Telefone (apenas números): ")
+        address = input("Endereço: ")
+
+        department = "Nenhum"
+        if self.service.departments:
+            department = self.choose_department(
+                "Escolha o número do setor (ou Enter para 'Nenhum'): ") or "Nenhum"
+        else:
+            print("Nenhum setor cadastrado. Empregado será cadastrado sem setor.\n")
+
+        self.service.register_employee(name, cpf, phone, address, department)
+        print("Empregado cadastrado com sucesso.\n")
+
+    def edit_employee(self):
+        if not self.service.employees:
+            print("Não há empregados cadastrados.\n")
+            return
+        employee = self.choose_employee("Digite o ID do empregado para editar (ou Enter para cancelar): ")
+        if employee is None:
+            return
+        name = input(f"Novo nome ({employee.name}) (ou Enter para manter): ") or employee.name
+        phone = input(f"Novo telefone ({employee.phone}) (ou Enter para manter): ") or employee.phone
+        address = input(f"Novo endereço ({employee.address}) (ou Enter para manter): ") or employee.address
+        self.service.edit_employee(employee.id, name, employee.cpf, phone, address)
+        print("Dados atualizados com sucesso.\n")
+
+    def delete_employee(self):
+        if not self.service.employees:
+            print("Não há empregados cadastrados.\n")
+            return
+        employee = self.choose_employee("Digite o ID do empregado para excluir (ou Enter para cancelar): ")
+        if employee is None:
+            return
+        if input(f"Tem certeza que deseja excluir {employee.name}? (s/n): ").lower() == 's':
+            self.service.delete_employee(employee.id)
+            print("Empregado excluído com sucesso.\n")
+        else:
+            print("Exclusão cancelada.\n")
+
+    def reallocate_employee(self):
+        if not self.service.employees:
+            print("Não há empregados cadastrados.\n")
+            return
+        if not self.service.departments:
+            print("Não há setores cadastrados.\n")
+            return
+        employee = self.choose_employee("Digite o ID do empregado para realocar (ou Enter para cancelar): ")
+        if employee is None:
+            return
+        department = self.choose_department("Digite o número do novo setor (ou Enter para cancelar): ")
+        if department is None:
+            print("Operação cancelada.\n")
+            return
+        self.service.reallocate_employee(employee.id, department)
+        print("Empregado realocado com sucesso.\n")
+
+    def show_employees(self):
+        if not self.service.employees:
+            print("Não há empregados cadastrados.\n")
+            return
+        print("\n--- Lista de Empregados ---")
+        for emp in self.service.employees:
+            print(f"Nome: {emp.name}, CPF: {emp.cpf}, Setor: {emp.department}")
+
+    # --- Setores ---
+
+    def show_departments(self):
+        if not self.service.departments:
+            print("Não há setores cadastrados.\n")
+            return
+        for dept in self.service.departments:
+            print(f"\nSetor: {dept.name}")
+            if dept.team:
+                print("Equipe:")
+                for emp in dept.team:
+                    print(f"- {emp.name} (CPF: {emp.cpf})")
+            else:
+                print("Sem empregados nesse setor.")
+
+    def manage_departments(self):
+        while True:
+            print("\n--- Gerenciar Setores ---")
+            print("1. Criar setor")
+            print("2. Editar setor")
+            print("3. Excluir setor")
+            print("4. Visualizar setores e equipes")
+            print("5. Voltar")
+            option = input("Escolha uma opção: ")
+
+            try:
+                if option == '1':
+                    name = input("Nome do novo setor (ou Enter para cancelar): ")
+                    if not name:
+                        print("Criação cancelada.\n")
+                        continue
+                    self.service.create_department(name)
+                    print("Setor criado com sucesso.\n")
+                elif option in ('2', '3'):
+                    if not self.service.departments:
+                        print("Não há setores cadastrados.\n")
+                        continue
+                    verb = "editar" if option == '2' else "excluir"
+                    name = self.choose_department(f"Digite o número do setor para {verb} (ou Enter para cancelar): ")
+                    if name is None:
+                        continue
+                    if option == '2':
+                        new_name = input(f"Novo nome para o setor ({name}) (ou Enter para cancelar): ")
+                        if not new_name:
+                            print("Edição cancelada.\n")
+                            continue
+                        self.service.rename_department(name, new_name)
+                        print("Setor atualizado com sucesso.\n")
+                    elif input(f"Tem certeza que deseja excluir o setor '{name}'? (s/n): ").lower() == 's':
+                        self.service.remove_department(name)
+                        print("Setor excluído com sucesso.\n")
+                    else:
+                        print("Exclusão cancelada.\n")
+                elif option == '4':
+                    self.show_departments()
+                elif option == '5':
+                    print("Voltando ao menu principal...\n")
+                    break
+                else:
+                    print("Opção inválida.\n")
+            except ServiceError as e:
+                print(f"⚠️ {e}\n")
+            self.save()
+
+
+def main():
+    target = sys.argv[1] if len(sys.argv) > 1 else None
+    if target and is_remote_address(target):
+        service = RemoteCompanyService(target)
+    else:
+        service = CompanyService(storage=open_storage(target) if target
+                                 else DataManager(journal_file="journal.jsonl"))
+    service.load()
+    TerminalApplication(service).run()
+
+
+if __name__ == "__main__":
+    main()
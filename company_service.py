@@ -0,0 +1,595 @@
+import gc
+import sys
+import threading
+from typing import Callable, Dict, List, Optional
+from models import Employee, Department, DepartmentRegistry, EmployeeList, validate_employee_data
+from data_manager import (employee_change, employee_removal, department_creation,
+                          department_rename, department_removal, apply_change)
+from storage import ConflictError
+from perf_metrics import timed
+
+
+class ServiceError(Exception):
+    """Operação recusada por uma regra de negócio; a mensagem é para o usuário"""
+
+
+class NotFoundError(ServiceError):
+    """O empregado ou setor indicado não existe"""
+
+
+class CompanyService:
+    """
+    Regras de negócio da empresa, sem dependência de interface
+
+    Mantém o modelo com índices por ID, por CPF e por nome de setor, de
+    modo que todas as consultas das operações são O(1). Cada operação
+    valida a entrada (levantando ServiceError), altera o modelo e guarda
+    os registros de alteração em pending_changes; quem chama decide
+    quando gravar (save, ou take_changes para gravar por conta própria),
+    o que permite agrupar muitas operações em uma única gravação.
+
+    Interessados em acompanhar o modelo (índices de busca, telas) se
+    inscrevem com subscribe e recebem (evento, empregados), com evento
+    'added', 'updated' ou 'removed', ainda sob o bloqueio do modelo; depois
+    de reload, o evento é 'reloaded' com a lista nova inteira.
+
+    Gravações de outros processos no mesmo armazenamento são incorporadas
+    por sync_external, chamado periodicamente pela interface e, quando o
+    armazenamento acusa conflito (ConflictError), por write antes de
+    gravar de novo (a não ser com merge=False); nesse caso os eventos
+    chegam pela thread que grava.
+    """
+
+    def __init__(self, employees: Optional[List[Employee]] = None,
+                 departments=None, storage=None):
+        self.storage = storage
+        # Operações e gravação em outra thread usam o mesmo bloqueio
+        self.lock = threading.RLock()
+        self.pending_changes: List[dict] = []
+        # Alterações entregues por take_changes e ainda não gravadas, em ordem
+        self.unwritten: List[dict] = []
+        self.listeners: List[Callable] = []
+        self.replace_data(employees or [], departments or [])
+
+    # --- Dados ---
+
+    def replace_data(self, employees: List[Employee], departments):
+        """Instala um modelo novo (por exemplo, recém-carregado) e refaz os índices"""
+        with self.lock:
+            self.employees = employees if isinstance(employees, EmployeeList) \
+                else EmployeeList(employees)
+            self.departments = departments if isinstance(departments, DepartmentRegistry) \
+                else DepartmentRegistry(departments)
+            # Índice por ID da própria lista: entradas e saídas passam por ela
+            self.employees_by_id: Dict[int, Employee] = self.employees.by_id
+            self.employees_by_cpf: Dict[str, Employee] = {emp.cpf: emp for emp in employees}
+
+    def read_data(self) -> tuple:
+        """Lê (empregados, setores) do armazenamento, sem instalar no serviço"""
+        return self.storage.load_all_data()
+
+    def load(self) -> bool:
+        """Carrega o modelo do armazenamento"""
+        employees, departments = self.read_data()
+        self.replace_data(employees, departments)
+        self.pending_changes = []
+        self.unwritten = []
+        return True
+
+    def reload(self):
+        """Recarrega o modelo e avisa os interessados com o evento 'reloaded'"""
+        with self.lock:
+            self.load()
+            self._notify('reloaded', self.employees)
+
+    def take_changes(self) -> List[dict]:
+        """Entrega e esquece os registros de alteração pendentes"""
+        with self.lock:
+            changes, self.pending_changes = self.pending_changes, []
+            self.unwritten.extend(changes)
+            return changes
+
+    def save(self) -> bool:
+        """Grava as alterações pendentes no armazenamento, em uma única operação"""
+        changes = self.take_changes()
+        if not changes:
+            return True
+        saved = False
+        try:
+            saved = self.write(changes)
+            return saved
+        finally:
+            if not saved:
+                # Falhou ou levantou exceção: voltam para a frente das
+                # pendentes, antes das feitas durante a gravação
+                with self.lock:
+                    del self.unwritten[:len(changes)]
+                    self.pending_changes = changes + self.pending_changes
+
+    def write(self, changes: Optional[List[dict]], merge: bool = True) -> bool:
+        """
+        Grava no armazenamento as alterações informadas (None grava tudo)
+
+        Usado por save e por quem agenda as gravações por conta própria,
+        como a interface gráfica, sempre na ordem em que as alterações
+        foram entregues por take_changes e uma gravação por vez. O modelo
+        só fica bloqueado enquanto é copiado (ver write_storage): as
+        operações continuam durante a gravação.
+
+        A trava do armazenamento é sempre tomada antes do bloqueio do
+        modelo, aqui e em sync_external.
+
+        Em caso de conflito, as alterações do outro processo são
+        incorporadas e a gravação refeita; com merge=False, o ConflictError
+        chega a quem chamou, que decide em que thread chamar sync_external
+        antes de gravar de novo (a interface o faz na thread do Tk).
+        """
+        try:
+            saved = self.write_storage(changes)
+        except ConflictError as e:
+            if not merge:
+                raise
+            print(f"Aviso: {e}; incorporando as alterações antes de gravar")
+            # Sob a trava exclusiva, ninguém mais grava entre a leitura
+            # e a nova tentativa, que portanto não tem conflito
+            with self.storage.locked():
+                self.sync_external()
+                saved = self.write_storage(changes)
+        if saved:
+            with self.lock:
+                if changes is None:
+                    self.unwritten = []
+                else:
+                    del self.unwritten[:len(changes)]
+        return saved
+
+    def write_storage(self, changes: Optional[List[dict]]) -> bool:
+        """
+        Grava no armazenamento, sem tratar conflitos
+
+        Se o armazenamento vai ler o modelo, grava uma cópia feita sob o
+        bloqueio (snapshot); senão nem bloqueia o modelo. As marcas dirty
+        dos setores passam para a cópia e voltam se a gravação falhar.
+        """
+        with self.storage.locked():
+            dirty = []
+            with self.lock:
+                if self.storage.needs_model(changes):
+                    dirty = [dept for dept in self.departments if dept.dirty]
+                    employees, departments = self.snapshot()
+                    for dept in dirty:
+                        dept.dirty = False
+                else:
+                    # O armazenamento grava só os registros: o modelo não é lido
+                    employees, departments = self.employees, self.departments
+            saved = False
+            try:
+                if changes is None:
+                    saved = self.storage.save_all_data(employees, departments)
+                else:
+                    saved = self.storage.save_changes(employees, departments, changes)
+            finally:
+                if dirty and not saved:
+                    with self.lock:
+                        for dept in dirty:
+                            dept.dirty = True
+            return saved
+
+    def snapshot(self) -> tuple:
+        """
+        Cópia independente do modelo: (empregados, setores)
+
+        Os empregados são objetos novos (os textos são compartilhados) e
+        as equipes dos setores apontam para eles, de modo que o modelo pode
+        continuar mudando enquanto a cópia é gravada.
+        """
+        with self.lock:
+            # Muitos objetos novos e nenhum ciclo: a coleta de lixo só atrasaria a cópia
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                copies = {emp.id: emp.copy() for emp in self.employees}
+                departments = [dept.copy(copies) for dept in self.departments]
+            finally:
+                if gc_enabled:
+                    gc.enable()
+            return list(copies.values()), departments
+
+    # --- Alterações de outros processos ---
+
+    def sync_external(self) -> bool:
+        """
+        Incorpora ao modelo o que outros processos gravaram
+
+        Em geral o armazenamento entrega só os registros novos do diário,
+        aplicados um a um, e as alterações deste processo ainda não
+        gravadas são reaplicadas por cima: elas serão gravadas depois, e
+        as mais recentes vencem. Se o armazenamento não souber dizer o que
+        mudou, ou se entre as alterações deste processo houver operações
+        de setor (que, reaplicadas sobre si mesmas, não dariam o mesmo
+        resultado que nos arquivos), os dados são relidos, as alterações
+        deste processo aplicadas sobre eles e só a diferença para o
+        modelo atual é aplicada. Em ambos os casos as alterações deste
+        processo são conferidas antes contra os setores que existem (ver
+        _revalidate_own), e os interessados recebem 'added', 'updated' e
+        'removed' apenas com os empregados tocados.
+
+        A trava exclusiva do armazenamento só é tomada quando
+        has_external_changes indica gravações de outros processos: uma
+        consulta periódica sem novidades não bloqueia quem grava.
+
+        Retorna True se o modelo mudou.
+        """
+        if not self.storage.has_external_changes():
+            return False
+        with self.storage.locked(), self.lock:
+            own = self.unwritten + self.pending_changes
+            changes = self.storage.read_external_changes()
+            if changes is None or (changes and any(
+                    change['op'] not in ('save_employee', 'remove_employee') for change in own)):
+                employees, departments = self.read_data()
+                employees_dict = {emp.id: emp for emp in employees}
+                departments_dict = {dept.name: dept for dept in departments}
+                for change in own:
+                    self._revalidate_own(change, departments_dict)
+                    apply_change(change, employees_dict, departments_dict)
+                changes = self._diff_changes(list(employees_dict.values()),
+                                             list(departments_dict.values()))
+                own = []
+            if not changes:
+                return False
+
+            added, updated, removed = {}, {}, {}
+            changed = False
+            for change in changes:
+                changed = self._apply_external(change, added, updated, removed) or changed
+            for change in own:
+                self._revalidate_own(change, self.departments)
+                changed = self._apply_external(change, added, updated, removed) or changed
+            for event, touched in (('removed', removed), ('added', added), ('updated', updated)):
+                if touched:
+                    self._notify(event, list(touched.values()))
+            return changed
+
+    @staticmethod
+    def _revalidate_own(change: dict, departments):
+        """
+        Ajusta um registro deste processo aos setores que existem agora
+
+        Um setor excluído ou renomeado por outro processo não existe mais:
+        o empregado cadastrado ou movido para ele aqui fica sem setor, como
+        se a exclusão tivesse vindo antes. O registro é corrigido no lugar,
+        de modo que a gravação pendente que o contém grava a versão corrigida.
+        """
+        if change['op'] != 'save_employee':
+            return
+        department = change['data']['department']
+        if department != "Nenhum" and department not in departments:
+            change['data'] = dict(change['data'], department="Nenhum")
+
+    def _diff_changes(self, employees: List[Employee], departments) -> List[dict]:
+        """Registros que levam o modelo atual aos dados informados"""
+        names = {dept.name for dept in departments}
+        removed_departments = {dept.name for dept in self.departments if dept.name not in names}
+        # Setores primeiro: excluir um setor mexe no campo department da
+        # equipe, que os registros dos empregados deixam como nos dados
+        changes = [department_creation(dept.name) for dept in departments
+                   if dept.name not in self.departments]
+        changes.extend(department_removal(name) for name in removed_departments)
+        current_ids = set()
+        for emp in employees:
+            current_ids.add(emp.id)
+            own = self.employees_by_id.get(emp.id)
+            if own is None or own.department in removed_departments \
+                    or own.to_dict() != emp.to_dict():
+                changes.append(employee_change(emp))
+        changes.extend(employee_removal(emp) for emp in self.employees
+                       if emp.id not in current_ids)
+        return changes
+
+    def _apply_external(self, change: dict, added: dict, updated: dict, removed: dict):
+        """
+        Aplica um registro de alteração ao modelo e aos índices
+
+        Registros sem efeito (já aplicados) são ignorados; os empregados
+        tocados são anotados por ID em added, updated ou removed. Retorna
+        True se o registro alterou o modelo.
+        """
+        op = change.get('op')
+
+        if op == 'save_employee':
+            data = change['data']
+            employee = self.employees_by_id.get(data['id'])
+            if employee is None:
+                employee = Employee.from_dict(data)
+                self.employees.append(employee)
+                self.employees_by_cpf[employee.cpf] = employee
+                dept = self.departments.get(employee.department)
+                if dept:
+                    dept.add_employee(employee)
+                added[employee.id] = employee
+                return True
+            if employee.to_dict() == data:
+                return False
+            if employee.cpf != data['cpf']:
+                if self.employees_by_cpf.get(employee.cpf) is employee:
+                    del self.employees_by_cpf[employee.cpf]
+                self.employees_by_cpf[data['cpf']] = employee
+                employee.cpf = data['cpf']
+            if employee.department != data['department']:
+                old_dept = self.departments.get(employee.department)
+                if old_dept:
+                    old_dept.remove_employee(employee)
+                new_dept = self.departments.get(data['department'])
+                if new_dept:
+                    new_dept.add_employee(employee)
+                employee.department = sys.intern(data['department'])
+            employee.update_data(data['name'], data['phone'], data['address'])
+            if employee.id not in added:
+                updated[employee.id] = employee
+            return True
+
+        if op == 'remove_employee':
+            employee = self.employees_by_id.get(change['id'])
+            if employee is None:
+                return False
+            self.employees.remove(employee)
+            if self.employees_by_cpf.get(employee.cpf) is employee:
+                del self.employees_by_cpf[employee.cpf]
+            dept = self.departments.get(employee.department)
+            if dept:
+                dept.remove_employee(employee)
+            updated.pop(employee.id, None)
+            # Cadastrado e excluído no mesmo lote: os interessados nem o viram
+            if added.pop(employee.id, None) is None:
+                removed[employee.id] = employee
+            return True
+
+        if op == 'create_department':
+            if change['name'] in self.departments:
+                return False
+            self.departments.add(Department(change['name']))
+            return True
+
+        if op == 'rename_department':
+            department = self.departments.get(change['old_name'])
+            if department is None or change['new_name'] in self.departments:
+                return False
+            for emp in department.team:
+                emp.department = change['new_name']
+                if emp.id not in added:
+                    updated[emp.id] = emp
+            self.departments.rename(department, change['new_name'])
+            return True
+
+        if op == 'remove_department':
+            department = self.departments.get(change['name'])
+            if department is None:
+                return False
+            for emp in department.team:
+                emp.department = "Nenhum"
+                if emp.id not in added:
+                    updated[emp.id] = emp
+            self.departments.remove(department)
+            return True
+
+        print(f"Aviso: operação desconhecida no diário: {op}")
+        return False
+
+    def subscribe(self, listener: Callable):
+        """Registra listener(evento, empregados) para acompanhar mudanças"""
+        self.listeners.append(listener)
+
+    def _notify(self, event: str, employees: List[Employee]):
+        for listener in self.listeners:
+            listener(event, employees)
+
+    # --- Consultas ---
+
+    def get_employee(self, employee_id: int) -> Optional[Employee]:
+        """Empregado pelo ID"""
+        return self.employees_by_id.get(employee_id)
+
+    def find_by_cpf(self, cpf: str) -> Optional[Employee]:
+        """Empregado pelo CPF"""
+        return self.employees_by_cpf.get(cpf)
+
+    def get_department(self, name: str) -> Optional[Department]:
+        """Setor pelo nome"""
+        return self.departments.get(name)
+
+    def _require_employee(self, employee_id: int) -> Employee:
+        employee = self.employees_by_id.get(employee_id)
+        if employee is None:
+            raise NotFoundError("Empregado não encontrado!")
+        return employee
+
+    def _require_department(self, name: str) -> Department:
+        department = self.departments.get(name)
+        if department is None:
+            raise NotFoundError(f"Setor '{name}' não encontrado!")
+        return department
+
+    # --- Empregados ---
+
+    @timed('model.register_employee')
+    def register_employee(self, name: str, cpf: str, phone: str, address: str,
+                          department: str = "Nenhum", employee_id: Optional[int] = None) -> Employee:
+        """
+        Cadastra um empregado, opcionalmente já em um setor
+
+        employee_id só é informado por quem replica um cadastro já feito
+        em outro lugar (o cliente da API); por padrão o ID é o próximo livre.
+        """
+        data = {'name': name, 'cpf': cpf, 'phone': phone, 'address': address}
+        error = validate_employee_data(data)
+        if error:
+            raise ServiceError(error)
+        data = {key: value.strip() for key, value in data.items()}
+        department = department or "Nenhum"
+
+        with self.lock:
+            if data['cpf'] in self.employees_by_cpf:
+                raise ServiceError("CPF já cadastrado!")
+            if employee_id is not None and employee_id in self.employees_by_id:
+                raise ValueError(f"Empregado com ID {employee_id} já existe")
+            dept = self._require_department(department) if department != "Nenhum" else None
+
+            employee = Employee(data['name'], data['cpf'], data['phone'], data['address'],
+                                sys.intern(department), employee_id)
+            self.employees.append(employee)
+            self.employees_by_cpf[employee.cpf] = employee
+            if dept:
+                dept.add_employee(employee)
+            self.pending_changes.append(employee_change(employee))
+            self._notify('added', [employee])
+        return employee
+
+    @timed('model.edit_employee')
+    def edit_employee(self, employee_id: int, name: str, cpf: str, phone: str, address: str,
+                      department: Optional[str] = None) -> Employee:
+        """Altera os dados de um empregado; department=None mantém o setor"""
+        data = {'name': name, 'cpf': cpf, 'phone': phone, 'address': address}
+        error = validate_employee_data(data)
+        if error:
+            raise ServiceError(error)
+        data = {key: value.strip() for key, value in data.items()}
+
+        with self.lock:
+            employee = self._require_employee(employee_id)
+            owner = self.employees_by_cpf.get(data['cpf'])
+            if owner is not None and owner is not employee:
+                raise ServiceError("CPF já cadastrado por outro empregado!")
+            if department is not None and department != employee.department:
+                self._move(employee, department)
+
+            employee.update_data(data['name'], data['phone'], data['address'])
+            if employee.cpf != data['cpf']:
+                del self.employees_by_cpf[employee.cpf]
+                self.employees_by_cpf[data['cpf']] = employee
+                employee.cpf = data['cpf']
+            self.pending_changes.append(employee_change(employee))
+            self._notify('updated', [employee])
+        return employee
+
+    @timed('model.delete_employee')
+    def delete_employee(self, employee_id: int) -> Employee:
+        """Exclui um empregado e o retira do seu setor"""
+        with self.lock:
+            employee = self._require_employee(employee_id)
+            dept = self.departments.get(employee.department)
+            if dept:
+                dept.remove_employee(employee)
+            self.employees.remove(employee)
+            self.employees_by_cpf.pop(employee.cpf, None)
+            self.pending_changes.append(employee_removal(employee))
+            self._notify('removed', [employee])
+        return employee
+
+    @timed('model.reallocate_employee')
+    def reallocate_employee(self, employee_id: int, department: str) -> Employee:
+        """Move um empregado para outro setor ("Nenhum" o deixa sem setor)"""
+        with self.lock:
+            employee = self._require_employee(employee_id)
+            if department != employee.department:
+                self._move(employee, department)
+                self.pending_changes.append(employee_change(employee))
+            self._notify('updated', [employee])
+        return employee
+
+    def _move(self, employee: Employee, department: str):
+        """Troca o setor do empregado (valida o destino antes de mexer)"""
+        new_dept = self._require_department(department) if department != "Nenhum" else None
+        old_dept = self.departments.get(employee.department)
+        if old_dept:
+            old_dept.remove_employee(employee)
+        if new_dept:
+            new_dept.add_employee(employee)
+        employee.department = new_dept.name if new_dept else "Nenhum"
+
+    @timed('model.import_employees')
+    def import_employees(self, path: str):
+        """
+        Importa empregados em lote de um arquivo CSV ou JSON
+
+        Retorna o ImportReport; os aceitos entram em pending_changes.
+        """
+        from bulk_import import import_employees
+
+        with self.lock:
+            report = import_employees(path, self.employees, self.departments, self.employees_by_cpf)
+            self.pending_changes.extend(report.changes)
+            if report.imported:
+                self._notify('added', report.imported)
+        return report
+
+    # --- Setores ---
+
+    def _validate_department_name(self, name: str) -> str:
+        name = (name or '').strip()
+        if not name:
+            raise ServiceError("Nome do setor é obrigatório!")
+        if name == "Nenhum":
+            raise ServiceError("'Nenhum' é reservado para empregados sem setor!")
+        return name
+
+    @timed('model.create_department')
+    def create_department(self, name: str) -> Department:
+        """Cria um setor vazio"""
+        name = self._validate_department_name(name)
+        with self.lock:
+            if name in self.departments:
+                raise ServiceError("Setor já existe!")
+            department = Department(name)
+            self.departments.add(department)
+            self.pending_changes.append(department_creation(name))
+        return department
+
+    @timed('model.rename_department')
+    def rename_department(self, old_name: str, new_name: str) -> Department:
+        """Renomeia um setor e atualiza o campo department da equipe"""
+        new_name = self._validate_department_name(new_name)
+        with self.lock:
+            department = self._require_department(old_name)
+            if new_name == department.name:
+                return department
+            if new_name in self.departments:
+                raise ServiceError("Já existe um setor com esse nome!")
+
+            team = list(department.team)
+            for emp in team:
+                emp.department = new_name
+            self.departments.rename(department, new_name)
+            self.pending_changes.append(department_rename(old_name, new_name))
+            self._notify('updated', team)
+        return department
+
+    @timed('model.remove_department')
+    def remove_department(self, name: str) -> Department:
+        """Exclui um setor; a equipe fica sem setor ("Nenhum")"""
+        with self.lock:
+            department = self._require_department(name)
+            team = list(department.team)
+            for emp in team:
+                emp.department = "Nenhum"
+            self.departments.remove(department)
+            self.pending_changes.append(department_removal(name))
+            self._notify('updated', team)
+        return department
+
+    @timed('model.update_department_references')
+    def fix_department_references(self) -> int:
+        """
+        Corrige empregados que apontam para setores inexistentes
+
+        Retorna quantos foram movidos para "Nenhum".
+        """
+        with self.lock:
+            fixed = [emp for emp in self.employees
+                     if emp.department != "Nenhum" and emp.department not in self.departments]
+            for emp in fixed:
+                emp.department = "Nenhum"
+                self.pending_changes.append(employee_change(emp))
+            if fixed:
+                self._notify('updated', fixed)
+        return len(fixed)
@@ -1,15 +1,294 @@
+import glob
 import json
 import os
-from typing import List, Dict
-from models import Employee, Department
+import re
+from contextlib import contextmanager
+from typing import List, Dict, Iterator, Tuple, Optional
+from models import Employee, Department, ChangeSet
+from storage import StorageBackend, ConflictError, register_backend
+from file_lock import FileLock
+from perf_metrics import timed
 
-class DataManager:
-    def __init__(self, employees_file="employees.json", departments_file="departments.json"):
+_WHITESPACE = re.compile(r'\s*')
+# Caracteres que ainda podem continuar um número (fração e expoente)
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+# Vírgula entre elementos seguida do início do próximo
+_ITEM_SEPARATOR = re.compile(r'\s*,\s*(?=[^\s\]])')
+
+
+def iter_json_array(f, chunk_size=65536) -> Iterator:
+    """
+    Lê um array JSON de um arquivo elemento por elemento
+    
+    Apenas o trecho ainda não consumido do arquivo fica em memória, de
+    modo que o consumo não depende do tamanho do array. Entre dois
+    elementos é exigida exatamente uma vírgula; arrays malformados
+    levantam ValueError.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    
+    def read_more():
+        nonlocal buffer, pos, eof
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer, pos = buffer[pos:] + chunk, 0
+    
+    def next_char():
+        """Próximo caractere depois dos espaços, sem consumi-lo ('' no fim do arquivo)"""
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer) or eof:
+                return buffer[pos:pos + 1]
+            read_more()
+    
+    if next_char() != '[':
+        raise ValueError("o arquivo não contém um array JSON")
+    pos += 1
+    if next_char() == ']':
+        return
+    
+    # Aqui pos está sempre no início de um elemento
+    while True:
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            read_more()
+            continue
+        # Um número que vai até o fim do trecho lido pode continuar no próximo
+        if not eof and isinstance(item, (int, float)) \
+                and _NUMBER_TAIL.match(buffer, end).end() == len(buffer):
+            read_more()
+            continue
+        
+        yield item
+        # Caso comum: vírgula e o início do próximo elemento já no buffer
+        match = _ITEM_SEPARATOR.match(buffer, end)
+        if match:
+            pos = match.end()
+        else:
+            pos = end
+            separator = next_char()
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError("array JSON incompleto" if not separator
+                                 else f"esperado ',' ou ']' no array JSON, encontrado {separator!r}")
+            pos += 1
+            following = next_char()
+            if following == ']':
+                raise ValueError("vírgula sobrando antes do fim do array JSON")
+            if not following:
+                raise ValueError("array JSON incompleto")
+        if pos > chunk_size:
+            buffer, pos = buffer[pos:], 0
+
+
+def write_json_atomic(path: str, data):
+    """
+    Grava JSON em um arquivo temporário e o renomeia sobre o destino
+    
+    A renomeação é atômica: se o processo cair no meio da gravação, o
+    arquivo anterior continua intacto.
+    """
+    temp_file = path + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, path)
+
+
+def employee_change(employee: Employee) -> dict:
+    """Registro de diário para cadastro ou edição de um empregado"""
+    return {'op': 'save_employee', 'data': employee.to_dict()}
+
+
+def employee_removal(employee: Employee) -> dict:
+    """Registro de diário para exclusão de um empregado"""
+    return {'op': 'remove_employee', 'id': employee.id}
+
+
+def department_creation(name: str) -> dict:
+    """Registro de diário para criação de um setor"""
+    return {'op': 'create_department', 'name': name}
+
+
+def department_rename(old_name: str, new_name: str) -> dict:
+    """Registro de diário para renomeação de um setor"""
+    return {'op': 'rename_department', 'old_name': old_name, 'new_name': new_name}
+
+
+def department_removal(name: str) -> dict:
+    """Registro de diário para exclusão de um setor"""
+    return {'op': 'remove_department', 'name': name}
+
+
+@register_backend
+class DataManager(StorageBackend):
+    """Backend JSON: um arquivo de empregados, um de setores e o diário opcional"""
+    
+    name = 'json'
+    extensions = ('.json',)
+    marker_file = 'employees.json'
+    
+    def __init__(self, employees_file="employees.json", departments_file="departments.json",
+                 journal_file=None, compact_every=500, lock_file=None):
         """
         Inicializa o gerenciador de dados
+        
+        Com journal_file definido, cada alteração é acrescentada ao diário em
+        uma linha JSON e os arquivos completos só são reescritos na compactação,
+        a cada compact_every registros.
+        
+        Vários processos podem usar os mesmos arquivos: leituras e gravações
+        passam pela trava em lock_file (por padrão, ao lado do arquivo de
+        empregados), que também guarda a geração dos dados.
         """
         self.employees_file = employees_file
         self.departments_file = departments_file
+        self.journal_file = journal_file
+        self.compact_every = compact_every
+        self.journal_entries = 0
+        # Alterações ainda não incorporadas aos arquivos completos
+        self.unsaved = ChangeSet()
+        self.lock = FileLock(lock_file or employees_file + '.lock')
+        # Geração dos dados na última leitura ou gravação deste processo
+        # (None: nada lido ainda, e as gravações não são conferidas), com a
+        # época e a posição no diário até onde este processo já conhece
+        self.generation = None
+        self.epoch = 0
+        self.journal_offset = 0
+        self._write_depth = 0
+        self._write_epoch = 0
+        self._rewritten = False
+    
+    @classmethod
+    def open(cls, path: str) -> 'DataManager':
+        """
+        Abre o armazenamento JSON em um diretório ou a partir do arquivo de empregados
+        
+        Os arquivos de setores e de diário ficam ao lado do de empregados.
+        """
+        if os.path.isdir(path) or not path.lower().endswith('.json'):
+            os.makedirs(path, exist_ok=True)
+            employees_file = os.path.join(path, 'employees.json')
+        else:
+            employees_file = path
+        directory = os.path.dirname(employees_file)
+        return cls(employees_file,
+                   os.path.join(directory, 'departments.json'),
+                   journal_file=os.path.join(directory, 'journal.jsonl'))
+    
+    def locked(self):
+        """Trava exclusiva entre processos (ver StorageBackend.locked)"""
+        return self.lock.exclusive()
+    
+    @contextmanager
+    def _writing(self, check=True):
+        """
+        Trava exclusiva para uma gravação, conferindo e avançando a geração
+        
+        Com check, se outro processo gravou depois da última leitura ou
+        gravação deste, levanta ConflictError antes de gravar qualquer
+        coisa. Gravações aninhadas (compactação dentro de save_changes)
+        contam como uma só. A época avança se os arquivos completos forem
+        regravados.
+        """
+        with self.lock.exclusive():
+            if self._write_depth:
+                self._write_depth += 1
+                try:
+                    yield
+                finally:
+                    self._write_depth -= 1
+                return
+            current, epoch = self.lock.read_state()
+            if check and self.generation is not None and current != self.generation:
+                raise ConflictError(self.generation, current)
+            self._write_depth = 1
+            self._write_epoch = epoch
+            self._rewritten = False
+            try:
+                yield
+            finally:
+                self._write_depth = 0
+                # Avança mesmo se a gravação falhar: os arquivos podem ter mudado
+                if self._rewritten:
+                    epoch += 1
+                self.lock.write_state(current + 1, epoch)
+                if check or self.generation == current:
+                    # Em dia com os outros processos: o que este gravou não
+                    # precisa ser lido de volta por read_external_changes
+                    self.generation = current + 1
+                    self.epoch = epoch
+                    self.journal_offset = self._journal_size()
+    
+    def _journal_size(self) -> int:
+        if not self.journal_file or not os.path.exists(self.journal_file):
+            return 0
+        return os.path.getsize(self.journal_file)
+    
+    def has_external_changes(self) -> bool:
+        """Compara a geração sob a trava compartilhada (ver StorageBackend.has_external_changes)"""
+        if self.generation is None:
+            return False
+        with self.lock.shared():
+            generation, _ = self.lock.read_state()
+        return generation != self.generation
+    
+    def read_external_changes(self) -> Optional[List[dict]]:
+        """
+        Registros gravados por outros processos desde a última leitura ou gravação deste
+        
+        Sem gravações novas, custa uma trava compartilhada e a leitura dos
+        contadores; com elas, só o trecho novo do diário é lido. Depois de
+        uma compactação de outro processo, o restante do diário antigo é
+        lido do segmento que a compactação preservou. Retorna None quando
+        o que mudou não está no diário (arquivos completos regravados sem
+        compactação, ou mais de uma compactação desde a última leitura):
+        nesse caso é preciso reler os dados.
+        """
+        if self.generation is None:
+            return []
+        with self.lock.shared():
+            generation, epoch = self.lock.read_state()
+            if generation == self.generation:
+                return []
+            if not self.journal_file:
+                return None
+            
+            if epoch == self.epoch:
+                tail = _read_journal_tail(self.journal_file, self.journal_offset)
+                if tail is None:
+                    return None
+                changes, offset = tail
+                journal_entries = self.journal_entries + len(changes)
+            elif epoch == self.epoch + 1 and os.path.exists(self._segment_file(self.epoch)):
+                old_tail = _read_journal_tail(self._segment_file(self.epoch), self.journal_offset)
+                tail = _read_journal_tail(self.journal_file, 0)
+                if old_tail is None or tail is None:
+                    return None
+                changes, offset = tail
+                journal_entries = len(changes)
+                changes = old_tail[0] + changes
+            else:
+                return None
+        
+        for change in changes:
+            self.unsaved.record(change)
+        self.generation, self.epoch, self.journal_offset = generation, epoch, offset
+        self.journal_entries = journal_entries
+        return changes
+    
+    def _segment_file(self, epoch: int) -> str:
+        """Diário da época informada, preservado pela compactação que a encerrou"""
+        return f"{self.journal_file}.{epoch}"
     
     def save_employees(self, employees: List[Employee]) -> bool:
         """
@@ -17,8 +296,8 @@ class DataManager:
         """
         try:
             data = [emp.to_dict() for emp in employees]
-            with open(self.employees_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._rewritten = True
+            write_json_atomic(self.employees_file, data)
             return True
         except Exception as e:
             print(f"Erro ao salvar empregados: {e}")
@@ -29,29 +308,89 @@ class DataManager:
         Carrega a lista de empregados do arquivo JSON
         """
         try:
-            if not os.path.exists(self.employees_file):
-                return []
-            
-            with open(self.employees_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            employees = []
-            for emp_data in data:
-                employees.append(Employee.from_dict(emp_data))
-            
-            return employees
+            return list(self.iter_snapshot_employees())
         except Exception as e:
             print(f"Erro ao carregar empregados: {e}")
             return []
     
+    def iter_snapshot_employees(self) -> Iterator[Employee]:
+        """
+        Lê os empregados do arquivo JSON um a um, sem aplicar o diário
+        """
+        if not os.path.exists(self.employees_file):
+            return
+        yield from _read_employees(open(self.employees_file, 'r', encoding='utf-8'))
+    
+    def iter_employees(self) -> Iterator[Employee]:
+        """
+        Percorre os empregados com memória constante, já com o diário aplicado
+        
+        Destinado a exportações e relatórios que não precisam da lista
+        inteira. Só o diário (limitado por compact_every) é mantido em
+        memória; o arquivo de empregados é lido em fluxo.
+        """
+        # Só a leitura do diário e a abertura do snapshot ficam sob a trava:
+        # uma compactação posterior substitui o arquivo sem alterar o aberto
+        with self.lock.shared():
+            last_saves, department_ops = self._journal_overlay()
+            f = open(self.employees_file, 'r', encoding='utf-8') \
+                if os.path.exists(self.employees_file) else None
+        snapshot = _read_employees(f) if f is not None else iter(())
+        
+        for emp in snapshot:
+            index, data = last_saves.pop(emp.id, (-1, None))
+            if index >= 0:
+                if data is None:
+                    continue
+                emp = Employee.from_dict(data)
+            emp.department = _department_after(emp.department, index, department_ops)
+            yield emp
+        
+        # Empregados cadastrados depois do último snapshot
+        for emp_id, (index, data) in last_saves.items():
+            if data is not None:
+                emp = Employee.from_dict(data)
+                emp.department = _department_after(emp.department, index, department_ops)
+                yield emp
+    
+    def _journal_overlay(self) -> Tuple[Dict[int, tuple], List[tuple]]:
+        """
+        Resume o diário para leitura em fluxo
+        
+        Retorna o último estado de cada empregado alterado (posição no
+        diário e dados, ou None se excluído) e as operações de setor que
+        afetam o campo department, com suas posições.
+        """
+        last_saves = {}
+        department_ops = []
+        if not self.journal_file or not os.path.exists(self.journal_file):
+            return last_saves, department_ops
+        
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for index, line in enumerate(f):
+                try:
+                    change = json.loads(line)
+                except ValueError:
+                    break
+                op = change.get('op')
+                if op == 'save_employee':
+                    last_saves[change['data']['id']] = (index, change['data'])
+                elif op == 'remove_employee':
+                    last_saves[change['id']] = (index, None)
+                elif op in ('rename_department', 'remove_department'):
+                    department_ops.append((index, change))
+        return last_saves, department_ops
+    
     def save_departments(self, departments: List[Department]) -> bool:
         """
         Salva a lista de setores no arquivo JSON
         """
         try:
             data = [dept.to_dict() for dept in departments]
-            with open(self.departments_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._rewritten = True
+            write_json_atomic(self.departments_file, data)
+            for dept in departments:
+                dept.dirty = False
             return True
         except Exception as e:
             print(f"Erro ao salvar setores: {e}")
@@ -62,35 +401,354 @@ class DataManager:
         Carrega a lista de setores do arquivo JSON
         """
         try:
-            if not os.path.exists(self.departments_file):
-                return []
-            
-            with open(self.departments_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            departments = []
-            for dept_data in data:
-                departments.append(Department.from_dict(dept_data, employees_dict))
-            
-            return departments
+            return self._read_departments(employees_dict)
         except Exception as e:
             print(f"Erro ao carregar setores: {e}")
             return []
     
-    def save_all_data(self, employees: List[Employee], departments: List[Department]) -> bool:
+    def _read_departments(self, employees_dict: Dict[int, Employee]) -> List[Department]:
+        """Lê os setores do arquivo JSON, levantando exceção se ele não puder ser lido"""
+        if not os.path.exists(self.departments_file):
+            return []
+        with open(self.departments_file, 'r', encoding='utf-8') as f:
+            return [Department.from_dict(dept_data, employees_dict) for dept_data in iter_json_array(f)]
+    
+    @timed('data_manager.save_all_data')
+    def save_all_data(self, employees: List[Employee], departments: List[Department],
+                      dirty: Optional[ChangeSet] = None) -> bool:
         """
         Salva todos os dados (empregados e setores)
+        
+        Com dirty informado, só os arquivos cujas coleções mudaram são
+        regravados (arquivos ainda inexistentes são sempre criados). Sem
+        ele, havendo diário, o diário recomeça vazio: os arquivos completos
+        já contêm tudo, e registros antigos reaplicados sobre eles
+        desfariam alterações mais novas.
         """
-        employees_saved = self.save_employees(employees)
-        departments_saved = self.save_departments(departments)
+        employees_saved = departments_saved = True
+        with self._writing():
+            if dirty is None or dirty.employees or not os.path.exists(self.employees_file):
+                employees_saved = self.save_employees(employees)
+            if dirty is None or dirty.departments_changed(departments) \
+                    or not os.path.exists(self.departments_file):
+                departments_saved = self.save_departments(departments)
+            if dirty is None and self.journal_file and employees_saved and departments_saved:
+                self.unsaved.clear()
+                return self._restart_journal(keep_segment=False)
         return employees_saved and departments_saved
     
+    def upsert_employee(self, employee: Employee) -> bool:
+        """
+        Insere ou atualiza um empregado
+        
+        Com diário, acrescenta um registro; sem diário, regrava o arquivo de
+        empregados e, se o empregado mudou de setor, o de setores.
+        """
+        # Alteração de um registro só, que não depende do modelo em memória:
+        # não há conflito a conferir
+        with self._writing(check=False):
+            if self.journal_file:
+                return self.append_journal([employee_change(employee)])
+            return self._rewrite_with(employee_change(employee))
+    
+    def delete_employee(self, employee_id: int) -> bool:
+        """
+        Exclui um empregado
+        
+        Com diário, acrescenta um registro; sem diário, regrava o arquivo de
+        empregados e, se ele estava em um setor, o de setores.
+        """
+        with self._writing(check=False):
+            if self.journal_file:
+                return self.append_journal([{'op': 'remove_employee', 'id': employee_id}])
+            return self._rewrite_with({'op': 'remove_employee', 'id': employee_id})
+    
+    def _rewrite_with(self, change: dict) -> bool:
+        """
+        Aplica um registro aos arquivos completos (sem diário) e os regrava
+        
+        Se os arquivos não puderem ser lidos, nada é regravado: gravar só
+        o que se conseguiu ler apagaria os demais registros.
+        """
+        try:
+            employees_dict = {emp.id: emp for emp in self.iter_snapshot_employees()}
+            departments = self._read_departments(employees_dict)
+        except Exception as e:
+            print(f"Erro ao carregar dados, nada foi gravado: {e}")
+            return False
+        apply_change(change, employees_dict, {dept.name: dept for dept in departments})
+        if not self.save_employees(list(employees_dict.values())):
+            return False
+        if any(dept.dirty for dept in departments):
+            return self.save_departments(departments)
+        return True
+    
+    @timed('data_manager.save_changes')
+    def save_changes(self, employees: List[Employee], departments: List[Department],
+                     changes: List[dict]) -> bool:
+        """
+        Salva apenas as alterações informadas
+        
+        Sem diário configurado, equivale a save_all_data. Com diário, as
+        alterações são acrescentadas ao final do arquivo de diário e a
+        compactação acontece quando o limite de registros é atingido.
+        Mesmo então elas passam pelo diário antes, para que outros
+        processos as leiam do segmento preservado pela compactação.
+        """
+        with self._writing():
+            for change in changes:
+                self.unsaved.record(change)
+            
+            if not self.journal_file:
+                return self.compact(employees, departments)
+            if self.journal_entries + len(changes) > self.compact_every:
+                return self.append_journal(changes) and self.compact(employees, departments)
+            
+            return self.append_journal(changes)
+    
+    def needs_model(self, changes: Optional[List[dict]]) -> bool:
+        """Com diário, o modelo só é lido na compactação (ver StorageBackend.needs_model)"""
+        return changes is None or not self.journal_file \
+            or self.journal_entries + len(changes) > self.compact_every
+    
+    @timed('data_manager.append_journal')
+    def append_journal(self, changes: List[dict]) -> bool:
+        """
+        Acrescenta registros ao diário de operações
+        """
+        if not changes:
+            return True
+        with self._writing():
+            try:
+                lines = ''.join(json.dumps(change, ensure_ascii=False) + '\n' for change in changes)
+                with open(self.journal_file, 'a', encoding='utf-8') as f:
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.journal_entries += len(changes)
+                return True
+            except Exception as e:
+                print(f"Erro ao gravar diário: {e}")
+                return False
+    
+    @timed('data_manager.compact')
+    def compact(self, employees: List[Employee], departments: List[Department]) -> bool:
+        """
+        Grava um snapshot completo e começa um diário novo
+        
+        O diário só é trocado depois que o snapshot foi gravado; se o
+        processo cair entre as duas etapas, os registros são reaplicados
+        sobre o snapshot novo sem efeito, pois todas as operações são
+        idempotentes.
+        
+        Só são regravados os arquivos tocados desde a última compactação.
+        O diário antigo é preservado como segmento da época que termina,
+        para que outros processos leiam o que faltava dele sem reler os
+        arquivos completos; o segmento anterior é apagado.
+        """
+        with self._writing():
+            if not self.save_all_data(employees, departments, self.unsaved):
+                return False
+            self.unsaved.clear()
+            if not self.journal_file:
+                self.journal_entries = 0
+                return True
+            return self._restart_journal(keep_segment=True)
+    
+    def _restart_journal(self, keep_segment: bool) -> bool:
+        """
+        Começa um diário vazio (dentro de uma gravação)
+        
+        Com keep_segment, o diário anterior vira o segmento da época que
+        termina; os demais segmentos são apagados.
+        """
+        try:
+            self._rewritten = True
+            segment = self._segment_file(self._write_epoch) if keep_segment else None
+            for old_segment in glob.glob(glob.escape(self.journal_file) + '.*'):
+                if old_segment != segment:
+                    os.remove(old_segment)
+            if segment and os.path.exists(self.journal_file):
+                os.replace(self.journal_file, segment)
+            open(self.journal_file, 'w', encoding='utf-8').close()
+            self.journal_entries = 0
+            return True
+        except Exception as e:
+            print(f"Erro ao compactar diário: {e}")
+            return False
+    
+    def replay_journal(self, employees_dict: Dict[int, Employee],
+                       departments_dict: Dict[str, Department]) -> int:
+        """
+        Reaplica o diário sobre os dados carregados do snapshot
+        
+        Uma linha final incompleta (gravação interrompida) encerra a
+        leitura sem erro. Retorna o número de registros aplicados.
+        """
+        if not self.journal_file or not os.path.exists(self.journal_file):
+            return 0
+        
+        applied = 0
+        try:
+            with open(self.journal_file, 'rb+') as f:
+                valid_end = 0
+                for line in f:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError("linha sem terminador")
+                        if line.strip():
+                            change = json.loads(line.decode('utf-8'))
+                            apply_change(change, employees_dict, departments_dict)
+                            self.unsaved.record(change)
+                            applied += 1
+                    except ValueError:
+                        # Descarta o resto para que novas linhas não sejam
+                        # concatenadas a um registro pela metade
+                        print("Aviso: registro incompleto no final do diário descartado")
+                        f.truncate(valid_end)
+                        break
+                    valid_end += len(line)
+        except Exception as e:
+            print(f"Erro ao ler diário: {e}")
+        return applied
+    
+    @timed('data_manager.load_all_data')
     def load_all_data(self) -> tuple:
         """
         Carrega todos os dados (empregados e setores)
+        
+        Os empregados são lidos em fluxo direto para o dicionário por ID,
+        sem montar antes uma lista intermediária de dicionários. A leitura
+        acontece sob a trava compartilhada, de modo que nenhum outro
+        processo grava no meio dela, e registra a geração lida.
         """
-        employees = self.load_employees()
-        employees_dict = {emp.id: emp for emp in employees}
-        departments = self.load_departments(employees_dict)
+        with self.lock.shared():
+            generation, epoch = self.lock.read_state()
+            employees_dict = {}
+            try:
+                for emp in self.iter_snapshot_employees():
+                    employees_dict[emp.id] = emp
+            except Exception as e:
+                print(f"Erro ao carregar empregados: {e}")
+                employees_dict = {}
+            employees = list(employees_dict.values())
+            departments = self.load_departments(employees_dict)
+            
+            if self.journal_file:
+                departments_dict = {dept.name: dept for dept in departments}
+                self.journal_entries = self.replay_journal(employees_dict, departments_dict)
+                if self.journal_entries:
+                    employees = list(employees_dict.values())
+                    departments = list(departments_dict.values())
+            self.journal_offset = self._journal_size()
         
+        self.generation, self.epoch = generation, epoch
         return employees, departments
+
+
+def _read_journal_tail(path: str, offset: int) -> Optional[tuple]:
+    """
+    Registros completos do diário a partir da posição offset
+    
+    Retorna (registros, posição final), ou None se o arquivo for menor
+    que offset (foi trocado ou truncado).
+    """
+    if not os.path.exists(path):
+        return ([], 0) if offset == 0 else None
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() < offset:
+            return None
+        f.seek(offset)
+        data = f.read()
+    changes = []
+    for line in data.splitlines(keepends=True):
+        try:
+            if not line.endswith(b'\n'):
+                raise ValueError("linha sem terminador")
+            if line.strip():
+                changes.append(json.loads(line.decode('utf-8')))
+        except ValueError:
+            break
+        offset += len(line)
+    return changes, offset
+
+
+def _read_employees(f) -> Iterator[Employee]:
+    """Lê em fluxo os empregados de um arquivo JSON já aberto, fechando-o ao final"""
+    with f:
+        for emp_data in iter_json_array(f):
+            yield Employee.from_dict(emp_data)
+
+
+def _department_after(department: str, index: int, department_ops: List[tuple]) -> str:
+    """Aplica ao nome do setor as renomeações/exclusões posteriores à posição index"""
+    for op_index, change in department_ops:
+        if op_index <= index:
+            continue
+        if change['op'] == 'rename_department' and department == change['old_name']:
+            department = change['new_name']
+        elif change['op'] == 'remove_department' and department == change['name']:
+            department = "Nenhum"
+    return department
+
+
+def apply_change(change: dict, employees_dict: Dict[int, Employee],
+                 departments_dict: Dict[str, Department]):
+    """
+    Aplica um registro do diário sobre o modelo em memória
+    
+    Os dicionários preservam a ordem de inserção, que é a ordem de exibição.
+    """
+    op = change.get('op')
+    
+    if op == 'save_employee':
+        data = change['data']
+        employee = employees_dict.get(data['id'])
+        if employee is None:
+            employee = Employee.from_dict(data)
+            employees_dict[employee.id] = employee
+            old_department = None
+        else:
+            old_department = employee.department
+            employee.update_data(data['name'], data['phone'], data['address'])
+            employee.cpf = data['cpf']
+            employee.department = data['department']
+        
+        if old_department != employee.department:
+            if old_department in departments_dict:
+                departments_dict[old_department].remove_employee(employee)
+            if employee.department in departments_dict:
+                departments_dict[employee.department].add_employee(employee)
+    
+    elif op == 'remove_employee':
+        employee = employees_dict.pop(change['id'], None)
+        if employee is not None and employee.department in departments_dict:
+            departments_dict[employee.department].remove_employee(employee)
+    
+    elif op == 'create_department':
+        if change['name'] not in departments_dict:
+            departments_dict[change['name']] = Department(change['name'])
+    
+    elif op == 'rename_department':
+        old_name, new_name = change['old_name'], change['new_name']
+        if old_name in departments_dict and new_name not in departments_dict:
+            dept = departments_dict[old_name]
+            dept.name = new_name
+            dept.dirty = True
+            for emp in dept.team:
+                emp.department = new_name
+            # Recria o dicionário para manter a posição do setor na ordem
+            renamed = {(new_name if name == old_name else name): d
+                       for name, d in departments_dict.items()}
+            departments_dict.clear()
+            departments_dict.update(renamed)
+    
+    elif op == 'remove_department':
+        dept = departments_dict.pop(change['name'], None)
+        if dept is not None:
+            for emp in dept.team:
+                emp.department = "Nenhum"
+    
+    else:
+        print(f"Aviso: operação desconhecida no diário: {op}")
@@ -0,0 +1,102 @@
+"""
+Trava consultiva entre processos, com contador de geração
+
+A trava é um arquivo ao lado dos dados: leitores usam a trava
+compartilhada e escritores a exclusiva (fcntl.flock). O mesmo arquivo
+guarda dois contadores: a geração, incrementada a cada gravação, que
+permite a um processo perceber que outro gravou depois da sua última
+leitura, e a época, incrementada quando os arquivos completos são
+regravados (e o que mudou já não se lê só no final do diário).
+
+Sem fcntl (Windows), a trava entre processos é omitida; a exclusão entre
+threads do mesmo processo continua valendo.
+"""
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Geração e época ocupam um registro de tamanho fixo no início do arquivo
+_RECORD = 42
+
+
+class FileLock:
+    """
+    Trava do armazenamento sobre um arquivo auxiliar
+
+    Reentrante na mesma thread: um trecho já travado pode chamar outro
+    que trava de novo (a trava mais externa é a que vale).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._fd = None
+        self._depth = 0
+
+    @contextmanager
+    def shared(self):
+        """Trava de leitura: vários leitores ao mesmo tempo, nenhum escritor"""
+        with self._acquire(False):
+            yield
+
+    @contextmanager
+    def exclusive(self):
+        """Trava de escrita: um escritor, nenhum leitor"""
+        with self._acquire(True):
+            yield
+
+    @contextmanager
+    def _acquire(self, exclusive):
+        with self._thread_lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+
+            # O arquivo fica aberto entre um uso e outro: sem disputa, travar
+            # custa só as duas chamadas a flock
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._depth = 1
+            try:
+                yield
+            finally:
+                self._depth = 0
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        """Fecha o arquivo da trava"""
+        with self._thread_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def read_state(self):
+        """(geração, época) atuais, (0, 0) se nunca houve gravação; exige a trava"""
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        fields = os.read(self._fd, _RECORD).split()
+        try:
+            return int(fields[0]), int(fields[1])
+        except (IndexError, ValueError):
+            return 0, 0
+
+    def write_state(self, generation, epoch):
+        """
+        Grava os novos contadores; exige a trava exclusiva
+
+        Sem fsync: os contadores só coordenam processos em execução, e
+        depois de uma queda todos recarregam os dados de qualquer forma.
+        """
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, b'%020d %020d\n' % (generation, epoch))
@@ -1,34 +1,126 @@
+import queue
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-from models import Employee, Department
+from tkinter import ttk, messagebox, simpledialog, filedialog
+from models import validate_employee_data
 from data_manager import DataManager
+from company_service import CompanyService, ServiceError
+from virtual_treeview import VirtualTreeview
+from save_scheduler import SaveScheduler
+from bulk_export import export_employees
+from search_index import EmployeeSearchIndex, TrigramIndex
+import perf_metrics
+import memory_report
+
+# A partir deste número de empregados a tabela usa rolagem virtual
+VIRTUAL_MODE_THRESHOLD = 50000
+
+# Máximo de resultados exibidos pela busca da aba de empregados
+SEARCH_LIMIT = 100
+
+# Intervalo da verificação de alterações gravadas por outras instâncias
+EXTERNAL_POLL_MS = 1000
+
+# Atributo de Employee exibido em cada coluna da tabela de empregados
+EMPLOYEE_COLUMNS = {
+    'ID': 'id',
+    'Nome': 'name',
+    'CPF': 'cpf',
+    'Telefone': 'phone',
+    'Endereço': 'address',
+    'Setor': 'department',
+}
 
 class EmployeeManagementApp:
     """Aplicação principal com interface gráfica"""
     
-    def __init__(self, root):
+    def __init__(self, root, data_manager=None, virtual_mode=None, service=None):
         """
         Inicializa a aplicação GUI
+        
+        data_manager pode ser qualquer gerenciador com a interface do
+        DataManager (por exemplo, SQLiteDataManager). Em vez dele pode vir
+        um service pronto, como o RemoteCompanyService, que usa um servidor
+        da API como armazenamento. virtual_mode força
+        (ou desliga) a tabela de empregados com rolagem virtual; por padrão
+        ela é usada a partir de VIRTUAL_MODE_THRESHOLD empregados.
+        
+        Os dados são carregados em uma thread separada: a janela aparece
+        imediatamente e as operações ficam desabilitadas até o fim da carga.
+        Os tempos até a primeira janela e até a aplicação ficar utilizável
+        ficam em startup_timings.
+        
+        As regras de negócio ficam no CompanyService; a interface só coleta
+        os dados, chama o serviço e mostra os erros dele.
+        
+        As gravações também saem da thread do Tk: o SaveScheduler agrupa as
+        edições feitas em sequência e as grava em segundo plano. Alterações
+        no modelo são feitas sob model_lock (o bloqueio do serviço); a
+        thread de escrita só o segura para copiar o modelo, e a interface
+        continua respondendo durante a gravação.
         """
+        self.startup_started = time.perf_counter()
+        self.startup_timings = {}
         self.root = root
         self.root.title("Sistema de Gestão de Empresa")
         self.root.geometry("800x600")
         self.root.resizable(True, True)
         
-        # Inicializar gerenciador de dados
-        self.data_manager = DataManager()
-        
-        # Carregar dados existentes
-        self.employees, self.departments = self.data_manager.load_all_data()
+        # Inicializar gerenciador de dados (alterações vão para o diário)
+        if service is None:
+            service = CompanyService(storage=data_manager or DataManager(journal_file="journal.jsonl"))
+        self.data_manager = service.storage
+        
+        # Modelo vazio até a carga terminar; os índices de busca acompanham o serviço
+        self.service = service
+        self.service.subscribe(self.on_model_change)
+        self.model_lock = self.service.lock
+        self.employees = self.service.employees
+        self.departments = self.service.departments
+        self.rebuild_indexes()
+        self.requested_virtual_mode = virtual_mode
+        self.virtual_mode = bool(virtual_mode)
+        self.employees_view = None
+        # Busca aproximada: o índice é montado em segundo plano após a carga;
+        # alterações feitas antes disso ficam em fuzzy_pending
+        self.fuzzy_index = None
+        self.fuzzy_pending = []
+        self.employee_filter = None
+        # Muda a cada alteração no modelo ou na busca (a tabela virtual só
+        # reordena quando ela muda)
+        self.rows_version = 0
         
         # Configurar interface
         self.setup_ui()
-        
-        # Atualizar exibições
-        self.refresh_all_displays()
+        self.set_operations_enabled(False)
+        self.root.after_idle(self.mark_first_window)
+        
+        # Gravação em segundo plano; ao fechar, grava o que estiver pendente
+        self.save_scheduler = SaveScheduler(
+            self.root, self.write_data,
+            on_state_change=lambda state: self.save_state_label.configure(text=state),
+            on_conflict=self.sync_external_changes,
+            on_error=self.on_save_error)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Carregar dados existentes em segundo plano
+        self.start_background_load()
     
     def setup_ui(self):
         """Configura a interface do usuário"""
+        # Menu
+        menubar = tk.Menu(self.root)
+        self.file_menu = tk.Menu(menubar, tearoff=0)
+        self.file_menu.add_command(label="Importar Empregados...", command=self.import_employees_dialog)
+        self.file_menu.add_command(label="Exportar Empregados...", command=self.export_employees_dialog)
+        menubar.add_cascade(label="Arquivo", menu=self.file_menu)
+        view_menu = tk.Menu(menubar, tearoff=0)
+        view_menu.add_command(label="Painel de Desempenho", command=self.performance_panel)
+        view_menu.add_command(label="Relatório de Memória...", command=self.memory_report_dialog)
+        menubar.add_cascade(label="Exibir", menu=view_menu)
+        self.root.config(menu=menubar)
+        
         # Frame principal
         main_frame = ttk.Frame(self.root, padding="10")
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -69,7 +161,10 @@ class EmployeeManagementApp:
         ttk.Separator(buttons_frame, orient='horizontal').pack(fill=tk.X, pady=10)
         
         ttk.Button(buttons_frame, text="Atualizar Exibição", 
-                  command=self.refresh_all_displays).pack(fill=tk.X, pady=2)
+                  command=self.refresh_from_storage).pack(fill=tk.X, pady=2)
+        
+        self.operation_buttons = [widget for widget in buttons_frame.winfo_children()
+                                  if isinstance(widget, ttk.Button)]
         
         # Frame de exibição (lado direito)
         display_frame = ttk.Frame(main_frame)
@@ -90,19 +185,163 @@ class EmployeeManagementApp:
         self.departments_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.departments_frame, text="Setores")
         
-        # Configurar conteúdo das abas
-        self.setup_employees_tab()
+        # Barra de status com indicador de progresso
+        status_frame = ttk.Frame(main_frame)
+        status_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
+        status_frame.columnconfigure(0, weight=1)
+        self.status_label = ttk.Label(status_frame, text="")
+        self.status_label.grid(row=0, column=0, sticky=tk.W)
+        self.progress = ttk.Progressbar(status_frame, mode='indeterminate', length=150)
+        self.progress.grid(row=0, column=1, sticky=tk.E)
+        self.save_state_label = ttk.Label(status_frame, text="")
+        self.save_state_label.grid(row=0, column=2, sticky=tk.E, padx=(10, 0))
+        
+        # Configurar conteúdo das abas (a de empregados depende do
+        # tamanho dos dados e é montada ao fim da carga)
         self.setup_departments_tab()
     
+    def set_operations_enabled(self, enabled):
+        """Habilita ou desabilita os botões de operação"""
+        state = '!disabled' if enabled else 'disabled'
+        for button in self.operation_buttons:
+            button.state([state])
+        for index in range(self.file_menu.index(tk.END) + 1):
+            self.file_menu.entryconfigure(index, state=tk.NORMAL if enabled else tk.DISABLED)
+    
+    def mark_first_window(self):
+        """Registra o tempo até a primeira exibição da janela"""
+        self.startup_timings['first_window'] = time.perf_counter() - self.startup_started
+    
+    def start_background_load(self):
+        """Inicia a carga dos dados em uma thread separada"""
+        self.status_label.configure(text="Carregando dados...")
+        self.progress.start(10)
+        self.load_queue = queue.Queue()
+        threading.Thread(target=self.load_worker, daemon=True).start()
+        self.root.after(50, self.poll_load_queue)
+    
+    def load_worker(self):
+        """Executado fora da thread do Tk: só lê os dados e os entrega pela fila"""
+        try:
+            with perf_metrics.timer('load.read'):
+                employees, departments = self.service.read_data()
+            # O índice de busca também é montado fora da thread do Tk
+            self.load_queue.put(('ok', (employees, departments, EmployeeSearchIndex(employees))))
+        except Exception as e:
+            self.load_queue.put(('error', e))
+    
+    def poll_load_queue(self):
+        """Verifica, na thread do Tk, se a carga terminou"""
+        try:
+            status, payload = self.load_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(50, self.poll_load_queue)
+            return
+        
+        self.progress.stop()
+        self.progress.grid_remove()
+        if status == 'error':
+            messagebox.showerror("Erro", f"Falha ao carregar dados: {payload}")
+            payload = ([], [])
+        self.on_data_loaded(*payload)
+    
+    def on_data_loaded(self, employees, departments, search_index=None):
+        """Instala o modelo carregado e libera a interface"""
+        self.service.replace_data(employees, departments)
+        self.employees = self.service.employees
+        self.departments = self.service.departments
+        self.rebuild_indexes(search_index)
+        
+        if self.requested_virtual_mode is None:
+            self.virtual_mode = len(self.employees) >= VIRTUAL_MODE_THRESHOLD
+        self.setup_employees_tab()
+        self.refresh_all_displays()
+        self.start_fuzzy_index_build()
+        self.root.after(EXTERNAL_POLL_MS, self.poll_external_changes)
+        
+        self.set_operations_enabled(True)
+        self.startup_timings['interactive'] = time.perf_counter() - self.startup_started
+        self.status_label.configure(
+            text=f"{len(self.employees)} empregados carregados "
+                 f"(janela em {self.startup_timings.get('first_window', 0) * 1000:.0f} ms, "
+                 f"utilizável em {self.startup_timings['interactive'] * 1000:.0f} ms)")
+    
+    def start_fuzzy_index_build(self):
+        """Monta o índice de busca aproximada em uma thread separada"""
+        texts = [(emp.id, self.fuzzy_text(emp)) for emp in self.employees]
+        index_queue = queue.Queue()
+        # Uma montagem nova (após recarregar o modelo) descarta a anterior
+        self.fuzzy_build = build = object()
+        
+        def worker():
+            index = TrigramIndex()
+            for emp_id, text in texts:
+                index.add(emp_id, text)
+            index_queue.put(index)
+        
+        def poll():
+            try:
+                index = index_queue.get_nowait()
+            except queue.Empty:
+                self.root.after(100, poll)
+                return
+            if self.fuzzy_build is not build:
+                return
+            # Aplica o que mudou durante a montagem
+            for emp, removed in self.fuzzy_pending:
+                if removed:
+                    index.remove(emp.id)
+                else:
+                    index.update(emp.id, self.fuzzy_text(emp))
+            self.fuzzy_pending = []
+            self.fuzzy_index = index
+            if self.search_var.get().strip():
+                self.apply_employee_search()
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, poll)
+    
+    @staticmethod
+    def fuzzy_text(emp):
+        """Texto indexado para a busca aproximada"""
+        return f"{emp.name} {emp.address}"
+    
     def setup_employees_tab(self):
         """Configura a aba de empregados"""
+        # Barra de busca
+        search_frame = ttk.Frame(self.employees_frame)
+        search_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
+        ttk.Label(search_frame, text="Buscar:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.search_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        ttk.Button(search_frame, text="Limpar", command=lambda: self.search_var.set("")).pack(side=tk.LEFT)
+        self.search_status = ttk.Label(search_frame, text="")
+        self.search_status.pack(side=tk.LEFT, padx=(5, 0))
+        self.search_after = None
+        self.search_var.trace_add('write', lambda *args: self.schedule_employee_search())
+        
         # Treeview para empregados
-        columns = ('ID', 'Nome', 'CPF', 'Telefone', 'Endereço', 'Setor')
-        self.employees_tree = ttk.Treeview(self.employees_frame, columns=columns, show='headings')
+        columns = tuple(EMPLOYEE_COLUMNS)
+        # Valores exibidos por ID de empregado (iid do item na árvore)
+        self.employee_rows = {}
+        
+        if self.virtual_mode:
+            # Só as linhas visíveis existem como itens Tk
+            self.employees_view = VirtualTreeview(
+                self.employees_frame, columns,
+                row_count=lambda: len(self.shown_employees()),
+                get_row=lambda index: self.employee_values(self.shown_employees()[index]),
+                sort_keys=self.employee_sort_keys,
+                data_version=lambda: self.rows_version)
+            self.employees_tree = self.employees_view.tree
+            self.employees_tree.bind('<Control-g>', lambda e: self.jump_to_row_dialog())
+        else:
+            self.employees_tree = ttk.Treeview(self.employees_frame, columns=columns, show='headings')
         
         # Configurar colunas
         for col in columns:
-            self.employees_tree.heading(col, text=col)
+            if not self.virtual_mode:
+                self.employees_tree.heading(col, text=col)
             if col == 'ID':
                 self.employees_tree.column(col, width=50)
             elif col in ['CPF', 'Telefone']:
@@ -110,19 +349,25 @@ class EmployeeManagementApp:
             else:
                 self.employees_tree.column(col, width=120)
         
+        if self.virtual_mode:
+            self.employees_view.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+            self.employees_frame.columnconfigure(0, weight=1)
+            self.employees_frame.rowconfigure(1, weight=1)
+            return
+        
         # Scrollbars
         emp_scrollbar_y = ttk.Scrollbar(self.employees_frame, orient=tk.VERTICAL, command=self.employees_tree.yview)
         emp_scrollbar_x = ttk.Scrollbar(self.employees_frame, orient=tk.HORIZONTAL, command=self.employees_tree.xview)
         self.employees_tree.configure(yscrollcommand=emp_scrollbar_y.set, xscrollcommand=emp_scrollbar_x.set)
         
         # Grid
-        self.employees_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        emp_scrollbar_y.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        emp_scrollbar_x.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.employees_tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        emp_scrollbar_y.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        emp_scrollbar_x.grid(row=2, column=0, sticky=(tk.W, tk.E))
         
         # Configurar grid weights
         self.employees_frame.columnconfigure(0, weight=1)
-        self.employees_frame.rowconfigure(0, weight=1)
+        self.employees_frame.rowconfigure(1, weight=1)
     
     def setup_departments_tab(self):
         """Configura a aba de setores"""
@@ -130,6 +375,8 @@ class EmployeeManagementApp:
         self.departments_tree = ttk.Treeview(self.departments_frame, columns=('Empregados',), show='tree headings')
         self.departments_tree.heading('#0', text='Setor')
         self.departments_tree.heading('Empregados', text='Empregados')
+        # Setor -> [iid, cabeçalho exibido, {ID do empregado: linha exibida}]
+        self.department_items = {}
         
         # Scrollbar
         dept_scrollbar = ttk.Scrollbar(self.departments_frame, orient=tk.VERTICAL, command=self.departments_tree.yview)
@@ -143,68 +390,177 @@ class EmployeeManagementApp:
         self.departments_frame.columnconfigure(0, weight=1)
         self.departments_frame.rowconfigure(0, weight=1)
     
-    def refresh_all_displays(self):
-        """Atualiza todas as exibições"""
-        self.refresh_employees_display()
-        self.refresh_departments_display()
-    
-    def refresh_employees_display(self):
-        """Atualiza a exibição de empregados"""
-        # Limpar treeview
-        for item in self.employees_tree.get_children():
-            self.employees_tree.delete(item)
-        
-        # Adicionar empregados
-        for emp in self.employees:
-            self.employees_tree.insert('', 'end', values=(
-                emp.id, emp.name, emp.cpf, emp.phone, emp.address, emp.department
-            ))
-    
-    def refresh_departments_display(self):
-        """Atualiza a exibição de setores"""
-        # Limpar treeview
-        for item in self.departments_tree.get_children():
-            self.departments_tree.delete(item)
-        
-        # Adicionar setores e seus empregados
+    def refresh_all_displays(self, full=False):
+        """
+        Atualiza todas as exibições
+        
+        Por padrão só os itens alterados são tocados; full=True recria as
+        árvores do zero. Com uma busca ativa, ela é refeita.
+        """
+        if self.employee_filter is not None:
+            self.update_employee_filter()
+        self.refresh_employees_display(full)
+        self.refresh_departments_display(full)
+    
+    @perf_metrics.timed('gui.refresh_employees_display')
+    def refresh_employees_display(self, full=False):
+        """
+        Atualiza a exibição de empregados
+        
+        Compara cada empregado com a linha exibida (item de iid igual ao ID)
+        e só insere, altera ou remove os itens que mudaram.
+        """
+        if self.employees_view is not None:
+            # Rolagem virtual: basta redesenhar a janela visível
+            self.employees_view.refresh()
+            return
+        
+        tree = self.employees_tree
+        # Resultados de busca vêm em ordem de relevância: recria a lista
+        full = full or self.employee_filter is not None
+        if full and tree.get_children():
+            tree.delete(*tree.get_children())
+            self.employee_rows = {}
+        
+        old_rows = self.employee_rows
+        new_rows = {}
+        for emp in self.shown_employees():
+            values = self.employee_values(emp)
+            old_values = old_rows.get(emp.id)
+            if old_values is None:
+                tree.insert('', 'end', iid=str(emp.id), values=values)
+            elif old_values != values:
+                tree.item(str(emp.id), values=values)
+            new_rows[emp.id] = values
+        
+        removed = [str(emp_id) for emp_id in old_rows.keys() - new_rows.keys()]
+        if removed:
+            tree.delete(*removed)
+        self.employee_rows = new_rows
+    
+    @staticmethod
+    def employee_values(emp):
+        """Valores exibidos na tabela de empregados para um empregado"""
+        return (emp.id, emp.name, emp.cpf, emp.phone, emp.address, emp.department)
+    
+    def employee_sort_keys(self, column):
+        """Chave de ordenação de cada empregado para a coluna informada"""
+        attribute = EMPLOYEE_COLUMNS[column]
+        return [getattr(emp, attribute) for emp in self.shown_employees()]
+    
+    def jump_to_row_dialog(self):
+        """Pergunta um número de linha e rola a tabela virtual até ela"""
+        total = len(self.shown_employees())
+        row = simpledialog.askinteger("Ir para linha", f"Linha (1 a {total}):",
+                                      minvalue=1, maxvalue=max(1, total))
+        if row:
+            self.employees_view.jump_to_row(row - 1)
+    
+    def shown_employees(self):
+        """Empregados exibidos na tabela: os resultados da busca ou todos"""
+        return self.employees if self.employee_filter is None else self.employee_filter
+    
+    def schedule_employee_search(self):
+        """Agenda a busca para logo após a digitação parar"""
+        if self.search_after is not None:
+            self.root.after_cancel(self.search_after)
+        self.search_after = self.root.after(150, self.apply_employee_search)
+    
+    def apply_employee_search(self):
+        """Filtra a tabela de empregados pelo texto do campo de busca"""
+        self.search_after = None
+        self.update_employee_filter()
+        self.refresh_employees_display(full=True)
+    
+    def update_employee_filter(self):
+        """
+        Recalcula os resultados da busca
+        
+        Usa o índice de trigramas (tolerante a erros, por nome e
+        endereço); enquanto ele é montado, cai na busca por prefixo.
+        """
+        self.rows_version += 1
+        query = self.search_var.get().strip()
+        if not query:
+            self.employee_filter = None
+            self.search_status.configure(text="")
+            return
+        
+        if self.fuzzy_index is None:
+            self.employee_filter = self.search_index.search(query, SEARCH_LIMIT)
+            self.search_status.configure(text="Indexando... (busca por prefixo)")
+        else:
+            by_id = self.search_index.by_id
+            self.employee_filter = [by_id[emp_id] for emp_id, _ in self.fuzzy_index.search(query, SEARCH_LIMIT)
+                                    if emp_id in by_id]
+            self.search_status.configure(text=f"{len(self.employee_filter)} resultados")
+    
+    @perf_metrics.timed('gui.refresh_departments_display')
+    def refresh_departments_display(self, full=False):
+        """
+        Atualiza a exibição de setores
+        
+        Assim como na aba de empregados, só os setores e membros que
+        mudaram são alterados na árvore.
+        """
+        tree = self.departments_tree
+        if full and tree.get_children():
+            tree.delete(*tree.get_children())
+            self.department_items = {}
+        
+        old_items = self.department_items
+        new_items = {}
         for dept in self.departments:
-            dept_item = self.departments_tree.insert('', 'end', text=dept.name, 
-                                                     values=(f"{len(dept.team)} empregados",))
+            header = (dept.name, f"{len(dept.team)} empregados")
+            item = old_items.pop(dept, None)
+            if item is None:
+                dept_item = tree.insert('', 'end', text=header[0], values=(header[1],))
+                item = [dept_item, header, {}]
+            elif item[1] != header:
+                tree.item(item[0], text=header[0], values=(header[1],))
+                item[1] = header
             
-            for emp in dept.team:
-                self.departments_tree.insert(dept_item, 'end', text=f"  → {emp.name}", 
-                                           values=(f"CPF: {emp.cpf}",))
+            dept_item, _, old_children = item
+            children = {}
+            # Com rolagem virtual a aba de setores mostra só os totais; os
+            # membros ficam visíveis ordenando a tabela de empregados por setor
+            team = () if self.virtual_mode else dept.team
+            for emp in team:
+                row = (f"  → {emp.name}", f"CPF: {emp.cpf}")
+                child_iid = f"{dept_item}-{emp.id}"
+                old_row = old_children.get(emp.id)
+                if old_row is None:
+                    tree.insert(dept_item, 'end', iid=child_iid, text=row[0], values=(row[1],))
+                elif old_row != row:
+                    tree.item(child_iid, text=row[0], values=(row[1],))
+                children[emp.id] = row
+            
+            removed = [f"{dept_item}-{emp_id}" for emp_id in old_children.keys() - children.keys()]
+            if removed:
+                tree.delete(*removed)
+            item[2] = children
+            new_items[dept] = item
+        
+        # Setores que deixaram de existir
+        removed = [item[0] for item in old_items.values()]
+        if removed:
+            tree.delete(*removed)
+        self.department_items = new_items
     
     def register_employee_dialog(self):
         """Abre diálogo para cadastrar empregado"""
         dialog = EmployeeDialog(self.root, "Cadastrar Empregado", self.departments)
         if dialog.result:
             emp_data = dialog.result
-            
-            # Verificar se CPF já existe
-            if any(emp.cpf == emp_data['cpf'] for emp in self.employees):
-                messagebox.showerror("Erro", "CPF já cadastrado!")
+            try:
+                self.service.register_employee(emp_data['name'], emp_data['cpf'], emp_data['phone'],
+                                               emp_data['address'], emp_data['department'])
+            except ServiceError as e:
+                messagebox.showerror("Erro", str(e))
                 return
             
-            # Criar empregado
-            employee = Employee(
-                name=emp_data['name'],
-                cpf=emp_data['cpf'],
-                phone=emp_data['phone'],
-                address=emp_data['address'],
-                department=emp_data['department']
-            )
-            
-            self.employees.append(employee)
-            
-            # Adicionar ao setor se necessário
-            if emp_data['department'] != "Nenhum":
-                dept = self.find_department_by_name(emp_data['department'])
-                if dept:
-                    dept.add_employee(employee)
-            
             # Salvar dados
-            self.save_data()
+            self.save_data(self.service.take_changes())
             self.refresh_all_displays()
             
             messagebox.showinfo("Sucesso", "Empregado cadastrado com sucesso!")
@@ -224,34 +580,16 @@ class EmployeeManagementApp:
         dialog = EmployeeDialog(self.root, "Editar Empregado", self.departments, employee)
         if dialog.result:
             emp_data = dialog.result
-            
-            # Verificar se CPF já existe (exceto o próprio empregado)
-            if any(emp.cpf == emp_data['cpf'] and emp.id != employee.id for emp in self.employees):
-                messagebox.showerror("Erro", "CPF já cadastrado por outro empregado!")
+            try:
+                self.service.edit_employee(employee.id, emp_data['name'], emp_data['cpf'],
+                                           emp_data['phone'], emp_data['address'],
+                                           emp_data['department'])
+            except ServiceError as e:
+                messagebox.showerror("Erro", str(e))
                 return
             
-            # Atualizar dados
-            old_department = employee.department
-            employee.update_data(emp_data['name'], emp_data['phone'], emp_data['address'])
-            employee.cpf = emp_data['cpf']
-            employee.department = emp_data['department']
-            
-            # Atualizar setores
-            if old_department != emp_data['department']:
-                # Remover do setor antigo
-                if old_department != "Nenhum":
-                    old_dept = self.find_department_by_name(old_department)
-                    if old_dept:
-                        old_dept.remove_employee(employee)
-                
-                # Adicionar ao novo setor
-                if emp_data['department'] != "Nenhum":
-                    new_dept = self.find_department_by_name(emp_data['department'])
-                    if new_dept:
-                        new_dept.add_employee(employee)
-            
             # Salvar dados
-            self.save_data()
+            self.save_data(self.service.take_changes())
             self.refresh_all_displays()
             
             messagebox.showinfo("Sucesso", "Empregado editado com sucesso!")
@@ -269,31 +607,33 @@ class EmployeeManagementApp:
         
         # Confirmar exclusão
         if messagebox.askyesno("Confirmar", f"Tem certeza que deseja excluir {employee.name}?"):
-            # Remover do setor
-            if employee.department != "Nenhum":
-                dept = self.find_department_by_name(employee.department)
-                if dept:
-                    dept.remove_employee(employee)
-            
-            # Remover da lista
-            self.employees.remove(employee)
+            try:
+                self.service.delete_employee(employee.id)
+            except ServiceError as e:
+                messagebox.showerror("Erro", str(e))
+                return
             
             # Salvar dados
-            self.save_data()
+            self.save_data(self.service.take_changes())
             self.refresh_all_displays()
             
             messagebox.showinfo("Sucesso", "Empregado excluído com sucesso!")
     
     def manage_departments_dialog(self):
         """Abre diálogo para gerenciar setores"""
-        dialog = DepartmentManagementDialog(self.root, self.departments)
-        if dialog.changes_made:
+        # Cada operação do diálogo bloqueia o modelo só enquanto dura; as
+        # alterações só vão para a gravação depois que ele fecha
+        dialog = DepartmentManagementDialog(self.root, self.service)
+        if not dialog.changes_made:
+            return
+        with self.model_lock:
             # Atualizar referências de empregados
-            self.update_employee_department_references()
-            
-            # Salvar dados
-            self.save_data()
-            self.refresh_all_displays()
+            self.service.fix_department_references()
+            changes = self.service.take_changes()
+        
+        # Salvar dados
+        self.save_data(changes)
+        self.refresh_all_displays()
     
     def reallocate_employee_dialog(self):
         """Abre diálogo para realocar empregado"""
@@ -311,51 +651,322 @@ class EmployeeManagementApp:
             return
         
         # Selecionar novo setor
-        dept_names = [dept.name for dept in self.departments]
+        dept_names = self.departments.names()
         dialog = DepartmentSelectionDialog(self.root, dept_names, 
                                          f"Realocar {employee.name}\nSetor atual: {employee.department}")
         
         if dialog.result:
             new_dept_name = dialog.result
-            
-            # Remover do setor atual
-            if employee.department != "Nenhum":
-                old_dept = self.find_department_by_name(employee.department)
-                if old_dept:
-                    old_dept.remove_employee(employee)
-            
-            # Adicionar ao novo setor
-            new_dept = self.find_department_by_name(new_dept_name)
-            if new_dept:
-                new_dept.add_employee(employee)
-                employee.department = new_dept_name
+            try:
+                self.service.reallocate_employee(employee.id, new_dept_name)
+            except ServiceError as e:
+                messagebox.showerror("Erro", str(e))
+                return
             
             # Salvar dados
-            self.save_data()
+            self.save_data(self.service.take_changes())
             self.refresh_all_displays()
             
             messagebox.showinfo("Sucesso", f"Empregado realocado para {new_dept_name}!")
     
+    def import_employees_dialog(self):
+        """Importa empregados em lote de um arquivo CSV ou JSON"""
+        path = filedialog.askopenfilename(
+            title="Importar Empregados",
+            filetypes=[("CSV", "*.csv"), ("JSON", "*.json"), ("Todos os arquivos", "*.*")])
+        if not path:
+            return
+        
+        try:
+            report = self.service.import_employees(path)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Falha ao importar arquivo: {e}")
+            return
+        
+        # Uma única gravação para todo o lote
+        changes = self.service.take_changes()
+        if changes:
+            self.save_data(changes)
+            self.refresh_all_displays()
+        
+        message = report.summary()
+        if report.rejected:
+            details = "\n".join(f"Linha {line}: {reason}" for line, reason in report.rejected[:20])
+            if len(report.rejected) > 20:
+                details += f"\n... e mais {len(report.rejected) - 20}"
+            message += "\n\n" + details
+        messagebox.showinfo("Importação", message)
+    
+    def export_employees_dialog(self):
+        """Exporta os empregados (todos ou de um setor) para CSV ou NDJSON"""
+        all_departments = "Todos os setores"
+        dialog = DepartmentSelectionDialog(self.root, [all_departments, "Nenhum"] + self.departments.names(),
+                                           "Exportar empregados de:")
+        if not dialog.result:
+            return
+        department = None if dialog.result == all_departments else dialog.result
+        
+        path = filedialog.asksaveasfilename(
+            title="Exportar Empregados", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("NDJSON", "*.ndjson"), ("Todos os arquivos", "*.*")])
+        if not path:
+            return
+        
+        # A exportação roda em outra thread sobre uma cópia da lista
+        with self.model_lock:
+            employees = list(self.employees)
+        export_queue = queue.Queue()
+        
+        def worker():
+            try:
+                export_queue.put(('ok', export_employees(employees, path, department=department)))
+            except Exception as e:
+                export_queue.put(('error', e))
+        
+        def poll():
+            try:
+                status, payload = export_queue.get_nowait()
+            except queue.Empty:
+                self.root.after(100, poll)
+                return
+            if status == 'error':
+                messagebox.showerror("Erro", f"Falha ao exportar: {payload}")
+            else:
+                self.status_label.configure(text=f"{payload} empregados exportados para {path}")
+        
+        self.status_label.configure(text="Exportando...")
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, poll)
+    
+    def performance_panel(self):
+        """Abre (ou traz para a frente) o painel de desempenho"""
+        panel = getattr(self, 'perf_panel', None)
+        if panel is not None and panel.window.winfo_exists():
+            panel.window.lift()
+            return
+        self.perf_panel = PerformancePanel(self.root)
+    
+    def memory_report_dialog(self):
+        """Mede a memória do modelo e das tabelas e acrescenta o relatório a um arquivo"""
+        path = filedialog.asksaveasfilename(
+            title="Salvar Relatório de Memória", initialfile="memory_report.jsonl",
+            defaultextension=".jsonl", confirmoverwrite=False,
+            filetypes=[("JSON Lines", "*.jsonl"), ("Todos os arquivos", "*.*")])
+        if not path:
+            return
+        
+        with self.model_lock:
+            report = memory_report.app_report(self)
+        try:
+            memory_report.write_report(report, path)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Falha ao salvar relatório: {e}")
+            return
+        messagebox.showinfo("Relatório de Memória", memory_report.format_report(report))
+    
     def select_employee_dialog(self, message):
         """Abre diálogo para seleção de empregado"""
-        dialog = EmployeeSelectionDialog(self.root, self.employees, message)
+        dialog = EmployeeSelectionDialog(self.root, self.employees, message, self.search_index)
         return dialog.result
     
-    def find_department_by_name(self, name):
-        """Encontra setor pelo nome"""
-        return next((dept for dept in self.departments if dept.name == name), None)
-    
-    def update_employee_department_references(self):
-        """Atualiza referências de setores nos empregados"""
-        dept_names = {dept.name for dept in self.departments}
-        for emp in self.employees:
-            if emp.department not in dept_names and emp.department != "Nenhum":
-                emp.department = "Nenhum"
-    
-    def save_data(self):
-        """Salva todos os dados"""
-        if not self.data_manager.save_all_data(self.employees, self.departments):
-            messagebox.showerror("Erro", "Falha ao salvar dados!")
+    def rebuild_indexes(self, search_index=None):
+        """
+        Reconstrói o índice de busca a partir das listas carregadas
+        
+        search_index pode vir pronto (montado na thread de carga).
+        """
+        self.search_index = search_index or EmployeeSearchIndex(self.employees)
+    
+    def on_model_change(self, event, employees):
+        """Mantém os índices de busca em dia com as alterações feitas pelo serviço"""
+        self.rows_version += 1
+        if event == 'reloaded':
+            # Modelo novo: os índices são refeitos do zero
+            self.employees = self.service.employees
+            self.departments = self.service.departments
+            self.rebuild_indexes()
+            self.fuzzy_index = None
+            self.fuzzy_pending = []
+            self.start_fuzzy_index_build()
+            return
+        if event == 'added' and len(employees) > 1000:
+            # Lotes grandes: remontar o índice sai mais barato que inserir um a um
+            self.search_index = EmployeeSearchIndex(self.employees)
+            for emp in employees:
+                self.reindex_fuzzy(emp)
+            return
+        for emp in employees:
+            if event == 'added':
+                self.index_employee(emp)
+            elif event == 'removed':
+                self.unindex_employee(emp)
+            else:
+                self.reindex_employee(emp)
+    
+    def index_employee(self, employee):
+        """Inclui um empregado novo nos índices de busca"""
+        self.search_index.add(employee)
+        self.reindex_fuzzy(employee)
+    
+    def reindex_employee(self, employee):
+        """Atualiza os índices de busca após editar um empregado"""
+        self.search_index.update(employee)
+        self.reindex_fuzzy(employee)
+    
+    def unindex_employee(self, employee):
+        """Retira um empregado excluído dos índices de busca"""
+        self.search_index.remove(employee)
+        if self.fuzzy_index is None:
+            self.fuzzy_pending.append((employee, True))
+        else:
+            self.fuzzy_index.remove(employee.id)
+    
+    def reindex_fuzzy(self, employee):
+        if self.fuzzy_index is None:
+            self.fuzzy_pending.append((employee, False))
+        else:
+            self.fuzzy_index.update(employee.id, self.fuzzy_text(employee))
+    
+    def poll_external_changes(self):
+        """Verifica periodicamente se outra instância gravou no mesmo armazenamento"""
+        # Com uma janela de diálogo aberta, o modelo fica como o diálogo o mostra
+        if self.root.grab_current() is None:
+            self.sync_external_changes()
+        self.root.after(EXTERNAL_POLL_MS, self.poll_external_changes)
+    
+    def sync_external_changes(self):
+        """
+        Incorpora ao modelo e às árvores o que outras instâncias gravaram
+        
+        Sem novidades, custa só a leitura dos contadores do armazenamento;
+        com elas, os índices recebem apenas os empregados tocados e as
+        árvores são atualizadas por diferença. Durante uma gravação fica
+        para a próxima verificação, para não esperar a trava do
+        armazenamento; se a gravação encontrar dados mais novos, o
+        SaveScheduler chama este método e grava de novo em seguida.
+        """
+        if self.save_scheduler.saving:
+            return False
+        try:
+            changed = self.service.sync_external()
+        except Exception as e:
+            print(f"Erro ao verificar alterações externas: {e}")
+            return False
+        if changed:
+            self.refresh_all_displays()
+            self.status_label.configure(text="Dados atualizados com as alterações de outra instância")
+        return changed
+    
+    def refresh_from_storage(self):
+        """Busca alterações de outras instâncias e redesenha as árvores do zero"""
+        self.sync_external_changes()
+        self.refresh_all_displays(full=True)
+    
+    def on_save_error(self):
+        """Avisa a falha na gravação (na thread do Tk)"""
+        messagebox.showerror("Erro", "Falha ao salvar dados!")
+    
+    def save_data(self, changes=None):
+        """
+        Agenda a gravação dos dados
+        
+        Com changes informado, grava só essas alterações no diário; sem
+        ele, reescreve os arquivos completos. A gravação acontece em
+        segundo plano, agrupada com as edições feitas logo em seguida.
+        """
+        self.save_scheduler.mark_dirty(changes)
+    
+    def write_data(self, changes):
+        """
+        Executado na thread de escrita (o serviço bloqueia o modelo só para copiá-lo)
+        
+        Um conflito volta para a thread do Tk (ver SaveScheduler): o modelo
+        só é alterado lá, onde as árvores o leem.
+        """
+        with perf_metrics.timer('save.write'):
+            return self.service.write(changes, merge=False)
+    
+    def on_close(self):
+        """Grava as alterações pendentes antes de fechar a janela"""
+        self.status_label.configure(text="Salvando alterações pendentes...")
+        self.root.update_idletasks()
+        if not self.save_scheduler.close():
+            if not messagebox.askyesno("Erro", "Falha ao salvar dados! Sair mesmo assim?"):
+                self.save_scheduler = SaveScheduler(
+                    self.root, self.write_data,
+                    on_state_change=self.save_scheduler.on_state_change,
+                    on_conflict=self.save_scheduler.on_conflict,
+                    on_error=self.save_scheduler.on_error)
+                self.save_scheduler.mark_dirty(None)
+                return
+        self.root.destroy()
+
+
+class PerformancePanel:
+    """
+    Janela com os histogramas de latência do perf_metrics
+    
+    Não é modal: fica aberta enquanto se usa a aplicação e atualiza a
+    tabela a cada segundo. Abrir o painel liga a coleta.
+    """
+    
+    COLUMNS = ('Medição', 'Qtd', 'p50 (ms)', 'p95 (ms)', 'Máx (ms)')
+    
+    def __init__(self, parent):
+        perf_metrics.enable()
+        
+        self.window = tk.Toplevel(parent)
+        self.window.title("Painel de Desempenho")
+        self.window.geometry("620x320")
+        
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.tree = ttk.Treeview(main_frame, columns=self.COLUMNS, show='headings')
+        for col in self.COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=220 if col == 'Medição' else 80,
+                             anchor=tk.W if col == 'Medição' else tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(pady=(10, 0))
+        self.enabled_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(buttons_frame, text="Coletar medições", variable=self.enabled_var,
+                        command=lambda: perf_metrics.enable(self.enabled_var.get())).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Zerar", command=self.reset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Salvar JSON...", command=self.save_json).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Fechar", command=self.window.destroy).pack(side=tk.LEFT, padx=5)
+        
+        self.update_table()
+    
+    def update_table(self):
+        if not self.window.winfo_exists():
+            return
+        rows = perf_metrics.snapshot()
+        for name in set(self.tree.get_children()) - rows.keys():
+            self.tree.delete(name)
+        for name, summary in rows.items():
+            values = (name, summary['count'], f"{summary['p50_ms']:.2f}",
+                      f"{summary['p95_ms']:.2f}", f"{summary['max_ms']:.2f}")
+            if self.tree.exists(name):
+                self.tree.item(name, values=values)
+            else:
+                self.tree.insert('', 'end', iid=name, values=values)
+        self.window.after(1000, self.update_table)
+    
+    def reset(self):
+        perf_metrics.reset()
+        self.update_table()
+    
+    def save_json(self):
+        path = filedialog.asksaveasfilename(parent=self.window, title="Salvar Medições",
+                                            defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if path:
+            try:
+                perf_metrics.dump_json(path)
+            except Exception as e:
+                messagebox.showerror("Erro", f"Falha ao salvar medições: {e}", parent=self.window)
 
 
 class EmployeeDialog:
@@ -416,29 +1027,21 @@ class EmployeeDialog:
         self.dialog.wait_window()
     
     def save(self):
-        # Validar campos
-        if not all([self.name_var.get().strip(), self.cpf_var.get().strip(), 
-                   self.phone_var.get().strip(), self.address_var.get().strip()]):
-            messagebox.showerror("Erro", "Todos os campos são obrigatórios!")
-            return
-        
-        # Validar CPF (apenas números)
-        if not self.cpf_var.get().isdigit():
-            messagebox.showerror("Erro", "CPF deve conter apenas números!")
-            return
-        
-        # Validar telefone (apenas números)
-        if not self.phone_var.get().isdigit():
-            messagebox.showerror("Erro", "Telefone deve conter apenas números!")
-            return
-        
-        self.result = {
+        data = {
             'name': self.name_var.get().strip(),
             'cpf': self.cpf_var.get().strip(),
             'phone': self.phone_var.get().strip(),
             'address': self.address_var.get().strip(),
             'department': self.dept_var.get()
         }
+        
+        # Validar campos (mesmas regras da importação em lote)
+        error = validate_employee_data(data)
+        if error:
+            messagebox.showerror("Erro", error)
+            return
+        
+        self.result = data
         self.dialog.destroy()
     
     def cancel(self):
@@ -446,9 +1049,21 @@ class EmployeeDialog:
 
 
 class EmployeeSelectionDialog:
-    """Diálogo para seleção de empregado"""
-    def __init__(self, parent, employees, message):
+    """
+    Diálogo para seleção de empregado
+    
+    A lista mostra no máximo MAX_MATCHES empregados; o campo de busca
+    filtra a cada tecla por ID, prefixo do nome ou prefixo do CPF usando
+    o índice de busca da aplicação.
+    """
+    
+    MAX_MATCHES = 200
+    
+    def __init__(self, parent, employees, message, search_index=None):
         self.result = None
+        self.employees = employees
+        self.search_index = search_index or EmployeeSearchIndex(employees)
+        self.matches = []
         
         # Criar janela
         self.dialog = tk.Toplevel(parent)
@@ -464,6 +1079,17 @@ class EmployeeSelectionDialog:
         # Mensagem
         ttk.Label(main_frame, text=message).pack(pady=(0, 10))
         
+        # Busca
+        search_frame = ttk.Frame(main_frame)
+        search_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(search_frame, text="Buscar (ID, nome ou CPF):").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+        self.search_var.trace_add('write', lambda *args: self.update_matches())
+        search_entry.bind('<Return>', lambda e: self.select())
+        search_entry.bind('<Down>', lambda e: self.focus_list())
+        
         # Lista de empregados
         listbox_frame = ttk.Frame(main_frame)
         listbox_frame.pack(fill=tk.BOTH, expand=True)
@@ -475,9 +1101,11 @@ class EmployeeSelectionDialog:
         self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        self.count_label = ttk.Label(main_frame, text="")
+        self.count_label.pack(anchor=tk.W)
+        
         # Preencher lista
-        for emp in employees:
-            self.listbox.insert(tk.END, f"{emp.id} - {emp.name} - {emp.department}")
+        self.update_matches()
         
         # Botões
         buttons_frame = ttk.Frame(main_frame)
@@ -488,22 +1116,49 @@ class EmployeeSelectionDialog:
         
         # Bind duplo clique
         self.listbox.bind('<Double-1>', lambda e: self.select())
-        
-        self.employees = employees
+        self.listbox.bind('<Return>', lambda e: self.select())
         
         # Centralizar janela
         self.dialog.update_idletasks()
         x = (self.dialog.winfo_screenwidth() // 2) - (self.dialog.winfo_width() // 2)
         y = (self.dialog.winfo_screenheight() // 2) - (self.dialog.winfo_height() // 2)
         self.dialog.geometry(f"+{x}+{y}")
+        search_entry.focus_set()
         
         # Aguardar resultado
         self.dialog.wait_window()
     
+    def update_matches(self):
+        """Refaz a lista com os empregados que casam com a busca"""
+        query = self.search_var.get().strip()
+        if query:
+            self.matches = self.search_index.search(query, self.MAX_MATCHES)
+        else:
+            self.matches = self.employees[:self.MAX_MATCHES]
+        
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *(f"{emp.id} - {emp.name} - {emp.department}"
+                                      for emp in self.matches))
+        if self.matches:
+            self.listbox.selection_set(0)
+        
+        total = len(self.employees)
+        if query:
+            suffix = "+" if len(self.matches) >= self.MAX_MATCHES else ""
+            self.count_label.configure(text=f"{len(self.matches)}{suffix} encontrados")
+        elif total > len(self.matches):
+            self.count_label.configure(text=f"Mostrando {len(self.matches)} de {total}; digite para filtrar")
+        else:
+            self.count_label.configure(text=f"{total} empregados")
+    
+    def focus_list(self):
+        self.listbox.focus_set()
+        return 'break'
+    
     def select(self):
         selection = self.listbox.curselection()
         if selection:
-            self.result = self.employees[selection[0]]
+            self.result = self.matches[selection[0]]
         self.dialog.destroy()
     
     def cancel(self):
@@ -571,8 +1226,9 @@ class DepartmentSelectionDialog:
 class DepartmentManagementDialog:
     """Diálogo para gerenciamento de setores"""
     
-    def __init__(self, parent, departments):
-        self.departments = departments
+    def __init__(self, parent, service):
+        self.service = service
+        self.departments = service.departments
         self.changes_made = False
         
         # Criar janela
@@ -628,14 +1284,14 @@ class DepartmentManagementDialog:
         """Cria novo setor"""
         name = simpledialog.askstring("Criar Setor", "Nome do novo setor:")
         if name:
-            name = name.strip()
-            if any(dept.name == name for dept in self.departments):
-                messagebox.showerror("Erro", "Setor já existe!")
-            else:
-                self.departments.append(Department(name))
-                self.changes_made = True
-                self.refresh_list()
-                messagebox.showinfo("Sucesso", "Setor criado com sucesso!")
+            try:
+                self.service.create_department(name)
+            except ServiceError as e:
+                messagebox.showerror("Erro", str(e))
+                return
+            self.changes_made = True
+            self.refresh_list()
+            messagebox.showinfo("Sucesso", "Setor criado com sucesso!")
     
     def edit_department(self):
         """Edita setor selecionado"""
@@ -649,17 +1305,15 @@ class DepartmentManagementDialog:
                                          initialvalue=dept.name)
         
         if new_name:
-            new_name = new_name.strip()
-            if any(d.name == new_name for d in self.departments if d != dept):
-                messagebox.showerror("Erro", "Já existe um setor com esse nome!")
-            else:
-                # Atualizar nome nos empregados
-                for emp in dept.team:
-                    emp.department = new_name
-                dept.name = new_name
-                self.changes_made = True
-                self.refresh_list()
-                messagebox.showinfo("Sucesso", "Setor editado com sucesso!")
+            try:
+                # O serviço também atualiza o nome nos empregados
+                self.service.rename_department(dept.name, new_name)
+            except ServiceError as e:
+                messagebox.showerror("Erro", str(e))
+                return
+            self.changes_made = True
+            self.refresh_list()
+            messagebox.showinfo("Sucesso", "Setor editado com sucesso!")
     
     def delete_department(self):
         """Exclui setor selecionado"""
@@ -672,11 +1326,11 @@ class DepartmentManagementDialog:
         
         if messagebox.askyesno("Confirmar", f"Tem certeza que deseja excluir o setor '{dept.name}'?\n"
                               f"Os {len(dept.team)} empregados serão movidos para 'Nenhum'."):
-            # Mover empregados para "Nenhum"
-            for emp in dept.team:
-                emp.department = "Nenhum"
-            
-            self.departments.remove(dept)
+            try:
+                self.service.remove_department(dept.name)
+            except ServiceError as e:
+                messagebox.showerror("Erro", str(e))
+                return
             self.changes_made = True
             self.refresh_list()
             messagebox.showinfo("Sucesso", "Setor excluído com sucesso!")
@@ -0,0 +1,495 @@
+"""
+Teste de carga com usuários simultâneos
+
+Simula N usuários, cada um em sua thread, executando sem pausa (ou com
+um tempo de espera) uma mistura de operações: listar, consultar,
+cadastrar, editar, realocar e excluir. O alvo pode ser:
+
+    service  CompanyService em processo, gravando no armazenamento a cada operação
+    storage  o backend de armazenamento direto (upsert/delete/iter_employees)
+    http     o servidor da API; sem --address, um servidor local é iniciado
+             neste processo (a disputa pelo GIL reduz os números; para medir
+             o servidor isolado, inicie api_server.py à parte e use --address)
+
+Recusas por regra de negócio causadas pela concorrência (CPF já
+cadastrado, empregado excluído por outro usuário) contam como conflitos;
+as demais falhas, como erros. Ao fim, o que ficou gravado é comparado com
+o estado esperado: empregados divergentes contam como atualizações
+perdidas (gravações aceitas e depois desfeitas por outras), à parte dos
+erros. O relatório traz vazão, percentis de latência por operação, as
+taxas de erro e conflito e as atualizações perdidas, e é acrescentado
+como uma linha JSON ao arquivo de saída, para comparar modos de
+armazenamento e tamanhos de dados.
+
+Uso: python load_test.py [--target service|storage|http] [--backend json|sqlite|binary|sharded]
+                         [--storage CAMINHO] [--address ENDEREÇO] [--size 10000]
+                         [--users 20] [--duration 10] [--think-ms 0]
+                         [--mix list=50,edit=25,reallocate=15,register=10]
+                         [--output load_test_results.jsonl]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from itertools import islice
+from models import Employee
+from company_service import CompanyService, ServiceError
+from api_client import ApiClient, CommunicationError
+from storage import open_storage
+from benchmark import generate_company, generate_cpf, git_revision
+from storage_benchmark import BACKEND_PATHS
+
+OPERATIONS = ('list', 'get', 'register', 'edit', 'reallocate', 'delete')
+DEFAULT_MIX = 'list=50,edit=25,reallocate=15,register=10'
+PAGE_SIZE = 50
+
+
+def parse_mix(text):
+    """"list=50,edit=25" -> {'list': 50.0, 'edit': 25.0}"""
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Operação desconhecida: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class ServiceTarget:
+    """Operações no CompanyService; cada uma é gravada antes de retornar"""
+
+    name = 'service'
+
+    def __init__(self, service):
+        self.service = service
+
+    def _write(self, operation, *args):
+        with self.service.lock:
+            result = operation(*args)
+            if not self.service.save():
+                raise IOError("Falha ao salvar dados")
+            return result
+
+    def list(self, offset):
+        return self.service.employees[offset:offset + PAGE_SIZE]
+
+    def get(self, employee_id):
+        return self.service.get_employee(employee_id)
+
+    def register(self, name, cpf, phone, address, department):
+        return self._write(self.service.register_employee, name, cpf, phone, address, department).id
+
+    def edit(self, employee_id, phone):
+        def operation():
+            current = self.service.get_employee(employee_id)
+            if current is None:
+                raise ServiceError("Empregado não encontrado!")
+            self.service.edit_employee(employee_id, current.name, current.cpf, phone, current.address)
+
+        self._write(operation)
+
+    def reallocate(self, employee_id, department):
+        self._write(self.service.reallocate_employee, employee_id, department)
+
+    def delete(self, employee_id):
+        self._write(self.service.delete_employee, employee_id)
+
+
+class StorageTarget:
+    """
+    Operações direto no backend, como faria um programa sem o serviço
+
+    Uma cópia dos empregados em memória fornece os dados para as edições;
+    não há validação. As escritas (alteração da cópia e chamada ao
+    backend) são feitas uma de cada vez, como em um programa que
+    compartilha um objeto de armazenamento entre threads: os backends
+    não são seguros para gravações simultâneas no mesmo processo (usam
+    os mesmos arquivos temporários). Para medir a disputa entre
+    processos, rode várias instâncias do teste sobre o mesmo --storage.
+    """
+
+    name = 'storage'
+
+    def __init__(self, storage, employees):
+        self.storage = storage
+        self.employees = {emp.id: emp for emp in employees}
+        self.lock = threading.Lock()
+
+    def _save(self, employee):
+        if not self.storage.upsert_employee(employee):
+            raise IOError("Falha ao salvar dados")
+
+    def _current(self, employee_id):
+        employee = self.employees.get(employee_id)
+        if employee is None:
+            raise ServiceError("Empregado não encontrado!")
+        return employee
+
+    def list(self, offset):
+        return list(islice(self.storage.iter_employees(), offset, offset + PAGE_SIZE))
+
+    def get(self, employee_id):
+        return self._current(employee_id)
+
+    def register(self, name, cpf, phone, address, department):
+        with self.lock:
+            employee = Employee(name, cpf, phone, address, department)
+            self.employees[employee.id] = employee
+            self._save(employee)
+        return employee.id
+
+    def edit(self, employee_id, phone):
+        with self.lock:
+            employee = self._current(employee_id)
+            employee.phone = phone
+            self._save(employee)
+
+    def reallocate(self, employee_id, department):
+        with self.lock:
+            employee = self._current(employee_id)
+            employee.department = department
+            self._save(employee)
+
+    def delete(self, employee_id):
+        with self.lock:
+            self._current(employee_id)
+            self.employees.pop(employee_id, None)
+            if not self.storage.delete_employee(employee_id):
+                raise IOError("Falha ao salvar dados")
+
+
+class HttpTarget:
+    """Operações pelo servidor da API; cada usuário tem a sua conexão"""
+
+    name = 'http'
+
+    def __init__(self, address):
+        self.address = address
+        self.local = threading.local()
+
+    @property
+    def client(self):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = ApiClient(self.address)
+        return client
+
+    def list(self, offset):
+        return self.client.request('GET', f'/employees?offset={offset}&limit={PAGE_SIZE}')[1]
+
+    def get(self, employee_id):
+        return self.client.request('GET', f'/employees/{employee_id}')[1]
+
+    def register(self, name, cpf, phone, address, department):
+        data = {'name': name, 'cpf': cpf, 'phone': phone, 'address': address,
+                'department': department}
+        return self.client.request('POST', '/employees', data)[1]['id']
+
+    def edit(self, employee_id, phone):
+        self.client.request('PUT', f'/employees/{employee_id}', {'phone': phone})
+
+    def reallocate(self, employee_id, department):
+        self.client.request('POST', f'/employees/{employee_id}/reallocate', {'department': department})
+
+    def delete(self, employee_id):
+        self.client.request('DELETE', f'/employees/{employee_id}')
+
+
+class LoadTest:
+    """Executa os usuários simulados e acumula as medições"""
+
+    def __init__(self, target, employee_ids, department_names, mix, users=20,
+                 duration=10.0, think_time=0.0, seed=0):
+        self.target = target
+        self.employee_ids = list(employee_ids)
+        self.department_names = list(department_names) or ["Nenhum"]
+        self.mix = mix
+        self.users = users
+        self.duration = duration
+        self.think_time = think_time
+        self.seed = seed
+        self.lock = threading.Lock()
+        # operação -> {'latencies': [...], 'ok': n, 'conflicts': n, 'errors': n}
+        self.stats = {name: {'latencies': [], 'ok': 0, 'conflicts': 0, 'errors': 0} for name in mix}
+        self.error_samples = []
+
+    def run(self):
+        """Roda todos os usuários até o fim da duração; retorna o tempo decorrido"""
+        deadline = time.perf_counter() + self.duration
+        threads = [threading.Thread(target=self.user, args=(index, deadline), daemon=True)
+                   for index in range(self.users)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started
+
+    def user(self, index, deadline):
+        # Semente própria de cada usuário: com um inteiro, o usuário 0 da
+        # semente 0 repetiria a sequência de generate_company (e os CPFs)
+        rng = random.Random(f"load-{self.seed}-{index}")
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        while time.perf_counter() < deadline:
+            operation = rng.choices(names, weights)[0]
+            with self.lock:
+                employee_id = rng.choice(self.employee_ids) if self.employee_ids else 0
+                size = len(self.employee_ids)
+            call = self.prepare(operation, rng, employee_id, size)
+            start = time.perf_counter()
+            outcome = 'ok'
+            try:
+                result = call()
+            except CommunicationError as e:
+                outcome, result = 'errors', e
+            except ServiceError:
+                outcome, result = 'conflicts', None
+            except Exception as e:
+                outcome, result = 'errors', e
+            elapsed = time.perf_counter() - start
+            self.record(operation, outcome, elapsed, result, employee_id)
+            if self.think_time:
+                time.sleep(self.think_time)
+
+    def prepare(self, operation, rng, employee_id, size):
+        """Sorteia os demais argumentos e devolve a chamada ao alvo"""
+        target = self.target
+        if operation == 'list':
+            return lambda: target.list(rng.randrange(max(1, size - PAGE_SIZE)))
+        if operation == 'get':
+            return lambda: target.get(employee_id)
+        if operation == 'register':
+            cpf = generate_cpf(rng)
+            department = rng.choice(self.department_names)
+            return lambda: target.register("Usuário Carga", cpf, "11988887777",
+                                           "Rua do Teste, 1", department)
+        if operation == 'edit':
+            phone = f"11{rng.randrange(10 ** 9):09d}"
+            return lambda: target.edit(employee_id, phone)
+        if operation == 'reallocate':
+            department = rng.choice(self.department_names)
+            return lambda: target.reallocate(employee_id, department)
+        return lambda: target.delete(employee_id)
+
+    def record(self, operation, outcome, elapsed, result, employee_id):
+        with self.lock:
+            stats = self.stats[operation]
+            stats[outcome] += 1
+            stats['latencies'].append(elapsed)
+            if outcome == 'errors':
+                if len(self.error_samples) < 5:
+                    self.error_samples.append(f"{operation}: {result}")
+            elif operation == 'register' and outcome == 'ok':
+                self.employee_ids.append(result)
+            elif operation == 'delete':
+                # Excluído agora ou por outro usuário: não é mais sorteado
+                try:
+                    self.employee_ids.remove(employee_id)
+                except ValueError:
+                    pass
+
+    def report(self, elapsed, lost_updates=None):
+        """Resumo por operação e total; lost_updates vem de count_lost_updates"""
+        operations = {}
+        totals = {'ok': 0, 'conflicts': 0, 'errors': 0}
+        for name, stats in self.stats.items():
+            latencies = sorted(stats['latencies'])
+            count = len(latencies)
+            for key in totals:
+                totals[key] += stats[key]
+            operations[name] = {
+                'count': count,
+                'ok': stats['ok'],
+                'conflicts': stats['conflicts'],
+                'errors': stats['errors'],
+                'throughput': count / elapsed if elapsed else 0.0,
+                'p50_ms': percentile(latencies, 0.50) * 1000,
+                'p95_ms': percentile(latencies, 0.95) * 1000,
+                'p99_ms': percentile(latencies, 0.99) * 1000,
+                'max_ms': (latencies[-1] if latencies else 0.0) * 1000,
+            }
+        total = sum(totals.values())
+        return {
+            'elapsed': elapsed,
+            'operations_total': total,
+            'throughput': total / elapsed if elapsed else 0.0,
+            'conflict_rate': totals['conflicts'] / total if total else 0.0,
+            'error_rate': totals['errors'] / total if total else 0.0,
+            'lost_updates': lost_updates,
+            'operations': operations,
+            'error_samples': self.error_samples,
+        }
+
+
+def count_lost_updates(expected, storage):
+    """
+    Empregados cujo estado gravado difere do que os usuários gravaram por último
+
+    expected é o modelo em memória ao fim do teste ({id: Employee}), no
+    qual cada operação bem-sucedida foi aplicada. Conta os gravados com
+    outros dados, os que faltam e os que sobraram (excluídos que voltaram):
+    gravações que "deram certo" mas foram desfeitas por outras.
+    """
+    stored = {emp.id: emp.to_dict() for emp in storage.iter_employees()}
+    lost = sum(1 for emp_id, emp in expected.items() if stored.pop(emp_id, None) != emp.to_dict())
+    return lost + len(stored)
+
+
+def percentile(sorted_values, fraction):
+    """Percentil por posição em uma lista já ordenada"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def start_local_server(service, unix_path):
+    """
+    Inicia o servidor da API em uma thread deste processo
+
+    Retorna a função que o encerra (gravando o que estiver pendente).
+    """
+    from api_server import ApiServer
+
+    loop = asyncio.new_event_loop()
+    server_task = []
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        server_task.append(loop.create_task(ApiServer(service).serve(unix_path=unix_path)))
+        loop.call_soon(started.set)
+        try:
+            loop.run_until_complete(server_task[0])
+        except asyncio.CancelledError:
+            pass
+        loop.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+    while not os.path.exists(unix_path):
+        time.sleep(0.01)
+
+    def stop():
+        loop.call_soon_threadsafe(server_task[0].cancel)
+        thread.join()
+
+    return stop
+
+
+def format_report(report):
+    lines = [f"{report['operations_total']} operações em {report['elapsed']:.1f} s: "
+             f"{report['throughput']:.0f} op/s, conflitos {report['conflict_rate']:.2%}, "
+             f"erros {report['error_rate']:.2%}"
+             + (f", atualizações perdidas {report['lost_updates']}"
+                if report['lost_updates'] is not None else ""),
+             f"    {'operação':<12}{'qtd':>8}{'op/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+             f"{'máx ms':>9}{'confl.':>8}{'erros':>7}"]
+    for name, stats in report['operations'].items():
+        lines.append(f"    {name:<12}{stats['count']:>8}{stats['throughput']:>9.0f}"
+                     f"{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+                     f"{stats['max_ms']:>9.2f}{stats['conflicts']:>8}{stats['errors']:>7}")
+    lines.extend(f"    erro: {sample}" for sample in report['error_samples'])
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga com usuários simultâneos")
+    parser.add_argument('--target', choices=('service', 'storage', 'http'), default='service')
+    parser.add_argument('--backend', choices=sorted(BACKEND_PATHS), default='json',
+                        help="formato do armazenamento sintético (sem --storage)")
+    parser.add_argument('--storage', help="armazenamento existente (é alterado pelo teste!)")
+    parser.add_argument('--address', help="servidor da API já em execução (alvo http)")
+    parser.add_argument('--size', type=int, default=10000, help="empregados da empresa sintética")
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=10.0, help="segundos de teste")
+    parser.add_argument('--think-ms', type=float, default=0.0, help="pausa de cada usuário entre operações")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="pesos das operações")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='load_test_results.jsonl',
+                        help="arquivo JSON Lines onde o relatório é acrescentado")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+    if args.target == 'storage' and 'get' in mix:
+        parser.error("o alvo storage não tem consulta por ID; retire 'get' da mistura")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        stop_server = None
+        service = None
+        if args.address:
+            client = ApiClient(args.address)
+            _, first = client.request('GET', '/employees?limit=10000')
+            employee_ids = [item['id'] for item in first['items']]
+            department_names = [dept['name'] for dept in client.request('GET', '/departments')[1]]
+            client.close()
+            target = HttpTarget(args.address)
+            source = args.address
+        else:
+            if args.storage:
+                storage, source = open_storage(args.storage), args.storage
+                employees, departments = storage.load_all_data()
+            else:
+                path = os.path.join(workdir, BACKEND_PATHS[args.backend])
+                storage, source = open_storage(path, args.backend), f"synthetic:{args.size}"
+                employees, departments = generate_company(args.size, seed=args.seed)
+                storage.save_all_data(employees, departments)
+            employee_ids = [emp.id for emp in employees]
+            department_names = [dept.name for dept in departments]
+
+            if args.target == 'storage':
+                target = StorageTarget(storage, employees)
+            else:
+                service = CompanyService(employees, departments, storage)
+                target = ServiceTarget(service)
+                if args.target == 'http':
+                    unix_path = os.path.join(workdir, 'api.sock')
+                    stop_server = start_local_server(service, unix_path)
+                    target = HttpTarget(f'unix:{unix_path}')
+
+        print(f"{args.users} usuários, alvo {args.target}, {len(employee_ids)} empregados "
+              f"({source}), {args.duration:.0f} s...")
+        test = LoadTest(target, employee_ids, department_names, mix, args.users,
+                        args.duration, args.think_ms / 1000, args.seed)
+        elapsed = test.run()
+        if stop_server:
+            stop_server()
+        # Só é possível conferir o que ficou gravado com o armazenamento local
+        lost_updates = None
+        if args.target == 'storage':
+            lost_updates = count_lost_updates(target.employees, storage)
+        elif service is not None:
+            lost_updates = count_lost_updates(service.employees_by_id, storage)
+        report = test.report(elapsed, lost_updates)
+
+    print(format_report(report))
+    record = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'target': args.target,
+        'backend': None if args.address else type(storage).__name__,
+        'source': source,
+        'employees': len(employee_ids),
+        'users': args.users,
+        'duration': args.duration,
+        'think_ms': args.think_ms,
+        'mix': mix,
+        'results': report,
+    }
+    with open(args.output, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    print(f"Relatório acrescentado a {args.output}")
+
+
+if __name__ == "__main__":
+    main()
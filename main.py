@@ -1,10 +1,32 @@
+import os
+import sys
 import tkinter as tk
+import tracemalloc
 from gui_application import EmployeeManagementApp
+from storage import open_storage
+from api_client import RemoteCompanyService, is_remote_address
 
 def main():
-    """Função principal que inicializa a aplicação GUI"""
+    """
+    Função principal que inicializa a aplicação GUI
+    
+    Um caminho opcional na linha de comando escolhe o armazenamento; o
+    formato (JSON, SQLite, binário ou particionado) é detectado pelo
+    cabeçalho ou pela extensão. Um endereço de servidor da API
+    ("http://127.0.0.1:8765" ou "unix:/caminho") faz da interface um
+    cliente do servidor.
+    
+    Com SGE_MEMORY=1 o tracemalloc é ligado antes da carga, para que o
+    relatório de memória inclua picos e pontos de alocação.
+    """
+    if os.environ.get('SGE_MEMORY') == '1':
+        tracemalloc.start()
+    target = sys.argv[1] if len(sys.argv) > 1 else None
     root = tk.Tk()
-    app = EmployeeManagementApp(root)
+    if target and is_remote_address(target):
+        app = EmployeeManagementApp(root, service=RemoteCompanyService(target))
+    else:
+        app = EmployeeManagementApp(root, open_storage(target) if target else None)
     root.mainloop()
 
 if __name__ == "__main__":
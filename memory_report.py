@@ -0,0 +1,232 @@
+"""
+Contabilidade de memória do grafo de objetos
+
+Mede, com tracemalloc e dimensionamento de objetos, quanto ocupam os
+empregados e setores carregados, o pico de memória durante a carga e a
+gravação, os principais pontos de alocação e o que a interface mantém
+para as tabelas. Cada relatório é acrescentado como uma linha JSON ao
+arquivo de saída, para acompanhar regressões entre versões.
+
+Uso: python memory_report.py [armazenamento | --synthetic N] [--output memory_report.jsonl]
+
+Na interface, o modo é ligado com SGE_MEMORY=1 (o rastreamento começa na
+inicialização) e o relatório sai pelo menu Exibir.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+TOP_SITES = 15
+
+
+def deep_size(obj, seen):
+    """
+    Tamanho de obj e do que ele referencia, sem contar duas vezes
+
+    Percorre contêineres (dict, list, tuple, set) e atributos de
+    __slots__; objetos já presentes em seen (por id) não somam de novo,
+    de modo que strings compartilhadas (internadas) entram uma só vez.
+    """
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        else:
+            for slot in getattr(type(current), '__slots__', ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return total
+
+
+def object_graph_sizes(employees, departments):
+    """
+    Bytes ocupados pelos empregados e setores
+
+    Os setores são medidos depois dos empregados, então o custo deles
+    é só o próprio: nome e a estrutura da equipe, sem os empregados.
+    """
+    seen = set()
+    employees_bytes = sum(deep_size(emp, seen) for emp in employees)
+    departments_bytes = sum(deep_size(dept, seen) for dept in departments)
+    n_employees = len(employees)
+    n_departments = len(departments)
+    return {
+        'employees': n_employees,
+        'departments': n_departments,
+        'employees_bytes': employees_bytes,
+        'departments_bytes': departments_bytes,
+        'bytes_per_employee': employees_bytes / n_employees if n_employees else 0,
+        'bytes_per_department': departments_bytes / n_departments if n_departments else 0,
+    }
+
+
+def rss_bytes():
+    """Memória residente do processo (Linux), ou None"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def traced(func, *args):
+    """
+    Executa func medindo a memória Python alocada
+
+    Retorna (resultado, {'retained_bytes', 'peak_bytes'}, snapshot), com o
+    pico relativo ao início da chamada. Exige tracemalloc ligado.
+    """
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    return result, {'retained_bytes': current - before, 'peak_bytes': peak - before}, snapshot
+
+
+def top_allocation_sites(snapshot, limit=TOP_SITES):
+    """Linhas de código que mais retêm memória no snapshot"""
+    sites = []
+    for stat in snapshot.statistics('lineno')[:limit]:
+        frame = stat.traceback[0]
+        sites.append({'site': f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                      'bytes': stat.size, 'blocks': stat.count})
+    return sites
+
+
+def view_cache_sizes(app):
+    """Bytes das estruturas Python que a interface mantém para as tabelas"""
+    seen = set()
+    return {
+        'employee_rows_bytes': deep_size(getattr(app, 'employee_rows', {}), seen),
+        'department_items_bytes': deep_size(getattr(app, 'department_items', {}), seen),
+    }
+
+
+def app_report(app):
+    """
+    Relatório da aplicação em execução (modelo, tabelas e processo)
+
+    O pico e os pontos de alocação só aparecem se tracemalloc estiver
+    ligado desde a inicialização (SGE_MEMORY=1).
+    """
+    report = {'source': 'app'}
+    report.update(object_graph_sizes(app.employees, list(app.departments)))
+    report['views'] = view_cache_sizes(app)
+    report['rss_bytes'] = rss_bytes()
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        report['traced_bytes'] = current
+        report['traced_peak_bytes'] = peak
+        report['top_sites'] = top_allocation_sites(tracemalloc.take_snapshot())
+    return report
+
+
+def storage_report(storage):
+    """
+    Relatório da carga e da gravação de um armazenamento
+
+    A gravação é feita em um DataManager temporário, sem tocar nos
+    dados originais.
+    """
+    from data_manager import DataManager
+
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start()
+    try:
+        report = {'source': type(storage).__name__}
+        rss_before = rss_bytes()
+        (employees, departments), load, load_snapshot = traced(storage.load_all_data)
+        report['load_all_data'] = load
+        report['top_sites'] = top_allocation_sites(load_snapshot)
+        report.update(object_graph_sizes(employees, departments))
+
+        with tempfile.TemporaryDirectory() as workdir:
+            target = DataManager(os.path.join(workdir, 'employees.json'),
+                                 os.path.join(workdir, 'departments.json'))
+            _, save, _ = traced(target.save_all_data, employees, departments)
+        report['save_all_data'] = save
+
+        rss_after = rss_bytes()
+        if rss_before is not None and rss_after is not None:
+            report['rss_growth_bytes'] = rss_after - rss_before
+        return report
+    finally:
+        if started_here:
+            tracemalloc.stop()
+
+
+def write_report(report, path):
+    """Acrescenta o relatório (com data e hora) ao arquivo JSON Lines"""
+    record = dict(report, timestamp=datetime.now().isoformat(timespec='seconds'))
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def format_report(report):
+    """Resumo legível do relatório"""
+    lines = [
+        f"{report['employees']} empregados: {report['employees_bytes'] / 1e6:.1f} MB "
+        f"({report['bytes_per_employee']:.0f} B/empregado)",
+        f"{report['departments']} setores: {report['departments_bytes'] / 1e6:.2f} MB "
+        f"({report['bytes_per_department']:.0f} B/setor)",
+    ]
+    for step in ('load_all_data', 'save_all_data'):
+        if step in report:
+            lines.append(f"{step}: pico {report[step]['peak_bytes'] / 1e6:.1f} MB, "
+                         f"retido {report[step]['retained_bytes'] / 1e6:.1f} MB")
+    if 'views' in report:
+        lines.append(f"Tabelas: {report['views']['employee_rows_bytes'] / 1e6:.1f} MB (empregados), "
+                     f"{report['views']['department_items_bytes'] / 1e6:.1f} MB (setores)")
+    if report.get('rss_bytes'):
+        lines.append(f"Processo: {report['rss_bytes'] / 1e6:.0f} MB residentes")
+    if report.get('top_sites'):
+        lines.append("Principais pontos de alocação:")
+        lines.extend(f"    {site['site']:<32} {site['bytes'] / 1e6:8.2f} MB  {site['blocks']} blocos"
+                     for site in report['top_sites'][:5])
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relatório de memória do grafo de objetos")
+    parser.add_argument('storage', nargs='?', default=os.curdir, help="armazenamento a medir")
+    parser.add_argument('--synthetic', type=int, metavar='N',
+                        help="mede uma empresa sintética de N empregados em vez do armazenamento")
+    parser.add_argument('--output', default='memory_report.jsonl',
+                        help="arquivo JSON Lines onde o relatório é acrescentado")
+    args = parser.parse_args()
+
+    from storage import open_storage
+    if args.synthetic:
+        from benchmark import generate_company
+        from data_manager import DataManager
+        with tempfile.TemporaryDirectory() as workdir:
+            storage = DataManager(os.path.join(workdir, 'employees.json'),
+                                  os.path.join(workdir, 'departments.json'))
+            storage.save_all_data(*generate_company(args.synthetic))
+            report = storage_report(storage)
+        report['source'] = f"synthetic:{args.synthetic}"
+    else:
+        report = storage_report(open_storage(args.storage))
+
+    print(format_report(report))
+    write_report(report, args.output)
+    print(f"Relatório acrescentado a {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
+import sys
+
+
 class Employee:
     """Classe que representa um empregado da empresa"""
     
+    __slots__ = ('id', 'name', 'cpf', 'phone', 'address', 'department')
+    
     counter_id = 1
     
     def __init__(self, name, cpf, phone, address, department="Nenhum", employee_id=None):
@@ -44,6 +49,11 @@ class Employee:
             'department': self.department
         }
     
+    def copy(self):
+        """Cria um empregado independente com os mesmos dados e o mesmo ID"""
+        return Employee(self.name, self.cpf, self.phone, self.address, self.department,
+                        employee_id=self.id)
+    
     @classmethod
     def from_dict(cls, data):
         """Cria um empregado a partir de um dicionário"""
@@ -52,14 +62,39 @@ class Employee:
             cpf=data['cpf'],
             phone=data['phone'],
             address=data['address'],
-            department=data['department'],
+            department=sys.intern(data['department']),
             employee_id=data['id']
         )
 
 
+def validate_employee_data(data):
+    """
+    Valida os campos de um empregado (regras do cadastro)
+    
+    Args:
+        data (dict): Campos name, cpf, phone e address
+    
+    Returns:
+        str | None: Mensagem de erro, ou None se os dados são válidos
+    """
+    fields = [str(data.get(key) or '').strip() for key in ('name', 'cpf', 'phone', 'address')]
+    if not all(fields):
+        return "Todos os campos são obrigatórios!"
+    
+    # CPF e telefone aceitam apenas números
+    if not fields[1].isdigit():
+        return "CPF deve conter apenas números!"
+    if not fields[2].isdigit():
+        return "Telefone deve conter apenas números!"
+    
+    return None
+
+
 class Department:
     """Classe que representa um setor da empresa"""
     
+    __slots__ = ('name', 'team', 'dirty')
+    
     def __init__(self, name):
         """
         Inicializa um novo setor
@@ -68,7 +103,11 @@ class Department:
             name (str): Nome do setor
         """
         self.name = name
-        self.team = []
+        # Conjunto ordenado de empregados (chaves de dict): inserção,
+        # remoção e pertinência em O(1), iteração na ordem de inserção
+        self.team = {}
+        # Nome ou equipe alterados desde a última gravação
+        self.dirty = True
     
     def add_employee(self, employee):
         """
@@ -78,7 +117,20 @@ class Department:
             employee (Employee): Empregado a ser adicionado
         """
         if employee not in self.team:
-            self.team.append(employee)
+            self.team[employee] = None
+            self.dirty = True
+    
+    def add_many(self, employees):
+        """
+        Adiciona vários empregados ao setor de uma vez
+        
+        Args:
+            employees (iterable): Empregados a serem adicionados
+        """
+        size = len(self.team)
+        self.team.update(dict.fromkeys(employees))
+        if len(self.team) != size:
+            self.dirty = True
     
     def remove_employee(self, employee):
         """
@@ -87,8 +139,8 @@ class Department:
         Args:
             employee (Employee): Empregado a ser removido
         """
-        if employee in self.team:
-            self.team.remove(employee)
+        if self.team.pop(employee, False) is not False:
+            self.dirty = True
     
     def to_dict(self):
         """Converte o setor para dicionário para serialização JSON"""
@@ -97,13 +149,222 @@ class Department:
             'team_ids': [emp.id for emp in self.team]
         }
     
+    def copy(self, employees_by_id):
+        """
+        Cria um setor independente com o mesmo nome, equipe e marca dirty
+        
+        Args:
+            employees_by_id (dict): Cópias dos empregados, por ID, que formam a nova equipe
+        """
+        department = Department(self.name)
+        department.team = dict.fromkeys(employees_by_id[emp.id] for emp in self.team)
+        department.dirty = self.dirty
+        return department
+    
     @classmethod
     def from_dict(cls, data, employees_dict):
         """
         Cria um setor a partir de um dicionário
         """
         department = cls(data['name'])
-        for emp_id in data.get('team_ids', []):
-            if emp_id in employees_dict:
-                department.add_employee(employees_dict[emp_id])
+        department.add_many(employees_dict[emp_id] for emp_id in data.get('team_ids', [])
+                            if emp_id in employees_dict)
+        # Acabou de ser lido: igual ao que está gravado
+        department.dirty = False
         return department
+
+
+class ChangeSet:
+    """
+    O que mudou desde a última gravação
+    
+    employee_ids guarda os IDs de empregados criados, alterados ou
+    excluídos, e all_employees indica uma mudança que pode atingir
+    qualquer empregado; departments indica que setores foram criados,
+    renomeados ou excluídos. Mudanças na equipe de um setor ficam no próprio
+    Department (atributo dirty). Com isso a gravação pode pular as
+    coleções que não mudaram.
+    """
+    
+    __slots__ = ('employee_ids', 'all_employees', 'departments')
+    
+    def __init__(self):
+        self.employee_ids = set()
+        self.all_employees = False
+        self.departments = False
+    
+    def mark_employee(self, employee_id):
+        """Marca um empregado como alterado"""
+        self.employee_ids.add(employee_id)
+    
+    def mark_departments(self):
+        """Marca a lista de setores como alterada"""
+        self.departments = True
+    
+    def record(self, change):
+        """Marca o que um registro de alteração (formato do diário) modifica"""
+        op = change.get('op')
+        if op == 'save_employee':
+            self.mark_employee(change['data']['id'])
+        elif op == 'remove_employee':
+            self.mark_employee(change['id'])
+            self.mark_departments()
+        elif op in ('rename_department', 'remove_department'):
+            # O nome do setor também está gravado em cada empregado
+            self.mark_departments()
+            self.all_employees = True
+        else:
+            self.mark_departments()
+    
+    @property
+    def employees(self):
+        """Indica se algum empregado mudou"""
+        return self.all_employees or bool(self.employee_ids)
+    
+    def departments_changed(self, departments):
+        """Indica se a lista de setores precisa ser regravada"""
+        return self.departments or any(dept.dirty for dept in departments)
+    
+    def clear(self):
+        """Esquece as alterações (após gravar)"""
+        self.employee_ids.clear()
+        self.all_employees = False
+        self.departments = False
+
+
+class EmployeeList:
+    """
+    Empregados na ordem de cadastro, indexados por ID
+    
+    Guarda os empregados em um dict por ID (que mantém a ordem de
+    inserção): acrescentar, excluir e buscar por ID custam O(1). O acesso
+    por posição (tabelas da interface, páginas da API) usa uma lista
+    montada sob demanda; uma exclusão a descarta, e a próxima leitura por
+    posição a remonta de uma vez, de modo que uma série de exclusões
+    custa uma única passada.
+    """
+    
+    __slots__ = ('by_id', '_ordered')
+    
+    def __init__(self, employees=()):
+        self.by_id = {}
+        self._ordered = None
+        for emp in employees:
+            self.append(emp)
+    
+    def append(self, employee):
+        """
+        Acrescenta um empregado ao final
+        
+        Args:
+            employee (Employee): Empregado, com ID ainda não usado na lista
+        """
+        if employee.id in self.by_id:
+            raise ValueError(f"Empregado com ID {employee.id} já existe")
+        self.by_id[employee.id] = employee
+        if self._ordered is not None:
+            self._ordered.append(employee)
+    
+    def extend(self, employees):
+        """Acrescenta vários empregados ao final"""
+        for emp in employees:
+            self.append(emp)
+    
+    def remove(self, employee):
+        """
+        Remove um empregado
+        
+        Args:
+            employee (Employee): Empregado a ser removido
+        """
+        del self.by_id[employee.id]
+        self._ordered = None
+    
+    def get(self, employee_id):
+        """Retorna o empregado com o ID informado ou None"""
+        return self.by_id.get(employee_id)
+    
+    def __iter__(self):
+        return iter(self.by_id.values())
+    
+    def __len__(self):
+        return len(self.by_id)
+    
+    def __getitem__(self, index):
+        ordered = self._ordered
+        if ordered is None:
+            ordered = self._ordered = list(self.by_id.values())
+        return ordered[index]
+
+
+class DepartmentRegistry:
+    """
+    Coleção de setores indexada por nome
+    
+    Mantém a ordem de inserção para exibição e responde buscas, criação,
+    renomeação e exclusão em O(1).
+    """
+    
+    __slots__ = ('_by_name', '_ordered')
+    
+    def __init__(self, departments=()):
+        self._by_name = {}
+        self._ordered = {}
+        for dept in departments:
+            self.add(dept)
+    
+    def add(self, department):
+        """
+        Adiciona um setor
+        
+        Args:
+            department (Department): Setor a ser adicionado
+        """
+        if department.name in self._by_name:
+            raise ValueError(f"Setor '{department.name}' já existe")
+        self._by_name[department.name] = department
+        self._ordered[department] = None
+    
+    def get(self, name):
+        """Retorna o setor com o nome informado ou None"""
+        return self._by_name.get(name)
+    
+    def rename(self, department, new_name):
+        """
+        Renomeia um setor mantendo sua posição
+        
+        Não altera o campo department dos empregados da equipe.
+        """
+        if new_name != department.name and new_name in self._by_name:
+            raise ValueError(f"Setor '{new_name}' já existe")
+        del self._by_name[department.name]
+        department.name = new_name
+        department.dirty = True
+        self._by_name[new_name] = department
+    
+    def remove(self, department):
+        """
+        Remove um setor
+        
+        Args:
+            department (Department): Setor a ser removido
+        """
+        del self._by_name[department.name]
+        del self._ordered[department]
+    
+    def names(self):
+        """Lista os nomes dos setores na ordem de exibição"""
+        return [dept.name for dept in self._ordered]
+    
+    def __contains__(self, name):
+        return name in self._by_name
+    
+    def __iter__(self):
+        return iter(self._ordered)
+    
+    def __len__(self):
+        return len(self._ordered)
+    
+    def __getitem__(self, index):
+        # Acesso por posição (seleção em listas da interface): O(n) no número de setores
+        return list(self._ordered)[index]
@@ -0,0 +1,155 @@
+"""
+Medição de latência dos caminhos críticos
+
+As medições são agrupadas por nome em histogramas de memória constante
+(contagem, p50, p95, máximo). A coleta começa desligada, com custo quase
+nulo: os pontos instrumentados só consultam uma variável global. Ela é
+ligada por enable(), pelo painel de desempenho da interface ou pela
+variável de ambiente SGE_PERF=1.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Limites superiores dos baldes, em segundos: de 1 µs a ~100 s, crescendo 25% por balde
+BUCKET_BOUNDS = []
+_bound = 1e-6
+while _bound < 100:
+    BUCKET_BOUNDS.append(_bound)
+    _bound *= 1.25
+BUCKET_BOUNDS.append(float('inf'))
+
+_enabled = os.environ.get('SGE_PERF') == '1'
+_lock = threading.Lock()
+METRICS = {}
+
+
+class Histogram:
+    """Histograma de durações com baldes logarítmicos"""
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKET_BOUNDS)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+
+    def percentile(self, fraction):
+        """Limite superior do balde onde está o percentil (nunca acima do máximo)"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS, self.buckets):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        """Resumo em milissegundos"""
+        return {
+            'count': self.count,
+            'p50_ms': self.percentile(0.5) * 1000,
+            'p95_ms': self.percentile(0.95) * 1000,
+            'max_ms': self.max * 1000,
+            'total_ms': self.total * 1000,
+        }
+
+
+def enabled():
+    """Indica se a coleta está ligada"""
+    return _enabled
+
+
+def enable(flag=True):
+    """Liga (ou desliga) a coleta"""
+    global _enabled
+    _enabled = flag
+
+
+def record(name, seconds):
+    """Registra uma duração no histograma name"""
+    with _lock:
+        histogram = METRICS.get(name)
+        if histogram is None:
+            histogram = METRICS[name] = Histogram()
+        histogram.add(seconds)
+
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name):
+    """Gerenciador de contexto que mede o bloco: with timer('modelo.cadastrar'): ..."""
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def timed(name):
+    """Decorador que mede cada chamada da função"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """Resumo de todas as métricas: {nome: {count, p50_ms, p95_ms, max_ms, total_ms}}"""
+    with _lock:
+        return {name: histogram.summary() for name, histogram in sorted(METRICS.items())}
+
+
+def reset():
+    """Descarta todas as medições"""
+    with _lock:
+        METRICS.clear()
+
+
+def dump_json(path):
+    """Grava o resumo das métricas em um arquivo JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot(), f, indent=2, ensure_ascii=False)
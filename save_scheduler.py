@@ -0,0 +1,187 @@
+import queue
+import threading
+from storage import ConflictError
+
+# Estados exibidos na interface
+UNSAVED = "Não salvo"
+SAVING = "Salvando..."
+SAVED = "Salvo"
+
+# Sentinela que encerra a thread de escrita
+_STOP = object()
+# Resultado de uma gravação recusada por conflito com outro processo
+CONFLICT = object()
+
+
+class SaveScheduler:
+    """
+    Agenda gravações em uma thread separada, agrupando rajadas de edições
+
+    Cada mark_dirty acumula as alterações e reinicia uma janela de espera
+    (delay_ms); quando ela termina sem novas edições, tudo o que foi
+    acumulado é gravado de uma vez pela thread de escrita. Pedidos de
+    gravação completa (changes=None) absorvem as alterações pendentes.
+
+    save_func(changes) roda na thread de escrita e deve retornar True em
+    caso de sucesso. Se ela levantar ConflictError, o lote volta para a
+    fila, on_conflict() incorpora as alterações do outro processo e a
+    gravação é refeita em seguida. on_state_change(estado), on_saved()
+    (após cada gravação bem-sucedida), on_conflict() e on_error() são
+    chamados sempre na thread do Tk.
+    """
+
+    def __init__(self, root, save_func, delay_ms=500, on_state_change=None, on_error=None,
+                 on_saved=None, on_conflict=None):
+        self.root = root
+        self.save_func = save_func
+        self.delay_ms = delay_ms
+        self.on_state_change = on_state_change
+        self.on_error = on_error
+        self.on_saved = on_saved
+        self.on_conflict = on_conflict
+
+        self.pending = []
+        self.full_save = False
+        self.dirty = False
+        self.saving = False
+        self.closing = False
+        self.state = SAVED
+        self._timer = None
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+
+    def mark_dirty(self, changes=None):
+        """Registra alterações a gravar; None pede a gravação completa"""
+        if changes is None:
+            self.full_save = True
+            self.pending = []
+        elif not self.full_save:
+            self.pending.extend(changes)
+        self.dirty = True
+        self._set_state(UNSAVED)
+
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+        self._timer = self.root.after(self.delay_ms, self._flush)
+
+    def close(self):
+        """
+        Grava o que estiver pendente e encerra a thread de escrita
+
+        Bloqueia até a gravação terminar. Retorna False se ela falhar.
+        """
+        self.closing = True
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+
+        self._requests.put(_STOP)
+        self._writer.join()
+        ok = self._collect_results()
+
+        if self.dirty:
+            batch = self._take_batch()
+            saved = self._run(batch)
+            if saved is CONFLICT and self.on_conflict:
+                # Já na thread do Tk: incorpora e tenta mais uma vez
+                self.on_conflict()
+                saved = self._run(batch)
+            ok = saved is True and ok
+            if saved is not True:
+                self._restore_batch(batch)
+        return ok
+
+    # --- Thread do Tk ---
+
+    def _flush(self):
+        self._timer = None
+        if self.saving:
+            # Ainda gravando: tenta de novo depois
+            self._timer = self.root.after(self.delay_ms, self._flush)
+            return
+        if not self.dirty:
+            return
+
+        self.saving = True
+        self._set_state(SAVING)
+        self._requests.put(self._take_batch())
+        self.root.after(50, self._poll_results)
+
+    def _poll_results(self):
+        if not self.saving:
+            return
+        if self._results.empty():
+            self.root.after(50, self._poll_results)
+            return
+        self._collect_results()
+
+    def _collect_results(self):
+        ok = True
+        while not self._results.empty():
+            batch, saved = self._results.get_nowait()
+            self.saving = False
+            if saved is CONFLICT:
+                # O lote volta para a frente da fila e é gravado de novo
+                # depois que o modelo incorporar o que o outro processo gravou
+                self._restore_batch(batch)
+                self._set_state(UNSAVED)
+                if self.on_conflict:
+                    self.on_conflict()
+                if not self.closing:
+                    if self._timer is not None:
+                        self.root.after_cancel(self._timer)
+                    self._timer = self.root.after(self.delay_ms, self._flush)
+            elif saved:
+                if not self.dirty:
+                    self._set_state(SAVED)
+                if self.on_saved:
+                    self.on_saved()
+            else:
+                ok = False
+                self._restore_batch(batch)
+                self._set_state(UNSAVED)
+                if self.on_error:
+                    self.on_error()
+        return ok
+
+    def _take_batch(self):
+        batch = None if self.full_save else self.pending
+        self.pending = []
+        self.full_save = False
+        self.dirty = False
+        return batch
+
+    def _restore_batch(self, batch):
+        """Devolve um lote que falhou para a fila, antes das edições mais novas"""
+        if batch is None:
+            self.full_save = True
+            self.pending = []
+        elif not self.full_save:
+            self.pending = batch + self.pending
+        self.dirty = True
+
+    def _set_state(self, state):
+        self.state = state
+        if self.on_state_change:
+            self.on_state_change(state)
+
+    # --- Thread de escrita ---
+
+    def _writer_loop(self):
+        while True:
+            batch = self._requests.get()
+            if batch is _STOP:
+                return
+            self._results.put((batch, self._run(batch)))
+
+    def _run(self, batch):
+        try:
+            return bool(self.save_func(batch))
+        except ConflictError as e:
+            print(f"Aviso: {e}; a gravação será refeita")
+            return CONFLICT
+        except Exception as e:
+            print(f"Erro ao salvar dados: {e}")
+            return False
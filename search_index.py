@@ -0,0 +1,313 @@
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+
+
+def normalize_text(text):
+    """
+    Forma usada nas buscas: sem diferença de maiúsculas e sem acentos
+
+    "João" e "joao" ficam iguais.
+    """
+    text = text.casefold()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+class PrefixIndex:
+    """
+    Lista ordenada de chaves de texto para busca por prefixo
+
+    Guarda as chaves e os IDs em listas paralelas ordenadas pela chave.
+    A busca é uma bisseção seguida da leitura das entradas seguintes;
+    inserir e remover custam uma bisseção e um deslocamento da lista.
+    """
+
+    def __init__(self, keys=(), ids=()):
+        """
+        Args:
+            keys (list): Chaves iniciais
+            ids (list): ID correspondente a cada chave
+        """
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = [keys[i] for i in order]
+        self.ids = [ids[i] for i in order]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, emp_id):
+        """Insere uma chave mantendo a ordem"""
+        position = bisect_left(self.keys, key)
+        self.keys.insert(position, key)
+        self.ids.insert(position, emp_id)
+
+    def remove(self, key, emp_id):
+        """Remove a entrada (chave, id), se existir"""
+        position = bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key:
+            if self.ids[position] == emp_id:
+                del self.keys[position]
+                del self.ids[position]
+                return
+            position += 1
+
+    def search(self, prefix, limit=None):
+        """IDs cujas chaves começam com prefix, em ordem de chave"""
+        start = bisect_left(self.keys, prefix)
+        end = len(self.keys) if limit is None else min(len(self.keys), start + limit)
+        matches = []
+        for position in range(start, end):
+            if not self.keys[position].startswith(prefix):
+                break
+            matches.append(self.ids[position])
+        return matches
+
+
+class EmployeeSearchIndex:
+    """
+    Índices de busca incremental de empregados: ID, prefixo do nome e do CPF
+
+    Deve ser mantido junto com o modelo: add ao cadastrar, update depois
+    de editar e remove ao excluir. As chaves usadas na indexação ficam
+    guardadas por ID, então update e remove funcionam mesmo depois que o
+    empregado já foi alterado.
+    """
+
+    def __init__(self, employees=()):
+        self.by_id = {emp.id: emp for emp in employees}
+        ids = list(self.by_id)
+        names = [normalize_text(emp.name) for emp in self.by_id.values()]
+        cpfs = [emp.cpf for emp in self.by_id.values()]
+        self._keys = dict(zip(ids, zip(names, cpfs)))
+        self.names = PrefixIndex(names, ids)
+        self.cpfs = PrefixIndex(cpfs, ids)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def add(self, employee):
+        """Indexa um empregado novo"""
+        name, cpf = normalize_text(employee.name), employee.cpf
+        self.by_id[employee.id] = employee
+        self._keys[employee.id] = (name, cpf)
+        self.names.add(name, employee.id)
+        self.cpfs.add(cpf, employee.id)
+
+    def remove(self, employee):
+        """Retira um empregado do índice"""
+        keys = self._keys.pop(employee.id, None)
+        if keys is None:
+            return
+        del self.by_id[employee.id]
+        self.names.remove(keys[0], employee.id)
+        self.cpfs.remove(keys[1], employee.id)
+
+    def update(self, employee):
+        """Reindexa um empregado após edição do nome ou do CPF"""
+        if self._keys.get(employee.id) != (normalize_text(employee.name), employee.cpf):
+            self.remove(employee)
+            self.add(employee)
+
+    def search(self, query, limit=100):
+        """
+        Busca incremental para a digitação
+
+        Consultas numéricas casam com o ID exato e com o prefixo do CPF;
+        as demais, com o prefixo do nome. Retorna no máximo limit
+        empregados.
+        """
+        query = query.strip()
+        if not query:
+            return []
+
+        # isdecimal, e não isdigit: "²" é dígito, mas int("²") falha
+        if query.isdecimal():
+            query_id = int(query)
+            matches = []
+            exact = self.by_id.get(query_id)
+            if exact is not None:
+                matches.append(exact)
+            for emp_id in self.cpfs.search(query, limit):
+                if len(matches) >= limit:
+                    break
+                if emp_id != query_id:
+                    matches.append(self.by_id[emp_id])
+            return matches
+
+        return [self.by_id[emp_id] for emp_id in self.names.search(normalize_text(query), limit)]
+
+
+def trigrams(word):
+    """Trigramas de uma palavra, com espaços nas bordas ("  ab", " ab", "ab ")"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Busca aproximada (tolerante a erros de digitação) por palavras
+
+    Os trigramas indexam o vocabulário, não os documentos: cada palavra
+    distinta aponta para os IDs dos documentos que a contêm, e cada
+    trigrama para as palavras que o contêm. Como nomes e endereços
+    repetem muito as mesmas palavras, o índice fica pequeno e rápido de
+    montar. Uma busca encontra, para cada palavra digitada, as palavras
+    parecidas do vocabulário (coeficiente de Dice sobre os trigramas) e
+    combina os documentos que contêm todas elas; só esses candidatos são
+    pontuados.
+
+    Remover um documento não mexe nos arrays de IDs, que custaria
+    O(documentos da palavra): o ID é anotado como morto para a palavra e
+    ignorado nas buscas. O array de uma palavra é reescrito sem os mortos
+    quando eles passam de uma fração dele, o que mantém o custo da
+    remoção constante em média.
+    """
+
+    # Máximo de documentos pontuados por busca
+    MAX_SCORED = 2000
+    # Máximo de palavras parecidas consideradas para cada palavra digitada
+    MAX_SIMILAR_WORDS = 20
+    # Mortos tolerados em uma palavra antes de reescrever o seu array:
+    # COMPACT_MIN ou a fração COMPACT_RATIO do array, o que for maior
+    COMPACT_MIN = 64
+    COMPACT_RATIO = 0.25
+
+    def __init__(self, min_similarity=0.45):
+        self.min_similarity = min_similarity
+        self.word_docs = {}    # palavra -> array de IDs (vivos e mortos)
+        self.dead_docs = {}    # palavra -> IDs removidos ainda no array
+        self.gram_words = {}   # trigrama -> conjunto de palavras
+        self.texts = {}        # ID -> texto normalizado indexado
+
+    def __len__(self):
+        return len(self.texts)
+
+    def add(self, doc_id, text):
+        """Indexa um documento"""
+        text = normalize_text(text)
+        self.texts[doc_id] = text
+        for word in set(text.split()):
+            docs = self.word_docs.get(word)
+            if docs is None:
+                docs = self.word_docs[word] = array('I')
+                for gram in trigrams(word):
+                    self.gram_words.setdefault(gram, set()).add(word)
+            dead = self.dead_docs.get(word)
+            if dead and doc_id in dead:
+                # Reindexado com a mesma palavra: o ID ainda está no array
+                dead.discard(doc_id)
+            else:
+                docs.append(doc_id)
+
+    def remove(self, doc_id):
+        """Retira um documento do índice (em tempo constante, em média)"""
+        text = self.texts.pop(doc_id, None)
+        if text is None:
+            return
+        for word in set(text.split()):
+            docs = self.word_docs[word]
+            dead = self.dead_docs.setdefault(word, set())
+            dead.add(doc_id)
+            if len(dead) == len(docs):
+                # Palavra saiu do vocabulário
+                del self.word_docs[word]
+                del self.dead_docs[word]
+                for gram in trigrams(word):
+                    words = self.gram_words[gram]
+                    words.discard(word)
+                    if not words:
+                        del self.gram_words[gram]
+            elif len(dead) > max(self.COMPACT_MIN, len(docs) * self.COMPACT_RATIO):
+                self.word_docs[word] = array('I', (d for d in docs if d not in dead))
+                del self.dead_docs[word]
+
+    def _collect_docs(self, docs, word):
+        """Acrescenta a docs os IDs dos documentos que contêm a palavra"""
+        dead = self.dead_docs.get(word)
+        if dead:
+            docs.update(set(self.word_docs[word]).difference(dead))
+        else:
+            docs.update(self.word_docs[word])
+
+    def update(self, doc_id, text):
+        """Reindexa um documento se o texto mudou"""
+        if self.texts.get(doc_id) != normalize_text(text):
+            self.remove(doc_id)
+            self.add(doc_id, text)
+
+    def similar_words(self, word):
+        """
+        Palavras do vocabulário parecidas com word: {palavra: similaridade}
+
+        Só as MAX_SIMILAR_WORDS mais parecidas são retornadas.
+        """
+        if word in self.word_docs and len(word) < 3:
+            return {word: 1.0}
+        grams = trigrams(word)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.gram_words.get(gram, ()))
+        similar = {}
+        for candidate, count in shared.items():
+            similarity = 2 * count / (len(grams) + len(trigrams(candidate)))
+            if similarity >= self.min_similarity:
+                similar[candidate] = similarity
+        if len(similar) > self.MAX_SIMILAR_WORDS:
+            best = sorted(similar.items(), key=lambda item: -item[1])[:self.MAX_SIMILAR_WORDS]
+            similar = dict(best)
+        return similar
+
+    def search(self, query, limit=20):
+        """
+        Documentos mais parecidos com a consulta
+
+        Retorna até limit pares (id, pontuação), do mais parecido para o
+        menos; a pontuação vai de 0 a 1.
+        """
+        words = normalize_text(query).split()
+        if not words:
+            return []
+        similar = [self.similar_words(word) for word in words]
+
+        # Primeiro só com as palavras exatas; se faltar resultado, com as parecidas
+        exact = self._candidates([{w: s for w, s in sims.items() if s == 1.0} for sims in similar])
+        candidates = sorted(islice(exact, self.MAX_SCORED))
+        if len(exact) < limit:
+            candidates += sorted(islice(self._candidates(similar) - exact, self.MAX_SCORED))
+        if not candidates:
+            # Nenhum documento tem todas as palavras: aceita os que têm
+            # alguma, começando pelas palavras mais parecidas
+            found = set()
+            for similarity, word in sorted(((s, w) for sims in similar for w, s in sims.items()),
+                                           reverse=True):
+                self._collect_docs(found, word)
+                if len(found) >= self.MAX_SCORED:
+                    break
+            candidates = sorted(found)
+
+        scored = []
+        for doc_id in candidates[:self.MAX_SCORED]:
+            doc_words = self.texts[doc_id].split()
+            score = sum(max((sims.get(word, 0.0) for word in doc_words), default=0.0)
+                        for sims in similar) / len(similar)
+            scored.append((-score, doc_id))
+        scored.sort()
+        return [(doc_id, -score) for score, doc_id in scored[:limit]]
+
+    def _candidates(self, similar):
+        """Documentos que têm, para cada palavra da consulta, alguma palavra parecida"""
+        sets = []
+        for sims in similar:
+            docs = set()
+            for word in sims:
+                self._collect_docs(docs, word)
+            if not docs:
+                return set()
+            sets.append(docs)
+        sets.sort(key=len)
+        return set.intersection(*sets)
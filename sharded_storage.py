@@ -0,0 +1,228 @@
+import json
+import os
+from typing import List, Dict, Optional
+from models import Employee, Department, ChangeSet
+from storage import StorageBackend, register_backend
+
+
+@register_backend
+class ShardedStorage(StorageBackend):
+    """
+    Backend JSON particionado por ID de empregado
+
+    Os empregados ficam em arquivos NDJSON (um registro por linha), um por
+    partição (id % shards). Alterar um empregado reescreve apenas a sua
+    partição; o arquivo de setores só é regravado quando a composição de
+    algum setor muda.
+    """
+
+    name = 'sharded'
+    extensions = ('.shards',)
+    marker_file = 'manifest.json'
+
+    def __init__(self, directory="empresa.shards", shards=16):
+        """
+        Inicializa o backend; o número de partições do manifesto prevalece
+        """
+        self.directory = directory
+        self.shards = shards
+        self.manifest_file = os.path.join(directory, self.marker_file)
+        self.departments_file = os.path.join(directory, 'departments.json')
+
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                self.shards = json.load(f)['shards']
+        else:
+            self._write_json(self.manifest_file, {'format': 'sge-sharded', 'shards': self.shards})
+
+    @classmethod
+    def open(cls, path: str) -> 'ShardedStorage':
+        """Abre (ou cria) o diretório particionado no caminho informado"""
+        return cls(path)
+
+    def shard_file(self, index: int) -> str:
+        """Caminho do arquivo de uma partição"""
+        return os.path.join(self.directory, f'employees-{index:03d}.ndjson')
+
+    def load_all_data(self) -> tuple:
+        """
+        Carrega todos os dados (empregados e setores)
+        """
+        try:
+            employees = sorted(self.iter_employees(), key=lambda emp: emp.id)
+            employees_dict = {emp.id: emp for emp in employees}
+            departments = [Department.from_dict(data, employees_dict)
+                           for data in self._read_json(self.departments_file, [])]
+            return employees, departments
+        except Exception as e:
+            print(f"Erro ao carregar partições: {e}")
+            return [], []
+
+    def iter_employees(self):
+        """Percorre os empregados partição por partição"""
+        for index in range(self.shards):
+            for data in self._read_shard(index).values():
+                yield Employee.from_dict(data)
+
+    def save_all_data(self, employees: List[Employee], departments: List[Department],
+                      dirty: Optional[ChangeSet] = None) -> bool:
+        """
+        Reescreve as partições e o arquivo de setores
+
+        Com dirty informado, só as partições dos empregados alterados e,
+        se preciso, o arquivo de setores são regravados.
+        """
+        try:
+            if dirty is None or dirty.all_employees:
+                indexes = set(range(self.shards))
+            else:
+                indexes = {emp_id % self.shards for emp_id in dirty.employee_ids}
+            partitions = {index: {} for index in indexes}
+            for emp in employees:
+                records = partitions.get(emp.id % self.shards)
+                if records is not None:
+                    records[emp.id] = emp.to_dict()
+            for index, records in partitions.items():
+                self._write_shard(index, records)
+            if dirty is None or dirty.departments_changed(departments) \
+                    or not os.path.exists(self.departments_file):
+                self._write_json(self.departments_file, [dept.to_dict() for dept in departments])
+                for dept in departments:
+                    dept.dirty = False
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar partições: {e}")
+            return False
+
+    def save_changes(self, employees: List[Employee], departments: List[Department],
+                     changes: List[dict]) -> bool:
+        """
+        Reescreve só as partições tocadas pelas alterações
+
+        Renomear ou excluir um setor percorre todas as partições, pois o
+        nome do setor está gravado em cada empregado.
+        """
+        try:
+            touched: Dict[int, Dict[int, dict]] = {}
+            departments_changed = self._apply_changes(changes, touched)
+            for index, records in touched.items():
+                self._write_shard(index, records)
+            if departments_changed:
+                self._write_json(self.departments_file, [dept.to_dict() for dept in departments])
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar partições: {e}")
+            return False
+
+    def upsert_employee(self, employee: Employee) -> bool:
+        """Insere ou atualiza um empregado reescrevendo só a sua partição"""
+        return self._save_employee_changes([{'op': 'save_employee', 'data': employee.to_dict()}])
+
+    def delete_employee(self, employee_id: int) -> bool:
+        """Exclui um empregado reescrevendo só a sua partição"""
+        return self._save_employee_changes([{'op': 'remove_employee', 'id': employee_id}])
+
+    def _save_employee_changes(self, changes: List[dict]) -> bool:
+        try:
+            touched: Dict[int, Dict[int, dict]] = {}
+            membership_changed = self._apply_changes(changes, touched)
+            for index, records in touched.items():
+                self._write_shard(index, records)
+            if membership_changed:
+                self._update_teams(changes)
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar empregado: {e}")
+            return False
+
+    def _apply_changes(self, changes: List[dict], touched: Dict[int, Dict[int, dict]]) -> bool:
+        """
+        Aplica alterações às partições carregadas em touched, na ordem
+
+        Retorna True se a composição de algum setor pode ter mudado.
+        """
+        def shard(index):
+            if index not in touched:
+                touched[index] = self._read_shard(index)
+            return touched[index]
+
+        membership_changed = False
+        for change in changes:
+            op = change['op']
+            if op == 'save_employee':
+                data = change['data']
+                records = shard(data['id'] % self.shards)
+                old = records.get(data['id'])
+                if (old['department'] if old else "Nenhum") != data['department']:
+                    membership_changed = True
+                records[data['id']] = data
+            elif op == 'remove_employee':
+                old = shard(change['id'] % self.shards).pop(change['id'], None)
+                if old and old['department'] != "Nenhum":
+                    membership_changed = True
+            elif op in ('rename_department', 'remove_department'):
+                old_name = change.get('old_name', change.get('name'))
+                new_name = change.get('new_name', "Nenhum")
+                for index in range(self.shards):
+                    for data in shard(index).values():
+                        if data['department'] == old_name:
+                            data['department'] = new_name
+                membership_changed = True
+            else:
+                membership_changed = True
+        return membership_changed
+
+    def _update_teams(self, changes: List[dict]):
+        """
+        Acerta as equipes no arquivo de setores para alterações de empregados
+
+        Sem o modelo em memória, as listas de IDs são editadas direto no
+        arquivo; o empregado entra no fim da equipe do novo setor.
+        """
+        department_list = self._read_json(self.departments_file, [])
+        for change in changes:
+            if change['op'] == 'save_employee':
+                emp_id, department = change['data']['id'], change['data']['department']
+            else:
+                emp_id, department = change['id'], None
+            for data in department_list:
+                team_ids = data.setdefault('team_ids', [])
+                if data['name'] == department:
+                    if emp_id not in team_ids:
+                        team_ids.append(emp_id)
+                elif emp_id in team_ids:
+                    team_ids.remove(emp_id)
+        self._write_json(self.departments_file, department_list)
+
+    def _read_shard(self, index: int) -> Dict[int, dict]:
+        records = {}
+        path = self.shard_file(index)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        data = json.loads(line)
+                        records[data['id']] = data
+        return records
+
+    def _write_shard(self, index: int, records: Dict[int, dict]):
+        temp_file = self.shard_file(index) + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            for emp_id in sorted(records):
+                f.write(json.dumps(records[emp_id], ensure_ascii=False) + '\n')
+        os.replace(temp_file, self.shard_file(index))
+
+    @staticmethod
+    def _read_json(path: str, default):
+        if not os.path.exists(path):
+            return default
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_json(path: str, data):
+        temp_file = path + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_file, path)
@@ -0,0 +1,249 @@
+import sqlite3
+from typing import List, Optional
+from models import Employee, Department, ChangeSet
+from data_manager import employee_change
+from storage import StorageBackend, register_backend
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    cpf TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    address TEXT NOT NULL,
+    department TEXT NOT NULL DEFAULT 'Nenhum'
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_employees_cpf ON employees(cpf);
+CREATE INDEX IF NOT EXISTS idx_employees_department ON employees(department);
+
+CREATE TABLE IF NOT EXISTS departments (
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS department_members (
+    department TEXT NOT NULL,
+    employee_id INTEGER NOT NULL,
+    PRIMARY KEY (department, employee_id)
+);
+CREATE INDEX IF NOT EXISTS idx_members_employee ON department_members(employee_id);
+"""
+
+
+@register_backend
+class SQLiteDataManager(StorageBackend):
+    """
+    Gerenciador de dados em SQLite com a mesma interface do DataManager
+
+    Cada alteração vira uma escrita de linha indexada, em vez da regravação
+    dos arquivos completos. A ordem de exibição é a ordem de inserção (rowid).
+    """
+
+    name = 'sqlite'
+    extensions = ('.db', '.sqlite', '.sqlite3')
+    magic = b'SQLite format 3\x00'
+
+    def __init__(self, database_file="empresa.db"):
+        """
+        Inicializa o gerenciador e cria o esquema se necessário
+        """
+        self.database_file = database_file
+        # A interface carrega os dados em outra thread; o acesso é
+        # sequencial, então a conexão pode ser compartilhada
+        self.connection = sqlite3.connect(database_file, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, path: str) -> 'SQLiteDataManager':
+        """Abre (ou cria) o banco no caminho informado"""
+        return cls(path)
+
+    def close(self):
+        """Fecha a conexão com o banco"""
+        self.connection.close()
+
+    # --- Interface compatível com DataManager ---
+
+    def load_all_data(self) -> tuple:
+        """
+        Carrega todos os dados (empregados e setores)
+        """
+        try:
+            employees = [self._row_to_employee(row) for row in self.connection.execute(
+                "SELECT id, name, cpf, phone, address, department FROM employees ORDER BY rowid")]
+            employees_dict = {emp.id: emp for emp in employees}
+
+            departments = []
+            departments_dict = {}
+            for (name,) in self.connection.execute("SELECT name FROM departments ORDER BY rowid"):
+                dept = Department(name)
+                departments.append(dept)
+                departments_dict[name] = dept
+
+            for dept_name, emp_id in self.connection.execute(
+                    "SELECT department, employee_id FROM department_members ORDER BY rowid"):
+                if dept_name in departments_dict and emp_id in employees_dict:
+                    departments_dict[dept_name].add_employee(employees_dict[emp_id])
+
+            return employees, departments
+        except Exception as e:
+            print(f"Erro ao carregar dados: {e}")
+            return [], []
+
+    def save_all_data(self, employees: List[Employee], departments: List[Department],
+                      dirty: Optional[ChangeSet] = None) -> bool:
+        """
+        Substitui o conteúdo do banco pelos dados informados
+
+        Com dirty informado, as tabelas que não mudaram são mantidas.
+        """
+        write_employees = dirty is None or dirty.employees
+        write_departments = dirty is None or dirty.departments_changed(departments)
+        try:
+            with self.connection:
+                if write_employees or write_departments:
+                    self.connection.execute("DELETE FROM department_members")
+                if write_departments:
+                    self.connection.execute("DELETE FROM departments")
+                if write_employees:
+                    self.connection.execute("DELETE FROM employees")
+                    self.connection.executemany(
+                        "INSERT INTO employees (id, name, cpf, phone, address, department) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (self._employee_to_row(emp) for emp in employees))
+                if write_departments:
+                    self.connection.executemany(
+                        "INSERT INTO departments (name) VALUES (?)",
+                        ((dept.name,) for dept in departments))
+                if write_employees or write_departments:
+                    self.connection.executemany(
+                        "INSERT OR IGNORE INTO department_members (department, employee_id) VALUES (?, ?)",
+                        ((dept.name, emp.id) for dept in departments for emp in dept.team))
+            for dept in departments:
+                dept.dirty = False
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar dados: {e}")
+            return False
+
+    def save_changes(self, employees: List[Employee], departments: List[Department],
+                     changes: List[dict]) -> bool:
+        """
+        Aplica os registros de alteração como escritas de linha em uma transação
+
+        Aceita os mesmos registros usados pelo diário do DataManager.
+        """
+        try:
+            with self.connection:
+                for change in changes:
+                    self._apply_change(change)
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar alterações: {e}")
+            return False
+
+    def needs_model(self, changes: Optional[List[dict]]) -> bool:
+        """Os registros de alteração viram escritas de linha: o modelo só é lido ao gravar tudo"""
+        return changes is None
+
+    # --- Operações por linha ---
+
+    def insert_employee(self, employee: Employee) -> bool:
+        """Insere um empregado e o vincula ao seu setor"""
+        return self.save_changes([], [], [employee_change(employee)])
+
+    def update_employee(self, employee: Employee) -> bool:
+        """Atualiza um empregado existente, movendo-o de setor se necessário"""
+        return self.insert_employee(employee)
+
+    upsert_employee = insert_employee
+
+    def delete_employee(self, employee_id: int) -> bool:
+        """Exclui um empregado e sua vinculação a setores"""
+        return self.save_changes([], [], [{'op': 'remove_employee', 'id': employee_id}])
+
+    def find_employee(self, employee_id: int) -> Optional[Employee]:
+        """Busca um empregado pelo ID"""
+        row = self.connection.execute(
+            "SELECT id, name, cpf, phone, address, department FROM employees WHERE id = ?",
+            (employee_id,)).fetchone()
+        return self._row_to_employee(row) if row else None
+
+    def find_employee_by_cpf(self, cpf: str) -> Optional[Employee]:
+        """Busca um empregado pelo CPF (índice único)"""
+        row = self.connection.execute(
+            "SELECT id, name, cpf, phone, address, department FROM employees WHERE cpf = ?",
+            (cpf,)).fetchone()
+        return self._row_to_employee(row) if row else None
+
+    def employees_in_department(self, department_name: str) -> List[Employee]:
+        """Lista os empregados de um setor pelo índice de setor"""
+        return [self._row_to_employee(row) for row in self.connection.execute(
+            "SELECT id, name, cpf, phone, address, department FROM employees "
+            "WHERE department = ? ORDER BY rowid", (department_name,))]
+
+    def iter_employees(self):
+        """Percorre os empregados sem carregá-los todos em memória"""
+        cursor = self.connection.execute(
+            "SELECT id, name, cpf, phone, address, department FROM employees ORDER BY rowid")
+        for row in cursor:
+            yield self._row_to_employee(row)
+
+    def count_employees(self) -> int:
+        """Retorna o número de empregados cadastrados"""
+        return self.connection.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+
+    # --- Auxiliares ---
+
+    def _apply_change(self, change: dict):
+        """Traduz um registro de alteração em comandos SQL"""
+        op = change.get('op')
+        execute = self.connection.execute
+
+        if op == 'save_employee':
+            data = change['data']
+            row = execute("SELECT department FROM employees WHERE id = ?", (data['id'],)).fetchone()
+            execute("INSERT INTO employees (id, name, cpf, phone, address, department) "
+                    "VALUES (:id, :name, :cpf, :phone, :address, :department) "
+                    "ON CONFLICT(id) DO UPDATE SET name = excluded.name, cpf = excluded.cpf, "
+                    "phone = excluded.phone, address = excluded.address, "
+                    "department = excluded.department", data)
+            old_department = row[0] if row else None
+            if old_department != data['department']:
+                execute("DELETE FROM department_members WHERE employee_id = ?", (data['id'],))
+                execute("INSERT INTO department_members (department, employee_id) "
+                        "SELECT name, ? FROM departments WHERE name = ?",
+                        (data['id'], data['department']))
+
+        elif op == 'remove_employee':
+            execute("DELETE FROM department_members WHERE employee_id = ?", (change['id'],))
+            execute("DELETE FROM employees WHERE id = ?", (change['id'],))
+
+        elif op == 'create_department':
+            execute("INSERT OR IGNORE INTO departments (name) VALUES (?)", (change['name'],))
+
+        elif op == 'rename_department':
+            params = (change['new_name'], change['old_name'])
+            execute("UPDATE departments SET name = ? WHERE name = ?", params)
+            execute("UPDATE department_members SET department = ? WHERE department = ?", params)
+            execute("UPDATE employees SET department = ? WHERE department = ?", params)
+
+        elif op == 'remove_department':
+            execute("DELETE FROM departments WHERE name = ?", (change['name'],))
+            execute("DELETE FROM department_members WHERE department = ?", (change['name'],))
+            execute("UPDATE employees SET department = 'Nenhum' WHERE department = ?",
+                    (change['name'],))
+
+        else:
+            raise ValueError(f"Operação desconhecida: {op}")
+
+    @staticmethod
+    def _employee_to_row(employee: Employee) -> tuple:
+        return (employee.id, employee.name, employee.cpf, employee.phone,
+                employee.address, employee.department)
+
+    @staticmethod
+    def _row_to_employee(row) -> Employee:
+        emp_id, name, cpf, phone, address, department = row
+        return Employee(name, cpf, phone, address, department, employee_id=emp_id)
@@ -0,0 +1,183 @@
+import os
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import List, Dict, Iterator, Optional
+from models import Employee, Department, ChangeSet
+
+# Registro de backends: nome -> classe
+BACKENDS: Dict[str, type] = {}
+
+# Módulos que registram os backends embutidos ao serem importados
+BUILTIN_BACKEND_MODULES = ('data_manager', 'sqlite_data_manager', 'binary_storage', 'sharded_storage')
+
+
+class ConflictError(Exception):
+    """
+    Outro processo gravou depois da última leitura deste
+
+    Nada foi gravado: quem chamou deve recarregar os dados, reaplicar
+    suas alterações sobre eles e tentar de novo.
+    """
+
+    def __init__(self, expected: int, found: int):
+        super().__init__(f"Os dados foram alterados por outro processo "
+                         f"(geração {found}, esperada {expected})")
+        self.expected = expected
+        self.found = found
+
+
+class StorageBackend(ABC):
+    """
+    Contrato comum dos backends de armazenamento
+
+    Todo backend expõe a interface usada pela interface gráfica
+    (load_all_data, save_all_data, save_changes) e operações por
+    empregado. As subclasses declaram como são reconhecidas: pela
+    extensão do caminho, pelos primeiros bytes do arquivo ou, nos
+    formatos em diretório, por um arquivo marcador.
+    """
+
+    name = None
+    extensions = ()
+    magic = None
+    marker_file = None
+
+    @classmethod
+    @abstractmethod
+    def open(cls, path: str) -> 'StorageBackend':
+        """Abre (ou cria) o armazenamento no caminho informado"""
+
+    @abstractmethod
+    def load_all_data(self) -> tuple:
+        """Carrega todos os dados (empregados e setores)"""
+
+    @abstractmethod
+    def save_all_data(self, employees: List[Employee], departments: List[Department],
+                      dirty: Optional[ChangeSet] = None) -> bool:
+        """
+        Salva todos os dados (empregados e setores)
+
+        Com dirty informado, o backend pode deixar de regravar o que não
+        mudou; sem ele, tudo é gravado. Backends que detectam gravações
+        concorrentes de outros processos levantam ConflictError.
+        """
+
+    @abstractmethod
+    def upsert_employee(self, employee: Employee) -> bool:
+        """Insere ou atualiza um único empregado"""
+
+    @abstractmethod
+    def delete_employee(self, employee_id: int) -> bool:
+        """Exclui um único empregado"""
+
+    def save_changes(self, employees: List[Employee], departments: List[Department],
+                     changes: List[dict]) -> bool:
+        """
+        Salva as alterações informadas
+
+        A implementação padrão regrava as coleções tocadas pelas
+        alterações; backends com escrita incremental a sobrescrevem.
+        """
+        dirty = ChangeSet()
+        for change in changes:
+            dirty.record(change)
+        return self.save_all_data(employees, departments, dirty)
+
+    def needs_model(self, changes: Optional[List[dict]]) -> bool:
+        """
+        Indica se gravar essas alterações (None: tudo) lê o modelo em memória
+
+        Quem grava em outra thread só precisa copiar o modelo quando o
+        backend vai lê-lo; backends que gravam apenas os registros de
+        alteração retornam False.
+        """
+        return True
+
+    def locked(self):
+        """
+        Contexto em que nenhum outro processo grava neste armazenamento
+
+        Backends que levantam ConflictError o implementam; dentro dele,
+        uma releitura seguida de gravação não tem conflito.
+        """
+        return nullcontext()
+
+    def has_external_changes(self) -> bool:
+        """
+        Indica, sem a trava exclusiva, se outro processo gravou desde a última leitura
+
+        Quem sincroniza periodicamente consulta este método antes de
+        locked(): sem gravações novas, não disputa a trava com ninguém.
+        """
+        return False
+
+    def read_external_changes(self) -> Optional[List[dict]]:
+        """
+        Registros de alteração gravados por outros processos desde a última leitura
+
+        Retorna a lista (vazia se nada mudou) ou None quando é preciso
+        reler os dados para saber o que mudou. Backends que não
+        acompanham outros processos retornam sempre a lista vazia.
+        """
+        return []
+
+    def iter_employees(self) -> Iterator[Employee]:
+        """Percorre os empregados armazenados"""
+        employees, _ = self.load_all_data()
+        return iter(employees)
+
+    @classmethod
+    def matches_header(cls, header: bytes) -> bool:
+        """Indica se os primeiros bytes do arquivo pertencem a este formato"""
+        return cls.magic is not None and header.startswith(cls.magic)
+
+
+def register_backend(cls):
+    """Decorador que registra um backend pelo seu nome"""
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+def _load_builtin_backends():
+    for module_name in BUILTIN_BACKEND_MODULES:
+        __import__(module_name)
+
+
+def detect_backend(path: str) -> type:
+    """
+    Identifica o backend adequado para o caminho
+
+    Arquivos existentes são reconhecidos pelo cabeçalho; caminhos novos,
+    pela extensão. Diretórios sem formato reconhecido usam JSON.
+    """
+    _load_builtin_backends()
+
+    if os.path.isfile(path):
+        with open(path, 'rb') as f:
+            header = f.read(32)
+        for backend in BACKENDS.values():
+            if backend.matches_header(header):
+                return backend
+    elif os.path.isdir(path):
+        for backend in BACKENDS.values():
+            if backend.marker_file and os.path.isfile(os.path.join(path, backend.marker_file)):
+                return backend
+
+    extension = os.path.splitext(path)[1].lower()
+    for backend in BACKENDS.values():
+        if extension in backend.extensions:
+            return backend
+
+    return BACKENDS['json']
+
+
+def open_storage(path: str, backend: Optional[str] = None) -> StorageBackend:
+    """
+    Abre o armazenamento no caminho, detectando o formato se backend não for informado
+    """
+    _load_builtin_backends()
+    if backend is not None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconhecido: {backend}")
+        return BACKENDS[backend].open(path)
+    return detect_backend(path).open(path)
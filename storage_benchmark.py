@@ -0,0 +1,137 @@
+"""
+Verificação de conformidade e desempenho dos backends de armazenamento
+
+Executa a mesma carga de trabalho em todos os backends registrados,
+confere se cada um devolve exatamente os dados esperados e imprime os
+tempos de cada etapa.
+
+Uso: python storage_benchmark.py [quantidade_de_empregados]
+"""
+import os
+import sys
+import tempfile
+import time
+from models import Employee, Department
+from data_manager import apply_change, department_rename
+from storage import BACKENDS, open_storage, _load_builtin_backends
+
+BACKEND_PATHS = {
+    'json': 'dados',
+    'sqlite': 'empresa.db',
+    'binary': 'empresa.sgeb',
+    'sharded': 'empresa.shards',
+}
+
+
+def build_company(n_employees, n_departments=10):
+    """Gera uma empresa sintética simples e determinística"""
+    departments = [Department(f"Setor {i}") for i in range(n_departments)]
+    employees = []
+    for i in range(n_employees):
+        dept = departments[i % n_departments] if i % 7 else None
+        emp = Employee(f"Empregado {i}", f"{10000000000 + i}", f"1190000{i:04d}",
+                       f"Rua {i}, {i % 500}", dept.name if dept else "Nenhum",
+                       employee_id=i + 1)
+        employees.append(emp)
+        if dept:
+            dept.add_employee(emp)
+    return employees, departments
+
+
+def snapshot(employees, departments):
+    """Representação comparável do modelo"""
+    return (sorted((emp.to_dict() for emp in employees), key=lambda data: data['id']),
+            [dept.to_dict() for dept in departments])
+
+
+def run_backend(name, path, n_employees, n_updates):
+    """Executa a carga de trabalho em um backend e retorna (tempos, erros)"""
+    timings = {}
+    errors = []
+    employees, departments = build_company(n_employees)
+    employees_dict = {emp.id: emp for emp in employees}
+    departments_dict = {dept.name: dept for dept in departments}
+
+    def timed(step, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        timings[step] = time.perf_counter() - start
+        return result
+
+    def check(step):
+        loaded = open_storage(path, name).load_all_data()
+        expected = snapshot(list(employees_dict.values()), list(departments_dict.values()))
+        if snapshot(*loaded) != expected:
+            errors.append(f"dados divergentes após {step}")
+
+    backend = open_storage(path, name)
+    if not timed('save_all', backend.save_all_data, employees, departments):
+        errors.append("save_all_data falhou")
+    timed('load_all', open_storage(path, name).load_all_data)
+    check('save_all')
+
+    def upsert_many():
+        for emp in list(employees_dict.values())[:n_updates]:
+            emp.phone = emp.phone[::-1]
+            if not backend.upsert_employee(emp):
+                errors.append(f"upsert_employee({emp.id}) falhou")
+    timed(f'upsert x{n_updates}', upsert_many)
+    check('upsert_employee')
+
+    def move_many():
+        names = list(departments_dict) + ["Nenhum"]
+        for i, emp in enumerate(list(employees_dict.values())[:n_updates]):
+            moved = dict(emp.to_dict(), department=names[i % len(names)])
+            apply_change({'op': 'save_employee', 'data': moved}, employees_dict, departments_dict)
+            if not backend.upsert_employee(emp):
+                errors.append(f"upsert_employee({emp.id}) falhou")
+    timed(f'move x{n_updates}', move_many)
+    check('upsert_employee com troca de setor')
+
+    def delete_many():
+        for emp in list(employees_dict.values())[-n_updates:]:
+            apply_change({'op': 'remove_employee', 'id': emp.id}, employees_dict, departments_dict)
+            if not backend.delete_employee(emp.id):
+                errors.append(f"delete_employee({emp.id}) falhou")
+    timed(f'delete x{n_updates}', delete_many)
+    check('delete_employee')
+
+    moved = dict(next(iter(employees_dict.values())).to_dict(), department="Setor 1")
+    changes = [department_rename("Setor 0", "Setor Zero"), {'op': 'save_employee', 'data': moved}]
+    for change in changes:
+        apply_change(change, employees_dict, departments_dict)
+    if not timed('save_changes', backend.save_changes, list(employees_dict.values()),
+                 list(departments_dict.values()), changes):
+        errors.append("save_changes falhou")
+    check('save_changes')
+
+    count = timed('iter', lambda: sum(1 for _ in open_storage(path, name).iter_employees()))
+    if count != len(employees_dict):
+        errors.append(f"iter_employees retornou {count} de {len(employees_dict)}")
+
+    return timings, errors
+
+
+def main():
+    n_employees = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    n_updates = min(100, max(1, n_employees // 10))
+    _load_builtin_backends()
+
+    print(f"Carga: {n_employees} empregados, {n_updates} alterações por etapa\n")
+    failures = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in BACKENDS:
+            path = os.path.join(workdir, BACKEND_PATHS.get(name, name))
+            timings, errors = run_backend(name, path, n_employees, n_updates)
+            status = "OK" if not errors else "FALHA"
+            steps = "  ".join(f"{step}={seconds * 1000:.1f}ms" for step, seconds in timings.items())
+            print(f"{name:<8} {status:<6} {steps}")
+            for error in errors:
+                print(f"    - {error}")
+            failures += bool(errors)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Escritor único do ApiServer diante de falhas do armazenamento
+"""
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_server import ApiServer
+from company_service import CompanyService
+from data_manager import DataManager
+
+
+class FailingDataManager(DataManager):
+    """DataManager cuja próxima gravação levanta OSError enquanto fail_next for True"""
+
+    fail_next = False
+
+    def save_changes(self, employees, departments, changes):
+        if self.fail_next:
+            self.fail_next = False
+            raise OSError("disco indisponível")
+        return super().save_changes(employees, departments, changes)
+
+
+class ApiServerWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.service = CompanyService(storage=FailingDataManager.open(self.directory))
+        self.service.load()
+        self.addCleanup(self.service.storage.lock.close)
+        self.server = ApiServer(self.service)
+        self.addCleanup(self.server.executor.shutdown)
+
+    def register(self, name, cpf):
+        body = json.dumps({'name': name, 'cpf': cpf, 'phone': "11999999999", 'address': "Rua"})
+        return self.server.dispatch('POST', '/employees', body.encode())
+
+    def test_writer_survives_a_save_exception(self):
+        async def scenario():
+            self.server.write_queue = asyncio.Queue()
+            writer = asyncio.create_task(self.server.writer())
+            try:
+                self.service.storage.fail_next = True
+                failed = await asyncio.wait_for(self.register("Ana", "11111111111"), 5)
+                saved = await asyncio.wait_for(self.register("Bia", "22222222222"), 5)
+                return failed, saved
+            finally:
+                writer.cancel()
+
+        (failed_status, _), (saved_status, _) = asyncio.run(scenario())
+        self.assertEqual(failed_status, 500)
+        self.assertEqual(saved_status, 201)
+
+        # A alteração do lote que falhou foi gravada junto com a seguinte
+        stored = CompanyService(storage=DataManager.open(self.directory))
+        stored.load()
+        self.addCleanup(stored.storage.lock.close)
+        self.assertEqual(sorted(emp.name for emp in stored.employees), ["Ana", "Bia"])
+
+
+if __name__ == '__main__':
+    unittest.main()
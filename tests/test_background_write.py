@@ -0,0 +1,94 @@
+"""
+Gravação em outra thread (como a do SaveScheduler) com o modelo livre
+
+Um armazenamento que espera um sinal no meio da gravação permite
+alterar o modelo enquanto ela acontece.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from company_service import CompanyService
+from data_manager import DataManager
+
+
+class SlowDataManager(DataManager):
+    """DataManager cuja gravação completa espera release depois de começar"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def save_all_data(self, employees, departments, dirty=None):
+        self.started.set()
+        self.release.wait(5)
+        return super().save_all_data(employees, departments, dirty)
+
+
+class BackgroundWriteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def open_service(self, storage_class=DataManager):
+        service = CompanyService(storage=storage_class.open(self.directory))
+        service.load()
+        self.addCleanup(service.storage.lock.close)
+        return service
+
+    def start_write(self, service, changes):
+        result = {}
+        writer = threading.Thread(target=lambda: result.setdefault('saved', service.write(changes)))
+        writer.start()
+        self.assertTrue(service.storage.started.wait(5))
+        return writer, result
+
+    def test_model_is_free_while_writing(self):
+        service = self.open_service(SlowDataManager)
+        service.create_department("TI")
+        service.register_employee("Ana", "11111111111", "11999999999", "Rua A", "TI")
+        service.take_changes()
+        writer, result = self.start_write(service, None)
+
+        # A thread da interface altera o modelo durante a gravação
+        self.assertTrue(service.lock.acquire(timeout=1))
+        service.lock.release()
+        service.register_employee("Bia", "22222222222", "11999999999", "Rua B", "TI")
+        service.rename_department("TI", "Tecnologia")
+
+        service.storage.release.set()
+        writer.join(5)
+        self.assertTrue(result['saved'])
+        self.assertEqual(len(service.unwritten), 0)
+        self.assertEqual(len(service.pending_changes), 2)
+
+        # Gravou a cópia: o que veio depois fica para a próxima gravação
+        stored = self.open_service()
+        self.assertEqual([emp.name for emp in stored.employees], ["Ana"])
+        self.assertEqual(stored.departments.names(), ["TI"])
+
+        self.assertTrue(service.save())
+        stored = self.open_service()
+        self.assertEqual(sorted(emp.name for emp in stored.employees), ["Ana", "Bia"])
+        self.assertEqual([emp.name for emp in stored.get_department("Tecnologia").team],
+                         ["Ana", "Bia"])
+
+    def test_failed_write_keeps_departments_dirty(self):
+        service = self.open_service(SlowDataManager)
+        service.create_department("TI")
+        service.storage.release.set()
+        service.storage.departments_file = os.path.join(self.directory, 'ausente', 'departments.json')
+
+        self.assertFalse(service.write(None))
+        self.assertTrue(service.get_department("TI").dirty)
+
+
+if __name__ == '__main__':
+    unittest.main()
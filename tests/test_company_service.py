@@ -0,0 +1,158 @@
+"""
+Índices do CompanyService em memória (sem gravar nada)
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from company_service import CompanyService, ServiceError
+
+
+class EmployeeIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = CompanyService(storage=None)
+        self.service.create_department("TI")
+        # IDs vêm do contador global de Employee: guarda os criados aqui
+        self.ids = [self.service.register_employee(f"Empregado {i}", f"{10000000000 + i}",
+                                                   "11999999999", f"Rua {i}",
+                                                   "TI" if i % 2 else "Nenhum").id
+                    for i in range(1, 6)]
+
+    def test_delete_keeps_order_and_positions(self):
+        service = self.service
+        first, second, third, fourth, fifth = self.ids
+        self.assertEqual(service.employees[2].id, third)
+        service.delete_employee(third)
+        service.delete_employee(first)
+
+        self.assertEqual([emp.id for emp in service.employees], [second, fourth, fifth])
+        self.assertEqual([service.employees[i].id for i in range(len(service.employees))],
+                         [second, fourth, fifth])
+        self.assertEqual([emp.id for emp in service.employees[1:]], [fourth, fifth])
+        self.assertIsNone(service.get_employee(third))
+        self.assertIsNone(service.find_by_cpf("10000000003"))
+        self.assertEqual([emp.id for emp in service.get_department("TI").team], [fifth])
+
+        added = service.register_employee("Novo", "10000000009", "11999999999", "Rua 9")
+        self.assertIs(service.employees[-1], added)
+
+    def test_existing_employee_id_is_rejected(self):
+        service = self.service
+        original = service.get_employee(self.ids[1])
+        service.take_changes()
+
+        with self.assertRaises(ValueError):
+            service.register_employee("Outro", "10000000099", "11999999999", "Rua",
+                                      employee_id=self.ids[1])
+
+        self.assertIs(service.get_employee(self.ids[1]), original)
+        self.assertIsNone(service.find_by_cpf("10000000099"))
+        self.assertEqual(len(service.employees), 5)
+        self.assertEqual(service.take_changes(), [])
+
+
+class CpfIndexTest(unittest.TestCase):
+    """employees_by_cpf acompanha cadastro, edição e exclusão"""
+
+    def setUp(self):
+        self.service = CompanyService(storage=None)
+        self.ana = self.service.register_employee("Ana", "11111111111", "11999999999", "Rua A")
+        self.bia = self.service.register_employee("Bia", "22222222222", "11999999999", "Rua B")
+
+    def assert_index(self):
+        self.assertEqual(self.service.employees_by_cpf,
+                         {emp.cpf: emp for emp in self.service.employees})
+
+    def test_register(self):
+        self.assertIs(self.service.find_by_cpf("11111111111"), self.ana)
+        with self.assertRaises(ServiceError):
+            self.service.register_employee("Outra", "11111111111", "11999999999", "Rua")
+        self.assert_index()
+
+    def test_edit_moves_the_cpf(self):
+        service = self.service
+        service.edit_employee(self.ana.id, "Ana", "33333333333", "11999999999", "Rua A")
+        self.assertIsNone(service.find_by_cpf("11111111111"))
+        self.assertIs(service.find_by_cpf("33333333333"), self.ana)
+        # O CPF liberado pode ser usado de novo; o de outro empregado, não
+        service.register_employee("Caio", "11111111111", "11999999999", "Rua C")
+        with self.assertRaises(ServiceError):
+            service.edit_employee(self.ana.id, "Ana", "22222222222", "11999999999", "Rua A")
+        self.assertEqual(self.ana.cpf, "33333333333")
+        self.assert_index()
+
+    def test_delete_frees_the_cpf(self):
+        self.service.delete_employee(self.bia.id)
+        self.assertIsNone(self.service.find_by_cpf("22222222222"))
+        self.service.register_employee("Bia", "22222222222", "11999999999", "Rua B")
+        self.assert_index()
+
+
+class DepartmentIndexTest(unittest.TestCase):
+    """DepartmentRegistry e equipes acompanham setores e empregados"""
+
+    def setUp(self):
+        self.service = CompanyService(storage=None)
+        for name in ("TI", "RH", "Vendas"):
+            self.service.create_department(name)
+        self.ana = self.service.register_employee("Ana", "11111111111", "11999999999",
+                                                  "Rua A", "TI")
+
+    def assert_teams(self):
+        """Cada empregado está na equipe do seu setor e em nenhuma outra"""
+        service = self.service
+        for dept in service.departments:
+            self.assertIs(service.get_department(dept.name), dept)
+            self.assertEqual({emp.id for emp in dept.team},
+                             {emp.id for emp in service.employees if emp.department == dept.name})
+        for emp in service.employees:
+            self.assertTrue(emp.department == "Nenhum" or emp.department in service.departments)
+
+    def test_create(self):
+        self.assertEqual(self.service.departments.names(), ["TI", "RH", "Vendas"])
+        with self.assertRaises(ServiceError):
+            self.service.create_department("RH")
+        self.assert_teams()
+
+    def test_rename_keeps_position_and_team(self):
+        service = self.service
+        department = service.get_department("TI")
+        service.rename_department("TI", "Tecnologia")
+        self.assertIsNone(service.get_department("TI"))
+        self.assertNotIn("TI", service.departments)
+        self.assertIs(service.get_department("Tecnologia"), department)
+        self.assertEqual(service.departments.names(), ["Tecnologia", "RH", "Vendas"])
+        self.assertEqual(self.ana.department, "Tecnologia")
+        with self.assertRaises(ServiceError):
+            service.rename_department("RH", "Vendas")
+        self.assert_teams()
+
+    def test_remove_frees_the_name(self):
+        service = self.service
+        service.remove_department("TI")
+        self.assertIsNone(service.get_department("TI"))
+        self.assertEqual(self.ana.department, "Nenhum")
+        self.assertEqual(service.departments.names(), ["RH", "Vendas"])
+        service.create_department("TI")
+        self.assertEqual(len(service.get_department("TI").team), 0)
+        self.assert_teams()
+
+    def test_employee_moves(self):
+        service = self.service
+        service.reallocate_employee(self.ana.id, "RH")
+        self.assert_teams()
+        service.edit_employee(self.ana.id, "Ana", self.ana.cpf, "11999999999", "Rua A", "Vendas")
+        self.assert_teams()
+        service.reallocate_employee(self.ana.id, "Nenhum")
+        self.assert_teams()
+        bia = service.register_employee("Bia", "22222222222", "11999999999", "Rua B", "RH")
+        service.delete_employee(bia.id)
+        self.assertEqual(len(service.get_department("RH").team), 0)
+        self.assert_teams()
+
+
+if __name__ == '__main__':
+    unittest.main()
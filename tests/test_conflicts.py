@@ -0,0 +1,91 @@
+"""
+Concorrência otimista do DataManager
+
+Cada gravação confere a geração guardada no arquivo de trava: quem
+leu antes da gravação de outro processo recebe ConflictError e nada
+é gravado.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from company_service import CompanyService
+from data_manager import DataManager
+from storage import ConflictError
+
+
+class ConflictTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.journal_file = os.path.join(self.directory, 'journal.jsonl')
+
+    def open_service(self):
+        service = CompanyService(storage=DataManager.open(self.directory))
+        service.load()
+        self.addCleanup(service.storage.lock.close)
+        return service
+
+    def read_journal(self):
+        with open(self.journal_file, 'rb') as f:
+            return f.read()
+
+    def stored_names(self):
+        return sorted(emp.name for emp in self.open_service().employees)
+
+    def test_stale_generation_raises_and_writes_nothing(self):
+        a = self.open_service()
+        b = self.open_service()
+        a.register_employee("Ana", "11111111111", "11999999999", "Rua A")
+        self.assertTrue(a.save())
+        journal = self.read_journal()
+        generation, _ = b.storage.lock.read_state()
+
+        b.register_employee("Bia", "22222222222", "11999999999", "Rua B")
+        changes = b.take_changes()
+        employees, departments = b.snapshot()
+        with self.assertRaises(ConflictError) as raised:
+            b.storage.save_changes(employees, departments, changes)
+
+        self.assertEqual(raised.exception.expected, b.storage.generation)
+        self.assertEqual(raised.exception.found, generation)
+        self.assertEqual(b.storage.lock.read_state()[0], generation)
+        self.assertEqual(self.read_journal(), journal)
+        self.assertEqual(self.stored_names(), ["Ana"])
+
+    def test_write_without_merge_leaves_the_merge_to_the_caller(self):
+        a = self.open_service()
+        b = self.open_service()
+        a.register_employee("Ana", "11111111111", "11999999999", "Rua A")
+        self.assertTrue(a.save())
+
+        b.register_employee("Bia", "22222222222", "11999999999", "Rua B")
+        changes = b.take_changes()
+        with self.assertRaises(ConflictError):
+            b.write(changes, merge=False)
+        self.assertEqual(b.unwritten, changes)
+
+        self.assertTrue(b.sync_external())
+        self.assertTrue(b.write(changes, merge=False))
+        self.assertEqual(b.unwritten, [])
+        self.assertEqual(self.stored_names(), ["Ana", "Bia"])
+
+    def test_save_merges_the_other_process_changes(self):
+        a = self.open_service()
+        b = self.open_service()
+        a.register_employee("Ana", "11111111111", "11999999999", "Rua A")
+        self.assertTrue(a.save())
+
+        b.register_employee("Bia", "22222222222", "11999999999", "Rua B")
+        self.assertTrue(b.save())
+        self.assertEqual(sorted(emp.name for emp in b.employees), ["Ana", "Bia"])
+        self.assertEqual(self.stored_names(), ["Ana", "Bia"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Leitura em fluxo de arrays JSON, com trechos pequenos o bastante para
+cortar números, textos e separadores em qualquer posição
+"""
+import io
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import iter_json_array
+
+VALID = [
+    '[]',
+    ' [ ] ',
+    '[12345, 678]',
+    '[1.5e10,-0.25,3E-2, 0]',
+    '[true, false, null, 7]',
+    '["a,b", "]", "\\"x\\""]',
+    '[{"id": 1, "team_ids": [1, 2, 3]}, {"id": 22}]',
+    '[\n  {"name": "Ação"},\n  123456789\n]\n',
+]
+
+INVALID = [
+    '',
+    '{}',
+    '[',
+    '[1',
+    '[1,',
+    '[{} {}]',
+    '[{},]',
+    '[1,,2]',
+    '[,1]',
+    '[1 2]',
+    '[1e]',
+    '[tru]',
+]
+
+
+def parse(text, chunk_size):
+    return list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+
+
+class IterJsonArrayTest(unittest.TestCase):
+
+    def test_matches_json_loads_for_any_chunk_size(self):
+        for text in VALID:
+            for chunk_size in range(1, 8):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    self.assertEqual(parse(text, chunk_size), json.loads(text))
+
+    def test_numbers_split_across_chunks(self):
+        self.assertEqual(parse('[12345, 678]', 3), [12345, 678])
+        self.assertEqual(parse('[1e5]', 3), [100000.0])
+
+    def test_rejects_malformed_arrays(self):
+        for text in INVALID:
+            for chunk_size in (1, 3, 65536):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    with self.assertRaises(ValueError):
+                        parse(text, chunk_size)
+
+    def test_large_array(self):
+        data = [{'id': i, 'name': f"Empregado {i}", 'value': i * 1.5} for i in range(2000)]
+        text = json.dumps(data, indent=2)
+        for chunk_size in (7, 100, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(parse(text, chunk_size), data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Diário de operações do DataManager
+
+As alterações vão para journal.jsonl; os arquivos completos só são
+regravados na compactação, a cada compact_every registros.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from company_service import CompanyService
+from data_manager import DataManager
+
+
+class JournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.employees_file = os.path.join(self.directory, 'employees.json')
+        self.journal_file = os.path.join(self.directory, 'journal.jsonl')
+
+    def open_service(self, compact_every=500):
+        storage = DataManager(self.employees_file,
+                              os.path.join(self.directory, 'departments.json'),
+                              journal_file=self.journal_file, compact_every=compact_every)
+        self.addCleanup(storage.lock.close)
+        service = CompanyService(storage=storage)
+        service.load()
+        return service
+
+    def journal_lines(self):
+        with open(self.journal_file, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def snapshot_names(self):
+        if not os.path.exists(self.employees_file):
+            return []
+        with open(self.employees_file, encoding='utf-8') as f:
+            return sorted(data['name'] for data in json.load(f))
+
+    def test_changes_are_replayed_from_the_journal(self):
+        service = self.open_service()
+        service.create_department("TI")
+        ana = service.register_employee("Ana", "11111111111", "11999999999", "Rua A", "TI")
+        bia = service.register_employee("Bia", "22222222222", "11999999999", "Rua B")
+        self.assertTrue(service.save())
+        service.edit_employee(ana.id, "Ana Maria", ana.cpf, ana.phone, ana.address)
+        service.delete_employee(bia.id)
+        self.assertTrue(service.save())
+
+        # Nada foi compactado: só o diário tem os dados
+        self.assertEqual(self.snapshot_names(), [])
+        self.assertEqual([change['op'] for change in self.journal_lines()],
+                         ['create_department', 'save_employee', 'save_employee',
+                          'save_employee', 'remove_employee'])
+
+        reopened = self.open_service()
+        self.assertEqual([emp.name for emp in reopened.employees], ["Ana Maria"])
+        self.assertEqual([emp.id for emp in reopened.get_department("TI").team], [ana.id])
+        self.assertEqual(reopened.storage.journal_entries, 5)
+
+    def test_compaction_at_compact_every(self):
+        service = self.open_service(compact_every=3)
+        for i in range(3):
+            service.register_employee(f"Empregado {i}", f"{10000000000 + i}", "11999999999", "Rua")
+            self.assertTrue(service.save())
+        self.assertEqual(len(self.journal_lines()), 3)
+        self.assertEqual(self.snapshot_names(), [])
+
+        # O quarto registro passa do limite: snapshot completo e diário vazio
+        service.register_employee("Empregado 3", "10000000003", "11999999999", "Rua")
+        self.assertTrue(service.save())
+        self.assertEqual(self.journal_lines(), [])
+        self.assertEqual(self.snapshot_names(), [f"Empregado {i}" for i in range(4)])
+        self.assertEqual(service.storage.journal_entries, 0)
+
+        reopened = self.open_service(compact_every=3)
+        self.assertEqual(len(reopened.employees), 4)
+
+    def test_torn_last_line_is_discarded(self):
+        service = self.open_service()
+        ana = service.register_employee("Ana", "11111111111", "11999999999", "Rua A")
+        self.assertTrue(service.save())
+        complete = os.path.getsize(self.journal_file)
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"op": "save_employee", "data": {"id": 99, "na')
+
+        reopened = self.open_service()
+        self.assertEqual([emp.id for emp in reopened.employees], [ana.id])
+        self.assertEqual(os.path.getsize(self.journal_file), complete)
+
+        # O próximo registro não é concatenado ao pedaço descartado
+        bia = reopened.register_employee("Bia", "22222222222", "11999999999", "Rua B")
+        self.assertTrue(reopened.save())
+        self.assertEqual([emp.id for emp in self.open_service().employees], [ana.id, bia.id])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+SaveScheduler sem Tk: um relógio falso faz o papel de root.after
+
+Os conflitos com outro processo voltam para a thread que chama
+mark_dirty (a do Tk, na interface), que incorpora as alterações e
+grava de novo.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from company_service import CompanyService
+from data_manager import DataManager
+from save_scheduler import SaveScheduler, SAVED
+
+
+class FakeRoot:
+    """Fila de callbacks de root.after, executados por run_until"""
+
+    def __init__(self):
+        self.timers = {}
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.timers[self.next_id] = (time.monotonic() + ms / 1000, callback)
+        return self.next_id
+
+    def after_cancel(self, timer_id):
+        self.timers.pop(timer_id, None)
+
+    def run_until(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            due = [(when, timer_id) for timer_id, (when, _) in self.timers.items()
+                   if when <= time.monotonic()]
+            if not due:
+                time.sleep(0.005)
+                continue
+            _, timer_id = min(due)
+            self.timers.pop(timer_id)[1]()
+        return condition()
+
+
+class SaveSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.root = FakeRoot()
+
+    def open_service(self):
+        service = CompanyService(storage=DataManager.open(self.directory))
+        service.load()
+        self.addCleanup(service.storage.lock.close)
+        return service
+
+    def test_batches_edits(self):
+        batches = []
+        scheduler = SaveScheduler(self.root, lambda changes: batches.append(changes) or True,
+                                  delay_ms=10)
+        for i in range(5):
+            scheduler.mark_dirty([i])
+        self.assertTrue(self.root.run_until(lambda: scheduler.state == SAVED and batches))
+        self.assertEqual(batches, [[0, 1, 2, 3, 4]])
+        self.assertTrue(scheduler.close())
+
+    def test_conflict_is_merged_on_the_calling_thread(self):
+        a = self.open_service()
+        b = self.open_service()
+        b.register_employee("Bia", "22222222222", "11999999999", "Rua B")
+        self.assertTrue(b.save())
+
+        sync_threads = []
+
+        def on_conflict():
+            sync_threads.append(threading.current_thread())
+            a.sync_external()
+
+        scheduler = SaveScheduler(self.root, lambda changes: a.write(changes, merge=False),
+                                  delay_ms=10, on_conflict=on_conflict)
+        a.register_employee("Ana", "11111111111", "11999999999", "Rua A")
+        scheduler.mark_dirty(a.take_changes())
+        self.assertTrue(self.root.run_until(lambda: scheduler.state == SAVED))
+        self.assertTrue(scheduler.close())
+
+        self.assertEqual(sync_threads, [threading.current_thread()])
+        self.assertEqual(sorted(emp.name for emp in a.employees), ["Ana", "Bia"])
+        self.assertEqual(a.unwritten, [])
+        stored = self.open_service()
+        self.assertEqual(sorted(emp.name for emp in stored.employees), ["Ana", "Bia"])
+
+
+if __name__ == '__main__':
+    unittest.main()
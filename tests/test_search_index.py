@@ -0,0 +1,41 @@
+"""
+Busca incremental de empregados (EmployeeSearchIndex)
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Employee
+from search_index import EmployeeSearchIndex
+
+
+class EmployeeSearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.employees = [
+            Employee("João Silva", "12345678901", "11999999999", "Rua A", employee_id=12),
+            Employee("Maria Souza", "12999999999", "11999999999", "Rua B", employee_id=7),
+        ]
+        self.index = EmployeeSearchIndex(self.employees)
+
+    def search_ids(self, query):
+        return [emp.id for emp in self.index.search(query)]
+
+    def test_numeric_query_matches_id_then_cpf_prefix(self):
+        self.assertEqual(self.search_ids("12"), [12, 7])
+        self.assertEqual(self.search_ids("123"), [12])
+
+    def test_name_prefix_ignores_case_and_accents(self):
+        self.assertEqual(self.search_ids("joao"), [12])
+        self.assertEqual(self.search_ids("MAR"), [7])
+
+    def test_non_decimal_digits_do_not_break_search(self):
+        for query in ("²", "12²", "①", "٣"):
+            with self.subTest(query=query):
+                self.assertIsInstance(self.index.search(query), list)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Backends de armazenamento
+
+Todos os backends registrados passam pela mesma carga (a de
+storage_benchmark.py, em escala pequena): cada etapa é conferida
+reabrindo o armazenamento e comparando com o modelo esperado.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from binary_storage import BinaryStorage
+from data_manager import DataManager, apply_change, department_rename, department_removal
+from models import Employee, Department
+from storage import BACKENDS, open_storage, _load_builtin_backends
+from storage_benchmark import BACKEND_PATHS, build_company, snapshot
+
+
+def make_employee(emp_id, department="Nenhum"):
+    return Employee(f"Empregado {emp_id}", f"{10000000000 + emp_id}", "11999999999",
+                    f"Rua {emp_id}", department, employee_id=emp_id)
+
+
+class StorageConformanceTest(unittest.TestCase):
+    """A mesma sequência de gravações em cada backend registrado"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        _load_builtin_backends()
+
+    def run_on_every_backend(self, steps):
+        """Executa steps(backend, esperado) e confere o que cada backend reabre"""
+        self.assertTrue(BACKENDS)
+        for name in BACKENDS:
+            with self.subTest(backend=name):
+                path = os.path.join(self.directory, BACKEND_PATHS.get(name, name))
+                employees, departments = build_company(60, n_departments=4)
+                expected = ({emp.id: emp for emp in employees},
+                            {dept.name: dept for dept in departments})
+                storage = open_storage(path, name)
+                self.assertTrue(storage.save_all_data(employees, departments))
+                steps(storage, expected)
+
+                reopened = open_storage(path, name).load_all_data()
+                self.assertEqual(snapshot(*reopened),
+                                 snapshot(list(expected[0].values()), list(expected[1].values())))
+
+    def test_round_trip(self):
+        self.run_on_every_backend(lambda storage, expected: None)
+
+    def test_upsert(self):
+        def steps(storage, expected):
+            employees, departments = expected
+            changes = [
+                dict(employees[1].to_dict(), phone="11911112222"),
+                dict(employees[2].to_dict(), department="Setor 3"),
+                dict(employees[3].to_dict(), department="Nenhum"),
+                dict(employees[7].to_dict(), department="Setor 0"),
+                make_employee(1000, "Setor 2").to_dict(),
+            ]
+            for data in changes:
+                apply_change({'op': 'save_employee', 'data': data}, employees, departments)
+                self.assertTrue(storage.upsert_employee(Employee.from_dict(data)))
+        self.run_on_every_backend(steps)
+
+    def test_delete(self):
+        def steps(storage, expected):
+            employees, departments = expected
+            for emp_id in (1, 7, 60):
+                apply_change({'op': 'remove_employee', 'id': emp_id}, employees, departments)
+                self.assertTrue(storage.delete_employee(emp_id))
+        self.run_on_every_backend(steps)
+
+    def test_save_changes(self):
+        def steps(storage, expected):
+            employees, departments = expected
+            moved = dict(employees[5].to_dict(), department="Setor 2")
+            changes = [department_rename("Setor 0", "Setor Zero"),
+                       department_removal("Setor 1"),
+                       {'op': 'save_employee', 'data': moved},
+                       {'op': 'remove_employee', 'id': 9}]
+            for change in changes:
+                apply_change(change, employees, departments)
+            self.assertTrue(storage.save_changes(list(employees.values()),
+                                                 list(departments.values()), changes))
+        self.run_on_every_backend(steps)
+
+
+class SingleRecordRewriteTest(unittest.TestCase):
+    """Backends que regravam o arquivo inteiro a cada upsert/delete"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def backends(self):
+        """(nome, backend, arquivos que ele regrava)"""
+        employees_file = os.path.join(self.directory, 'employees.json')
+        departments_file = os.path.join(self.directory, 'departments.json')
+        json_storage = DataManager(employees_file, departments_file)
+        self.addCleanup(json_storage.lock.close)
+        binary_file = os.path.join(self.directory, 'empresa.sgeb')
+        return [('json', json_storage, [employees_file, departments_file]),
+                ('binary', BinaryStorage(binary_file), [binary_file])]
+
+    def test_unreadable_file_is_not_overwritten(self):
+        for name, storage, files in self.backends():
+            with self.subTest(backend=name):
+                employees = [make_employee(1), make_employee(2)]
+                self.assertTrue(storage.save_all_data(employees, []))
+                with open(files[0], 'r+b') as f:
+                    f.seek(10)
+                    f.write(b'\x00corrompido\x00')
+                contents = [open(path, 'rb').read() for path in files]
+
+                self.assertFalse(storage.upsert_employee(make_employee(3)))
+                self.assertFalse(storage.delete_employee(1))
+                self.assertEqual([open(path, 'rb').read() for path in files], contents)
+
+    def test_single_record_writes_keep_insertion_order(self):
+        for name, storage, _ in self.backends():
+            with self.subTest(backend=name):
+                department = Department("TI")
+                employees = [make_employee(3, "TI"), make_employee(1), make_employee(2, "TI")]
+                for emp in employees:
+                    if emp.department == "TI":
+                        department.add_employee(emp)
+                self.assertTrue(storage.save_all_data(employees, [department]))
+
+                moved = make_employee(1, "TI")
+                self.assertTrue(storage.upsert_employee(moved))
+                self.assertTrue(storage.upsert_employee(make_employee(0)))
+                self.assertTrue(storage.delete_employee(2))
+
+                employees, departments = storage.load_all_data()
+                self.assertEqual([emp.id for emp in employees], [3, 1, 0])
+                self.assertEqual([emp.id for emp in departments[0].team], [3, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
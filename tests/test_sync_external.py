@@ -0,0 +1,111 @@
+"""
+Duas instâncias do CompanyService sobre o mesmo armazenamento JSON
+
+Cada instância tem o seu DataManager (e a sua trava), como dois
+processos abertos nos mesmos arquivos.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from company_service import CompanyService
+from data_manager import DataManager
+
+
+class SyncExternalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def open_service(self):
+        service = CompanyService(storage=DataManager.open(self.directory))
+        service.load()
+        self.addCleanup(service.storage.lock.close)
+        return service
+
+    def assert_stored(self, employee_id, department):
+        """Confere o setor do empregado e a equipe no que está gravado"""
+        fresh = self.open_service()
+        employee = fresh.get_employee(employee_id)
+        self.assertEqual(employee.department, department)
+        for dept in fresh.departments:
+            self.assertEqual(employee in dept.team, dept.name == department)
+
+    def prepare(self):
+        a = self.open_service()
+        a.create_department("D")
+        self.assertTrue(a.save())
+        b = self.open_service()
+        b.sync_external()
+        employee = b.register_employee("Ana", "12345678901", "11999999999", "Rua 1", "D")
+        a.remove_department("D")
+        self.assertTrue(a.save())
+        return b, employee
+
+    def test_sync_moves_own_employee_out_of_removed_department(self):
+        b, employee = self.prepare()
+        self.assertTrue(b.sync_external())
+        self.assertEqual(employee.department, "Nenhum")
+        self.assertNotIn("D", b.departments)
+        self.assertTrue(b.save())
+        self.assert_stored(employee.id, "Nenhum")
+
+    def test_conflict_on_save_moves_own_employee_out_of_removed_department(self):
+        b, employee = self.prepare()
+        self.assertTrue(b.save())
+        self.assertEqual(employee.department, "Nenhum")
+        self.assert_stored(employee.id, "Nenhum")
+
+    def test_sync_after_full_save_moves_own_employee_out_of_removed_department(self):
+        a = self.open_service()
+        a.create_department("D")
+        self.assertTrue(a.save())
+        b = self.open_service()
+        employee = b.register_employee("Ana", "12345678901", "11999999999", "Rua 1", "D")
+        a.remove_department("D")
+        a.take_changes()
+        self.assertTrue(a.write(None))
+        b.sync_external()
+        self.assertEqual(employee.department, "Nenhum")
+        self.assertTrue(b.save())
+        self.assert_stored(employee.id, "Nenhum")
+
+    def test_own_move_into_department_created_elsewhere_is_kept(self):
+        a = self.open_service()
+        b = self.open_service()
+        employee = b.register_employee("Ana", "12345678901", "11999999999", "Rua 1")
+        self.assertTrue(b.save())
+        a.sync_external()
+        a.create_department("D")
+        self.assertTrue(a.save())
+        b.sync_external()
+        b.reallocate_employee(employee.id, "D")
+        self.assertTrue(b.save())
+        self.assert_stored(employee.id, "D")
+
+    def test_idle_sync_does_not_take_the_exclusive_lock(self):
+        a = self.open_service()
+        b = self.open_service()
+        lock = a.storage.lock
+        exclusive = lock.exclusive
+        taken = []
+        lock.exclusive = lambda: taken.append(True) or exclusive()
+
+        self.assertFalse(a.sync_external())
+        self.assertFalse(a.sync_external())
+        self.assertEqual(taken, [])
+
+        employee = b.register_employee("Ana", "12345678901", "11999999999", "Rua 1")
+        self.assertTrue(b.save())
+        self.assertTrue(a.sync_external())
+        self.assertEqual(len(taken), 1)
+        self.assertIsNotNone(a.get_employee(employee.id))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,233 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTreeview:
+    """
+    Tabela com rolagem virtual sobre um ttk.Treeview
+
+    Só existem itens Tk para as linhas visíveis; ao rolar, os mesmos itens
+    recebem os valores das novas linhas. Os dados vêm de funções
+    fornecidas pela aplicação:
+
+        row_count()        -> número de linhas do modelo
+        get_row(index)     -> tupla de valores da linha index do modelo
+        sort_keys(column)  -> lista com a chave de ordenação de cada linha
+                              (opcional; sem ela os cabeçalhos não ordenam)
+        data_version()     -> valor que muda sempre que as linhas mudam
+                              (opcional; sem ela toda atualização reordena)
+
+    Um cache com folga de buffer linhas antes e depois da janela visível
+    evita buscar de novo as mesmas linhas em rolagens curtas.
+    """
+
+    def __init__(self, parent, columns, row_count, get_row, sort_keys=None, data_version=None,
+                 buffer=50):
+        self.row_count = row_count
+        self.get_row = get_row
+        self.sort_keys = sort_keys
+        self.data_version = data_version
+        self.buffer = buffer
+
+        self.first = 0
+        self.visible = 20
+        self.order = None
+        self.sort_column = None
+        self.sort_reverse = False
+        # Versão dos dados sobre a qual self.order foi calculada
+        self.sorted_version = None
+        self.selected_position = None
+        self._cache = {}
+        self._slots = []
+        self._attached = set()
+
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings',
+                                 height=self.visible, selectmode='browse')
+        for col in columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+
+        self.scrollbar_y = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.yview)
+        scrollbar_x = ttk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=scrollbar_x.set)
+
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.scrollbar_y.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        scrollbar_x.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(0, weight=1)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self._scroll_units(-3))
+        self.tree.bind('<Button-5>', lambda e: self._scroll_units(3))
+        self.tree.bind('<Prior>', lambda e: self._scroll_units(-self.visible))
+        self.tree.bind('<Next>', lambda e: self._scroll_units(self.visible))
+        self.tree.bind('<Home>', lambda e: self.jump_to_row(0))
+        self.tree.bind('<End>', lambda e: self.jump_to_row(self.row_count() - 1))
+        self.tree.bind('<Up>', lambda e: self._move_selection(-1))
+        self.tree.bind('<Down>', lambda e: self._move_selection(1))
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+
+    def grid(self, **kwargs):
+        """Posiciona o componente no gerenciador grid do pai"""
+        self.frame.grid(**kwargs)
+
+    # --- Dados ---
+
+    def refresh(self):
+        """
+        Recarrega a janela visível após mudanças no modelo
+
+        Se houver ordenação ativa, ela só é refeita quando os dados mudaram
+        desde a última ordenação.
+        """
+        self._cache = {}
+        if self.sort_column is not None and self._sort_outdated():
+            self._apply_sort()
+        self._clamp_first()
+        self._render()
+
+    def model_index(self, position):
+        """Converte a posição exibida no índice da linha no modelo"""
+        return self.order[position] if self.order is not None else position
+
+    # --- Navegação ---
+
+    def jump_to_row(self, position):
+        """Rola até a posição exibida informada e a seleciona"""
+        total = self.row_count()
+        if total == 0:
+            return
+        position = max(0, min(position, total - 1))
+        if position < self.first:
+            self.first = position
+        elif position >= self.first + self.visible:
+            self.first = position - self.visible + 1
+        self.selected_position = position
+        self._clamp_first()
+        self._render()
+        self.tree.focus(self._slots[position - self.first])
+
+    def yview(self, *args):
+        """Comando da barra de rolagem vertical"""
+        total = self.row_count()
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = self.visible if args[2] == 'pages' else 1
+            self.first += int(args[1]) * step
+        self._clamp_first()
+        self._render()
+
+    # --- Ordenação ---
+
+    def sort_by(self, column):
+        """Ordena pela coluna; clicar de novo inverte a ordem"""
+        if self.sort_keys is None:
+            return
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        self._apply_sort()
+        self._cache = {}
+        self.first = 0
+        self.selected_position = None
+        self._render()
+
+    def _sort_outdated(self):
+        if self.data_version is None or len(self.order) != self.row_count():
+            return True
+        return self.data_version() != self.sorted_version
+
+    def _apply_sort(self):
+        if self.data_version is not None:
+            self.sorted_version = self.data_version()
+        keys = self.sort_keys(self.sort_column)
+        self.order = sorted(range(len(keys)), key=keys.__getitem__, reverse=self.sort_reverse)
+
+    # --- Renderização ---
+
+    def _clamp_first(self):
+        self.first = max(0, min(self.first, self.row_count() - self.visible))
+
+    def _row_at(self, position):
+        values = self._cache.get(position)
+        if values is None:
+            values = self.get_row(self.model_index(position))
+            self._cache[position] = values
+        return values
+
+    def _render(self):
+        total = self.row_count()
+
+        # Descarta do cache o que ficou longe da janela atual
+        low, high = self.first - self.buffer, self.first + self.visible + self.buffer
+        if len(self._cache) > 2 * (self.visible + 2 * self.buffer):
+            self._cache = {pos: values for pos, values in self._cache.items() if low <= pos < high}
+
+        while len(self._slots) < self.visible:
+            slot = self.tree.insert('', 'end')
+            self._slots.append(slot)
+            self._attached.add(slot)
+
+        # Só as últimas posições são desanexadas, então reanexar na
+        # posição offset mantém a ordem dos itens
+        for offset, slot in enumerate(self._slots):
+            position = self.first + offset
+            if offset < self.visible and position < total:
+                if slot not in self._attached:
+                    self.tree.move(slot, '', offset)
+                    self._attached.add(slot)
+                self.tree.item(slot, values=self._row_at(position))
+            elif slot in self._attached:
+                self.tree.detach(slot)
+                self._attached.discard(slot)
+
+        # A seleção acompanha a linha, não o item Tk reaproveitado
+        if self.selected_position is not None and 0 <= self.selected_position - self.first < self.visible \
+                and self.selected_position < total:
+            selected = (self._slots[self.selected_position - self.first],)
+        else:
+            selected = ()
+        if self.tree.selection() != selected:
+            self.tree.selection_set(selected)
+
+        if total:
+            self.scrollbar_y.set(self.first / total, min(1.0, (self.first + self.visible) / total))
+        else:
+            self.scrollbar_y.set(0.0, 1.0)
+
+    def _on_resize(self, event):
+        style = ttk.Style()
+        row_height = int(style.lookup('Treeview', 'rowheight') or 20)
+        # Desconta a altura do cabeçalho
+        visible = max(1, (event.height - row_height) // row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self._clamp_first()
+            self._render()
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self._slots:
+            self.selected_position = self.first + self._slots.index(selection[0])
+
+    def _move_selection(self, delta):
+        if self.selected_position is None:
+            self.jump_to_row(self.first)
+        else:
+            self.jump_to_row(self.selected_position + delta)
+        return 'break'
+
+    def _on_mousewheel(self, event):
+        self._scroll_units(-3 if event.delta > 0 else 3)
+        return 'break'
+
+    def _scroll_units(self, units):
+        self.first += units
+        self._clamp_first()
+        self._render()
+        return 'break'